@@ -15,12 +15,10 @@ bl_info = {
 
 import bpy
 import logging
+from bpy.app.handlers import persistent
 from pathlib import Path
 
-# Setup logging to file for debugging
-from .utils.logging_config import setup_logging, get_logger
-log_file = Path.home() / "blender_addon.log"
-setup_logging(log_level=logging.DEBUG, log_file=log_file)
+from .utils.logging_config import setup_logging, set_log_level, get_logger
 logger = get_logger(__name__)
 
 # Import modules
@@ -68,14 +66,70 @@ def check_scheduled_gc():
         return 60.0
 
 
+# Utility modules that only install bpy.app.handlers; imported on first use
+_HANDLER_MODULES = (
+    "image_paths",
+    "material_cache",
+    "dirty_tracker",
+    "background_gc",
+    "thumbnails",
+    "compare_sessions",
+    "commit_prefetch",
+    "blend_index",
+    "save_hashing",
+)
+_handlers_registered = False
+
+
+def _register_handler_modules():
+    """Import the handler modules and register their handlers (once)."""
+    global _handlers_registered
+    if _handlers_registered:
+        return
+    _handlers_registered = True
+    import importlib
+    for name in _HANDLER_MODULES:
+        importlib.import_module(f".utils.{name}", __name__).register()
+
+
+@persistent
+def _on_first_use(*args):
+    """
+    Single lazy hook: install the handler modules before the first file
+    load/save, or on the first timer tick, whichever comes first.
+    """
+    _register_handler_modules()
+    for handlers in (bpy.app.handlers.load_pre, bpy.app.handlers.save_pre):
+        if _on_first_use in handlers:
+            handlers.remove(_on_first_use)
+    return None
+
+
 def register():
     """Register all addon classes."""
+    # Setup logging (asynchronous, rotated file); level comes from preferences.
+    # Done here rather than at import so merely importing the package stays cheap
+    setup_logging(log_level=logging.INFO, log_file=Path.home() / "blender_addon.log")
+    
     # Register in order
     preferences.register()
+    
+    # Apply saved log level
+    from .utils.helpers import get_addon_preferences
+    set_log_level(getattr(get_addon_preferences(bpy.context), 'log_level', 'INFO'))
+    
     properties.register()
     operators.register()
     ui.register()
     
+    # Handler modules (image paths, dirty tracking, caches) are registered
+    # lazily so enabling the add-on does not import them up front
+    for handlers in (bpy.app.handlers.load_pre, bpy.app.handlers.save_pre):
+        if _on_first_use not in handlers:
+            handlers.append(_on_first_use)
+    if not bpy.app.timers.is_registered(_on_first_use):
+        bpy.app.timers.register(_on_first_use, first_interval=0.0)
+    
     # Register timer for scheduled garbage collection
     bpy.app.timers.register(check_scheduled_gc, first_interval=60.0)
     
@@ -90,6 +144,18 @@ def unregister():
     except (ValueError, KeyError):
         pass  # Timer not registered
     
+    global _handlers_registered
+    for handlers in (bpy.app.handlers.load_pre, bpy.app.handlers.save_pre):
+        if _on_first_use in handlers:
+            handlers.remove(_on_first_use)
+    if bpy.app.timers.is_registered(_on_first_use):
+        bpy.app.timers.unregister(_on_first_use)
+    if _handlers_registered:
+        import importlib
+        for name in reversed(_HANDLER_MODULES):
+            importlib.import_module(f".utils.{name}", __name__).unregister()
+        _handlers_registered = False
+    
     # Unregister in reverse order
     ui.unregister()
     operators.unregister()
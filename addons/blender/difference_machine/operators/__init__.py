@@ -10,6 +10,8 @@ from . import gc_operators
 from . import review_operators
 from . import stash_operators
 from . import lock_operators
+from . import perf_operators
+from ..utils.perf import instrument_operator_class
 
 __all__ = [
     'init_operators',
@@ -20,11 +22,34 @@ __all__ = [
     'review_operators',
     'stash_operators',
     'lock_operators',
+    'perf_operators',
 ]
 
 
+_MODULES = (
+    init_operators,
+    branch_operators,
+    commit_operators,
+    history_operators,
+    gc_operators,
+    review_operators,
+    stash_operators,
+    lock_operators,
+    perf_operators,
+)
+
+
+def _instrument_operators():
+    """Wrap execute/invoke of every df.* operator with latency recording."""
+    for module in _MODULES:
+        for value in vars(module).values():
+            if isinstance(value, type) and str(getattr(value, 'bl_idname', '')).startswith('df.'):
+                instrument_operator_class(value)
+
+
 def register():
     """Register all operator classes."""
+    _instrument_operators()
     init_operators.register()
     branch_operators.register()
     commit_operators.register()
@@ -33,10 +58,12 @@ def register():
     review_operators.register()
     stash_operators.register()
     lock_operators.register()
+    perf_operators.register()
 
 
 def unregister():
     """Unregister all operator classes."""
+    perf_operators.unregister()
     lock_operators.unregister()
     stash_operators.unregister()
     review_operators.unregister()
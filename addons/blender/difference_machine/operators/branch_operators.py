@@ -6,7 +6,7 @@ import bpy
 from bpy.types import Operator
 from pathlib import Path
 from ..utils.forester_cli import get_cli, ForesterCLIError
-from ..utils.helpers import get_repository_path
+from ..utils.helpers import get_repository_path, get_repository_busy_reason
 
 
 class DF_OT_refresh_branches(Operator):
@@ -33,29 +33,26 @@ class DF_OT_refresh_branches(Operator):
         scene = context.scene
         scene.df_branches.clear()
         
-        # First pass: collect all branches with their HEAD commit hashes
+        # First pass: one log per branch gives both its HEAD commit hash and
+        # its commit count (history depth limited to avoid UI freezes)
         branch_heads = {}  # branch_name -> head_commit_hash
+        commit_counts = {}  # branch_name -> commit count
         for branch_data in branches:
             branch_name = branch_data["name"]
-            # Get HEAD commit hash for this branch
-            success_status, status_data, _ = cli.status(repo_path)
-            # Get commits to find HEAD
-            success, commits, _ = cli.log(repo_path, branch=branch_name, limit=1)
-            if success and commits and len(commits) > 0:
+            success, commits, _ = cli.log(repo_path, branch=branch_name, limit=200)
+            if success and commits:
                 branch_heads[branch_name] = commits[0].get("hash", "").strip()
+                commit_counts[branch_name] = len(commits)
             else:
                 branch_heads[branch_name] = ""
+                commit_counts[branch_name] = 0
         
         # Second pass: create branch items and determine parent branches
         for branch_data in branches:
             branch = scene.df_branches.add()
             branch.name = branch_data["name"]
             branch.is_current = branch_data["is_current"]
-            
-            # Get commit count for this branch
-            # Limit history depth to avoid UI freezes on large repos
-            success, commits, _ = cli.log(repo_path, branch=branch_data["name"], limit=200)
-            branch.commit_count = len(commits) if success and commits else 0
+            branch.commit_count = commit_counts.get(branch_data["name"], 0)
             
             # Determine parent branch: find branch with same HEAD commit_hash that was created earlier
             # (or is "main" if this is the first branch)
@@ -78,18 +75,9 @@ class DF_OT_refresh_branches(Operator):
             branch.parent_branch = parent_branch
         
         # IMPORTANT: Refresh commit history AFTER branch list is updated
-        # This ensures refresh_history gets the correct current branch from status
-        # We need to refresh history to show commits for the CURRENT branch
+        # refresh_history reads the current branch from status itself
         try:
-            # Get current branch explicitly to ensure we refresh for the right branch
-            success_status, status_data, _ = cli.status(repo_path)
-            if success_status and status_data:
-                current_branch = status_data.get("branch")
-                # Refresh history will use this current branch
-                bpy.ops.df.refresh_history()
-            else:
-                # Fallback: try to refresh anyway
-                bpy.ops.df.refresh_history()
+            bpy.ops.df.refresh_history()
         except Exception as e:
             # Database might be outdated (missing reflog table), but branches are still refreshed
             # User can run rebuild to fix the database
@@ -125,6 +113,11 @@ class DF_OT_create_branch(Operator):
             self.report({'ERROR'}, error_msg)
             return {'CANCELLED'}
         
+        busy = get_repository_busy_reason()
+        if busy:
+            self.report({'WARNING'}, busy)
+            return {'CANCELLED'}
+        
         cli = get_cli()
         success, _, error_msg = cli.branch(repo_path, action="create", branch_name=self.branch_name.strip())
         
@@ -180,8 +173,8 @@ class DF_OT_switch_branch(Operator):
             self.report({'ERROR'}, error_msg)
             return {'CANCELLED'}
         
-        cli = get_cli()
-        success, status_data, _ = cli.status(repo_path)
+        from ..utils.working_tree import cli_status
+        success, status_data, _ = cli_status(repo_path)
         
         if success and status_data:
             # Check if there are uncommitted changes
@@ -228,12 +221,17 @@ class DF_OT_switch_branch(Operator):
             self.report({'ERROR'}, error_msg)
             return {'CANCELLED'}
         
+        busy = get_repository_busy_reason()
+        if busy:
+            self.report({'WARNING'}, busy)
+            return {'CANCELLED'}
+        
         # Check if there are still uncommitted changes
         # (user might have clicked OK instead of Stash)
         # Skip this check if skip_change_check is set
         if not self.skip_change_check:
-            cli = get_cli()
-            success, status_data, _ = cli.status(repo_path)
+            from ..utils.working_tree import cli_status
+            success, status_data, _ = cli_status(repo_path)
             if success and status_data:
                 is_clean = status_data.get("clean", False)
                 has_changes = (
@@ -289,6 +287,11 @@ class DF_OT_delete_branch(Operator):
             self.report({'ERROR'}, error_msg)
             return {'CANCELLED'}
         
+        busy = get_repository_busy_reason()
+        if busy:
+            self.report({'WARNING'}, busy)
+            return {'CANCELLED'}
+        
         # Check if this is the current branch
         cli = get_cli()
         success, branches, _ = cli.branch(repo_path, action="list")
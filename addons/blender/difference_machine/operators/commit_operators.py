@@ -5,8 +5,8 @@ Operators for commit operations.
 import bpy
 from bpy.types import Operator
 from pathlib import Path
-from ..utils.forester_cli import get_cli, ForesterCLIError
-from ..utils.helpers import get_repository_path, get_addon_preferences
+from ..utils.forester_cli import ForesterCLIError
+from ..utils.helpers import get_repository_path, get_repository_busy_reason, get_addon_preferences, get_head_commit
 
 
 class DF_OT_create_project_commit(Operator):
@@ -16,74 +16,163 @@ class DF_OT_create_project_commit(Operator):
     bl_description = "Create a commit for the entire project"
     bl_options = {'REGISTER', 'UNDO'}
 
-    def execute(self, context):
+    _timer = None
+
+    def _start(self, context):
+        """Save, then start the commit pipeline and capture the thumbnail while it hashes."""
+        from ..utils.commit_pipeline import get_commit_pipeline
         props = context.scene.df_commit_props
         
         if not props.message or not props.message.strip():
             self.report({'ERROR'}, "Commit message is required")
-            return {'CANCELLED'}
+            return None
         
         repo_path, error_msg = get_repository_path()
         if not repo_path:
             self.report({'ERROR'}, error_msg)
-            return {'CANCELLED'}
+            return None
         
-        # Get author from preferences
-        prefs = get_addon_preferences(context)
-        author = prefs.default_author
+        pipeline = get_commit_pipeline()
+        if pipeline.is_running:
+            self.report({'WARNING'}, "A commit is already in progress")
+            return None
         
-        cli = get_cli()
+        busy = get_repository_busy_reason()
+        if busy:
+            self.report({'WARNING'}, busy)
+            return None
         
-        # Automatically stage all files before committing
-        # This ensures files are staged even if user hasn't explicitly run 'forester add'
-        success, error_msg = cli.add(repo_path, files=None)  # None means add all files
-        if not success:
-            self.report({'ERROR'}, f"Failed to stage files: {error_msg}")
-            return {'CANCELLED'}
+        # The commit takes the files from disk
+        if bpy.data.is_dirty:
+            try:
+                bpy.ops.wm.save_mainfile()
+            except RuntimeError as e:
+                self.report({'ERROR'}, f"Failed to save file: {e}")
+                return None
+        
+        # Get author from preferences
+        prefs = get_addon_preferences(context)
         
-        success, commit_hash, error_msg = cli.commit(
+        job = pipeline.start(
             repo_path,
+            get_head_commit(context),
             message=props.message.strip(),
-            author=author,
+            author=prefs.default_author,
             tag=props.commit_tag if props.commit_tag else None,
-            no_verify=True  # Skip hooks by default (hooks may not be executable)
+            changed_only=props.commit_changed_only,
         )
         
-        if success:
-            self.report({'INFO'}, f"Created commit: {commit_hash[:16] + '...' if commit_hash else 'unknown'}")
-            
-            # IMPORTANT: Clear message and tag fields after successful commit
-            # This ensures the UI fields are reset for the next commit
-            props.message = ""
-            props.commit_tag = ""
-            
-            # Force UI update to reflect cleared fields
-            # This ensures the text fields in the UI are visually cleared
-            for area in context.screen.areas:
-                if area.type == 'VIEW_3D':
-                    area.tag_redraw()
-            
-            # IMPORTANT: Refresh branch list to update commit counts
-            # This ensures the commit count in branch list is updated after creating a commit
-            import logging
-            logger = logging.getLogger(__name__)
-            try:
-                bpy.ops.df.refresh_branches()
-            except (RuntimeError, AttributeError, KeyError) as e:
-                # If refresh_branches fails, at least try to refresh history
-                logger.debug(f"Failed to refresh branches: {e}")
-                try:
-                    bpy.ops.df.refresh_history()
-                except (RuntimeError, AttributeError, KeyError) as e2:
-                    logger.debug(f"Failed to refresh history: {e2}")
-                except Exception as e2:
-                    logger.warning(f"Unexpected error refreshing history: {e2}")
-            except Exception as e:
-                logger.warning(f"Unexpected error refreshing branches: {e}")
-            return {'FINISHED'}
-        else:
-            self.report({'ERROR'}, f"Failed to create commit: {error_msg}")
+        # Capturing needs the GPU (main thread); it overlaps hashing and staging
+        if job is not None and getattr(prefs, 'capture_thumbnails', True):
+            job.start_thumbnail(self._capture_thumbnail(context))
+        return job
+
+    def execute(self, context):
+        job = self._start(context)
+        if job is None:
             return {'CANCELLED'}
+        job.wait()
+        return self._finish(context, job)
+
+    def invoke(self, context, event):
+        job = self._start(context)
+        if job is None:
+            return {'CANCELLED'}
+        from ..utils.commit_pipeline import PIPELINE_POLL_INTERVAL
+        wm = context.window_manager
+        self._timer = wm.event_timer_add(PIPELINE_POLL_INTERVAL, window=context.window)
+        wm.modal_handler_add(self)
+        wm.progress_begin(0, 100)
+        return {'RUNNING_MODAL'}
+
+    def modal(self, context, event):
+        if event.type != 'TIMER':
+            return {'PASS_THROUGH'}
+        from ..utils.commit_pipeline import get_commit_pipeline
+        job = get_commit_pipeline().job
+        wm = context.window_manager
+        wm.progress_update(int(job.progress * 100))
+        self._tag_redraw(context)
+        if not job.done:
+            return {'RUNNING_MODAL'}
+        
+        wm.event_timer_remove(self._timer)
+        self._timer = None
+        wm.progress_end()
+        return self._finish(context, job)
+
+    def _finish(self, context, job):
+        """Report the result and update the UI (main thread)."""
+        import logging
+        from ..utils.commit_pipeline import COMMIT_STATE_COMPLETED, COMMIT_STATE_NOTHING
+        logger = logging.getLogger(__name__)
+        props = context.scene.df_commit_props
+        
+        if job.state == COMMIT_STATE_NOTHING:
+            self.report({'INFO'}, "No changed files to commit")
+            return {'CANCELLED'}
+        if job.state != COMMIT_STATE_COMPLETED:
+            self.report({'ERROR'}, job.error or "Failed to create commit")
+            return {'CANCELLED'}
+        
+        commit_hash = job.commit_hash
+        self.report({'INFO'}, f"Created commit: {commit_hash[:16] + '...' if commit_hash else 'unknown'}")
+        logger.debug(f"Project commit finished in {job.elapsed:.2f}s")
+        
+        if commit_hash and job.thumbnail is not None:
+            from ..utils.thumbnails import get_thumbnail_store
+            get_thumbnail_store().save_prepared(job.repo_path, commit_hash, job.thumbnail)
+        
+        # Unsaved edits are not part of the commit: keep tracking them
+        if not bpy.data.is_dirty:
+            from ..utils.dirty_tracker import get_dirty_tracker
+            get_dirty_tracker().mark_committed(job.repo_path, commit_hash)
+        
+        # IMPORTANT: Clear message and tag fields after successful commit
+        # This ensures the UI fields are reset for the next commit
+        props.message = ""
+        props.commit_tag = ""
+        
+        # Force UI update to reflect cleared fields
+        # This ensures the text fields in the UI are visually cleared
+        self._tag_redraw(context)
+        
+        # IMPORTANT: Refresh branch list to update commit counts
+        # This ensures the commit count in branch list is updated after creating a commit
+        try:
+            bpy.ops.df.refresh_branches()
+        except (RuntimeError, AttributeError, KeyError) as e:
+            # If refresh_branches fails, at least try to refresh history
+            logger.debug(f"Failed to refresh branches: {e}")
+            try:
+                bpy.ops.df.refresh_history()
+            except (RuntimeError, AttributeError, KeyError) as e2:
+                logger.debug(f"Failed to refresh history: {e2}")
+            except Exception as e2:
+                logger.warning(f"Unexpected error refreshing history: {e2}")
+        except Exception as e:
+            logger.warning(f"Unexpected error refreshing branches: {e}")
+        return {'FINISHED'}
+
+    @staticmethod
+    def _tag_redraw(context):
+        screen = getattr(context, 'screen', None)
+        for area in (screen.areas if screen else ()):
+            if area.type == 'VIEW_3D':
+                area.tag_redraw()
+
+    @staticmethod
+    def _capture_thumbnail(context):
+        """Capture the viewport for the commit's thumbnail (never fails the commit)."""
+        import logging
+        logger = logging.getLogger(__name__)
+        try:
+            from ..utils.viewport_capture import capture_viewport_pixels
+            from ..utils.thumbnails import CAPTURE_SIZE
+            return capture_viewport_pixels(context, max_size=CAPTURE_SIZE)
+        except Exception as e:
+            logger.warning(f"Failed to capture commit thumbnail: {e}")
+            return None
 
 
 class DF_OT_select_assets_directory(Operator):
@@ -348,8 +437,35 @@ class DF_OT_clear_tag_filter(Operator):
         return {'CANCELLED'}
 
 
+class DF_OT_refresh_working_tree_status(Operator):
+    """Refresh working tree status in the commit panel."""
+    bl_idname = "df.refresh_working_tree_status"
+    bl_label = "Refresh Status"
+    bl_description = "Check which files differ from the current commit"
+    bl_options = {'REGISTER'}
+
+    def execute(self, context):
+        repo_path, error_msg = get_repository_path()
+        if not repo_path:
+            self.report({'ERROR'}, error_msg)
+            return {'CANCELLED'}
+        
+        busy = get_repository_busy_reason()
+        if busy:
+            self.report({'WARNING'}, busy)
+            return {'CANCELLED'}
+        
+        from ..utils.working_tree import fast_status
+        success, _, error_msg = fast_status(repo_path, get_head_commit(context))
+        if not success:
+            self.report({'ERROR'}, f"Failed to get status: {error_msg}")
+            return {'CANCELLED'}
+        return {'FINISHED'}
+
+
 def register():
     bpy.utils.register_class(DF_OT_create_project_commit)
+    bpy.utils.register_class(DF_OT_refresh_working_tree_status)
     bpy.utils.register_class(DF_OT_select_assets_directory)
     bpy.utils.register_class(DF_OT_save_asset)
     bpy.utils.register_class(DF_OT_clear_tag_filter)
@@ -359,4 +475,5 @@ def unregister():
     bpy.utils.unregister_class(DF_OT_clear_tag_filter)
     bpy.utils.unregister_class(DF_OT_save_asset)
     bpy.utils.unregister_class(DF_OT_select_assets_directory)
+    bpy.utils.unregister_class(DF_OT_refresh_working_tree_status)
     bpy.utils.unregister_class(DF_OT_create_project_commit)
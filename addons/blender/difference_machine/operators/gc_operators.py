@@ -6,7 +6,7 @@ import bpy
 from bpy.types import Operator
 from pathlib import Path
 from ..utils.forester_cli import get_cli
-from ..utils.helpers import get_repository_path, get_addon_preferences
+from ..utils.helpers import get_repository_path, get_repository_busy_reason, get_addon_preferences
 import time
 
 
@@ -29,6 +29,11 @@ class DF_OT_garbage_collect(Operator):
             self.report({'ERROR'}, error_msg)
             return {'CANCELLED'}
         
+        busy = get_repository_busy_reason()
+        if busy:
+            self.report({'WARNING'}, busy)
+            return {'CANCELLED'}
+        
         cli = get_cli()
         # Note: dry_run parameter is ignored as CLI doesn't support it yet
         success, stats, error_msg = cli.gc(repo_path, dry_run=False)
@@ -54,6 +59,22 @@ class DF_OT_garbage_collect(Operator):
         return {'FINISHED'}
 
 
+class DF_OT_cancel_scheduled_gc(Operator):
+    """Cancel scheduled garbage collection running in background."""
+    bl_idname = "df.cancel_scheduled_gc"
+    bl_label = "Cancel Garbage Collection"
+    bl_description = "Stop the scheduled garbage collection running in background"
+    bl_options = {'REGISTER'}
+
+    def execute(self, context):
+        from ..utils.background_gc import get_background_gc
+        if get_background_gc().cancel():
+            self.report({'INFO'}, "Garbage collection cancelled")
+        else:
+            self.report({'INFO'}, "No garbage collection running")
+        return {'FINISHED'}
+
+
 class DF_OT_rebuild_database(Operator):
     """Rebuild database from storage."""
     bl_idname = "df.rebuild_database"
@@ -67,6 +88,11 @@ class DF_OT_rebuild_database(Operator):
             self.report({'ERROR'}, error_msg)
             return {'CANCELLED'}
         
+        busy = get_repository_busy_reason()
+        if busy:
+            self.report({'WARNING'}, busy)
+            return {'CANCELLED'}
+        
         # Confirm action
         if not self.confirm_rebuild():
             return {'CANCELLED'}
@@ -90,9 +116,11 @@ class DF_OT_rebuild_database(Operator):
 
 def register():
     bpy.utils.register_class(DF_OT_garbage_collect)
+    bpy.utils.register_class(DF_OT_cancel_scheduled_gc)
     bpy.utils.register_class(DF_OT_rebuild_database)
 
 
 def unregister():
     bpy.utils.unregister_class(DF_OT_rebuild_database)
+    bpy.utils.unregister_class(DF_OT_cancel_scheduled_gc)
     bpy.utils.unregister_class(DF_OT_garbage_collect)
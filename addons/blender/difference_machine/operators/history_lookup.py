@@ -0,0 +1,835 @@
+"""
+Commit object lookup for history operators.
+
+Locates objects and scene files inside commits (object store or extracted
+tmp_review). Kept separate from history_operators so this code is only
+loaded when an object replace/compare actually runs.
+"""
+
+import bpy
+import logging
+from pathlib import Path
+from typing import Optional, Tuple
+from ..utils.forester_cli import get_cli
+from ..utils.helpers import wait_for_path
+from ..utils.logging_config import get_logger
+from ..utils.perf import timed, CATEGORY_STAGE
+
+logger = get_logger(__name__)
+
+
+def _get_object_library_info(obj: bpy.types.Object) -> Optional[dict]:
+    """
+    Get library information for linked/append object.
+    
+    Args:
+        obj: Blender object
+    
+    Returns:
+        Dict with 'library_path' and 'library_name' or None if not linked
+    """
+    if not obj:
+        return None
+    
+    # Check if object data is from library
+    if obj.data and hasattr(obj.data, 'library'):
+        if obj.data.library:
+            return {
+                'library_path': obj.data.library.filepath,
+                'library_name': obj.data.library.name,
+                'is_linked': True
+            }
+    
+    # Check if object itself is from library
+    if hasattr(obj, 'library') and obj.library:
+        return {
+            'library_path': obj.library.filepath,
+            'library_name': obj.library.name,
+            'is_linked': True
+        }
+    
+    return None
+
+
+@timed(CATEGORY_STAGE)
+def _find_object_in_scene_file_from_commit(
+    repo_path: Path,
+    commit_hash: str,
+    scene_file_name: str,
+    object_name: str,
+    object_type: str = None
+) -> Optional[Tuple[str, Path, Optional[str]]]:
+    """
+    Find scene file in commit and extract object from it.
+    
+    Args:
+        repo_path: Repository root path
+        commit_hash: Commit hash
+        scene_file_name: Name of the scene file (e.g., "2B.blend")
+        object_name: Object name to search for
+        object_type: Optional object type (MESH, LIGHT, etc.)
+    
+    Returns:
+        Tuple of (blob_hash, blend_path, object_name_in_file) or None
+    """
+    from ..operators.mesh_io import _find_object_in_blend_file
+    
+    logger.debug("_find_object_in_scene_file_from_commit: Looking for '%s' in commit %s", scene_file_name, commit_hash[:8])
+    logger.debug("Searching for object '%s' (type: %s)", object_name, object_type)
+    
+    import json
+    import re
+    
+    # Read commit
+    # Note: Commits are stored by hash of JSON content, not by commit hash
+    # We need to search for commit by hash in file contents
+    dfm_path = repo_path / ".DFM"
+    commits_path = dfm_path / "objects" / "commits" / "sha256"
+    
+    # First try direct path (in case commit hash matches file hash)
+    hash_path = commit_hash[:2] + "/" + commit_hash[2:]
+    commit_file = commits_path / hash_path
+    
+    if not commit_file.exists():
+        # Search for commit by hash in file contents
+        logger.debug("Commit file not found at direct path: %s", commit_file)
+        logger.debug("Searching for commit hash '%s' in commit files...", commit_hash[:8])
+        
+        commit_file = None
+        for commit_file_path in commits_path.rglob("*"):
+            if commit_file_path.is_file():
+                try:
+                    with open(commit_file_path, 'r', encoding='utf-8') as f:
+                        content = f.read()
+                        # Check if this file contains our commit hash
+                        if commit_hash in content:
+                            # Parse to verify it's the right commit
+                            try:
+                                commit_json = json.loads(content)
+                                if commit_json.get("hash") == commit_hash:
+                                    commit_file = commit_file_path
+                                    logger.debug("Found commit file: %s", commit_file)
+                                    break
+                            except (json.JSONDecodeError, KeyError) as e:
+                                logger.debug("Error parsing JSON from %s: %s", commit_file_path, e)
+                                # Try regex
+                                if f'"hash":"{commit_hash}"' in content:
+                                    commit_file = commit_file_path
+                                    logger.debug("Found commit file (regex): %s", commit_file)
+                                    break
+                except Exception as e:
+                    logger.debug("Error reading %s: %s", commit_file_path, e)
+                    continue
+        
+        if not commit_file or not commit_file.exists():
+            logger.warning(f"Commit '{commit_hash[:8]}' not found in repository")
+            return None
+    
+    # Parse commit to get tree_hash
+    tree_hash = None
+    try:
+        with open(commit_file, 'r', encoding='utf-8') as f:
+            commit_content = f.read()
+        
+        try:
+            commit_json = json.loads(commit_content)
+            tree_hash = commit_json.get("tree_hash", "")
+        except:
+            # Regex fallback
+            tree_hash_match = re.search(r'"tree_hash"\s*:\s*"([^"]+)"', commit_content)
+            if tree_hash_match:
+                tree_hash = tree_hash_match.group(1)
+    except Exception as e:
+        logger.error(f"Failed to parse commit file: {e}", exc_info=True)
+        return None
+    
+    if not tree_hash:
+        logger.warning(f"No tree_hash in commit {commit_hash[:8]}")
+        return None
+    
+    logger.debug("Tree hash: %s", tree_hash[:8])
+    
+    # Read tree
+    trees_path = dfm_path / "objects" / "trees" / "sha256"
+    tree_hash_path = tree_hash[:2] + "/" + tree_hash[2:]
+    tree_file = trees_path / tree_hash_path
+    
+    if not tree_file.exists():
+        logger.warning(f"Tree file not found: {tree_file}")
+        return None
+    
+    logger.debug("Reading tree file: %s", tree_file)
+    
+    # Parse tree to find scene file
+    try:
+        with open(tree_file, 'r', encoding='utf-8') as f:
+            tree_content = f.read()
+        
+        try:
+            tree_json = json.loads(tree_content)
+            entries = tree_json.get("entries", [])
+        except:
+            # Regex fallback
+            entries_match = re.search(r'"entries"\s*:\s*\[(.*?)\]', tree_content, re.DOTALL)
+            if entries_match:
+                entries_str = entries_match.group(1)
+                entries = []
+                entry_matches = re.finditer(
+                    r'\{"hash":"([^"]+)","name":"([^"]+)","type":"([^"]+)"',
+                    entries_str
+                )
+                for match in entry_matches:
+                    entries.append({
+                        "hash": match.group(1),
+                        "name": match.group(2),
+                        "type": match.group(3)
+                    })
+            else:
+                entries = []
+        
+        logger.debug("Found %s entries in tree", len(entries))
+        
+        # Log all .blend files found in tree
+        blend_files = [e for e in entries if e.get("type") == "blob" and e.get("name", "").endswith(".blend")]
+        logger.debug("Found %s .blend files in tree", len(blend_files))
+        for bf in blend_files[:10]:  # Log first 10
+            logger.debug("  - %s (hash: %s)", bf.get('name'), bf.get('hash', '')[:8] if bf.get('hash') else 'N/A')
+        
+        # Find scene file by name
+        blobs_path = dfm_path / "objects" / "blobs" / "sha256"
+        
+        for entry in entries:
+            if entry.get("type") == "blob" and entry.get("name", "").endswith(".blend"):
+                entry_name = Path(entry.get("name", "")).name
+                entry_path = entry.get("name", "")
+                
+                logger.debug("Checking entry: name='%s', path='%s'", entry_name, entry_path)
+                
+                # Check if this is the scene file we're looking for
+                if entry_name == scene_file_name or entry_path.endswith(scene_file_name):
+                    blob_hash = entry.get("hash")
+                    if blob_hash:
+                        blob_hash_path = blob_hash[:2] + "/" + blob_hash[2:]
+                        blob_file = blobs_path / blob_hash_path
+                        
+                        logger.debug("Matched scene file! Checking blob file: %s", blob_file)
+                        
+                        if blob_file.exists():
+                            logger.debug("Found scene file '%s' at %s (hash: %s)", scene_file_name, blob_file, blob_hash[:8])
+                            
+                            # Check if object exists in this blend file
+                            logger.debug("Searching for object '%s' (type: %s) in %s", object_name, object_type, blob_file)
+                            found_name = _find_object_in_blend_file(
+                                blob_file, 
+                                object_name, 
+                                object_type
+                            )
+                            
+                            if found_name:
+                                logger.debug("✓ Found object '%s' in scene file", found_name)
+                                return (blob_hash, blob_file, found_name)
+                            else:
+                                logger.warning(f"✗ Object '{object_name}' (type: {object_type}) not found in scene file {scene_file_name}")
+                        else:
+                            logger.warning(f"Blob file not found: {blob_file}")
+        
+        logger.warning(f"Scene file '{scene_file_name}' not found in commit {commit_hash[:8]}")
+        logger.debug("Searched through %s .blend files", len(blend_files))
+        
+    except Exception as e:
+        logger.error(f"Error searching tree: {e}", exc_info=True)
+    
+    return None
+
+
+def _get_object_source_info(obj: bpy.types.Object, repo_path: Path) -> dict:
+    from ..utils.logging_config import get_logger
+    logger = get_logger(__name__)
+    """
+    Определяет источник объекта: файл сцены или ассет.
+    
+    Args:
+        obj: Blender object
+        repo_path: Repository root path
+    
+    Returns:
+        {
+            'source_type': 'scene_file' | 'asset' | 'unknown',
+            'source_file': Path или None,
+            'library_path': str или None (для ассетов)
+        }
+    """
+    import logging
+    logger = logging.getLogger(__name__)
+    
+    # Проверяем, является ли объект ассетом
+    library_info = _get_object_library_info(obj)
+    if library_info:
+        # Это ассет - используем library_path
+        library_path = Path(library_info['library_path'])
+        logger.debug("Object '%s' is from library: %s", obj.name, library_path)
+        # Нормализуем путь относительно репозитория
+        if library_path.is_absolute():
+            # Пытаемся найти относительный путь
+            try:
+                library_path = library_path.relative_to(repo_path)
+                logger.debug("Library path relative to repo: %s", library_path)
+            except ValueError:
+                # Путь вне репозитория - используем имя файла
+                library_path = Path(library_path.name)
+                logger.debug("Library path outside repo, using filename: %s", library_path)
+        
+        return {
+            'source_type': 'asset',
+            'source_file': library_path,
+            'library_path': str(library_path)
+        }
+    
+    # Объект из текущего файла сцены
+    if bpy.data.filepath:
+        scene_file = Path(bpy.data.filepath)
+        logger.debug("Object '%s' is from scene file: %s", obj.name, scene_file)
+        try:
+            # Получаем относительный путь от репозитория
+            scene_file_rel = scene_file.relative_to(repo_path)
+            logger.debug("Scene file relative to repo: %s", scene_file_rel)
+            return {
+                'source_type': 'scene_file',
+                'source_file': scene_file_rel,
+                'library_path': None
+            }
+        except ValueError:
+            # Файл вне репозитория - используем имя файла
+            logger.debug("Scene file outside repo, using filename: %s", scene_file.name)
+            return {
+                'source_type': 'scene_file',
+                'source_file': Path(scene_file.name),
+                'library_path': None
+            }
+    
+    logger.warning(f"Could not determine source for object '{obj.name}'")
+    return {
+        'source_type': 'unknown',
+        'source_file': None,
+        'library_path': None
+    }
+
+
+@timed(CATEGORY_STAGE)
+def _find_object_in_commit_by_name(
+    repo_path: Path, 
+    commit_hash: str, 
+    object_name: str,
+    object_type: str = None,
+    source_info: dict = None
+) -> Optional[Tuple[str, Path, Optional[str]]]:
+    """
+    Find object in commit by name with smart source detection. Supports:
+    1. Objects in .blend scene files from tree (searches in specific file if source_info provided)
+    2. Objects in asset .blend files from assets directory
+    
+    Args:
+        repo_path: Repository root path
+        commit_hash: Commit hash
+        object_name: Object name to search for
+        object_type: Optional object type (MESH, LIGHT, etc.)
+        source_info: Optional dict with source info from _get_object_source_info
+    
+    Returns:
+        Tuple of (hash, blend_path, object_name_in_file) or None
+        object_name_in_file may differ from object_name if found in scene file
+    """
+    from ..operators.mesh_io import _find_object_in_blend_file
+    from ..utils.logging_config import get_logger
+    
+    logger = get_logger(__name__)
+    logger.debug("_find_object_in_commit_by_name: Searching for '%s' (type: %s) in commit %s", object_name, object_type, commit_hash[:8])
+    logger.debug("Source info: %s", source_info)
+    
+    import json
+    import re
+    
+    # Read commit
+    dfm_path = repo_path / ".DFM"
+    commits_path = dfm_path / "objects" / "commits" / "sha256"
+    hash_path = commit_hash[:2] + "/" + commit_hash[2:]
+    commit_file = commits_path / hash_path
+    
+    if not commit_file.exists():
+        logger.warning(f"Commit file not found: {commit_file}")
+        return None
+    
+    logger.debug("Reading commit file: %s", commit_file)
+    
+    # Parse commit
+    tree_hash = None
+    
+    try:
+        with open(commit_file, 'r', encoding='utf-8') as f:
+            commit_content = f.read()
+        
+        try:
+            commit_json = json.loads(commit_content)
+            tree_hash = commit_json.get("tree_hash", "")
+        except:
+            # Regex fallback
+            tree_hash_match = re.search(r'"tree_hash"\s*:\s*"([^"]+)"', commit_content)
+            if tree_hash_match:
+                tree_hash = tree_hash_match.group(1)
+    except Exception as e:
+        logger.error(f"Failed to parse commit file: {e}", exc_info=True)
+        return None
+    
+    logger.debug("Commit parsed: tree_hash=%s", tree_hash[:8] if tree_hash else None)
+    
+    # Method 1: Search in tree - .blend scene files
+    if tree_hash:
+        logger.debug("Searching in tree: %s", tree_hash[:8])
+        trees_path = dfm_path / "objects" / "trees" / "sha256"
+        tree_hash_path = tree_hash[:2] + "/" + tree_hash[2:]
+        tree_file = trees_path / tree_hash_path
+        
+        if tree_file.exists():
+            logger.debug("Reading tree file: %s", tree_file)
+            try:
+                with open(tree_file, 'r', encoding='utf-8') as f:
+                    tree_content = f.read()
+                
+                try:
+                    tree_json = json.loads(tree_content)
+                    entries = tree_json.get("entries", [])
+                except:
+                    # Regex fallback
+                    entries_match = re.search(r'"entries"\s*:\s*\[(.*?)\]', tree_content, re.DOTALL)
+                    if entries_match:
+                        entries_str = entries_match.group(1)
+                        entries = []
+                        entry_matches = re.finditer(
+                            r'\{"hash":"([^"]+)","name":"([^"]+)","type":"([^"]+)"',
+                            entries_str
+                        )
+                        for match in entry_matches:
+                            entries.append({
+                                "hash": match.group(1),
+                                "name": match.group(2),
+                                "type": match.group(3)
+                            })
+                    else:
+                        entries = []
+                
+                logger.debug("Found %s entries in tree", len(entries))
+                
+                blobs_path = dfm_path / "objects" / "blobs" / "sha256"
+                
+                # Если есть информация об источнике, ищем конкретный файл
+                target_file_name = None
+                target_file_path = None
+                if source_info:
+                    logger.debug("Source info: %s", source_info)
+                    if source_info['source_type'] == 'scene_file' and source_info['source_file']:
+                        # Ищем файл сцены
+                        target_file_name = source_info['source_file'].name
+                        target_file_path = str(source_info['source_file'])
+                        logger.debug("Looking for scene file: %s (path: %s)", target_file_name, target_file_path)
+                    elif source_info['source_type'] == 'asset' and source_info['source_file']:
+                        # Ищем файл ассета
+                        target_file_name = source_info['source_file'].name
+                        target_file_path = str(source_info['source_file'])
+                        logger.debug("Looking for asset file: %s (path: %s)", target_file_name, target_file_path)
+                
+                # Сначала ищем нужный файл, если знаем его имя
+                if target_file_name:
+                    for entry in entries:
+                        if entry.get("type") == "blob" and entry.get("name", "").endswith(".blend"):
+                            entry_name = Path(entry.get("name", "")).name
+                            entry_path = entry.get("name", "")
+                            
+                            # Проверяем совпадение по имени файла или полному пути
+                            # Используем нормализованные пути для сравнения
+                            entry_path_normalized = Path(entry_path).as_posix() if entry_path else None
+                            target_path_normalized = target_file_path.as_posix() if target_file_path else None
+                            
+                            if (entry_name == target_file_name or 
+                                entry_path == target_file_path or
+                                (target_path_normalized and entry_path_normalized.endswith(target_path_normalized)) or
+                                entry_path_normalized.endswith(target_file_name)):
+                                blob_hash = entry.get("hash")
+                                if blob_hash:
+                                    blob_hash_path = blob_hash[:2] + "/" + blob_hash[2:]
+                                    blob_file = blobs_path / blob_hash_path
+                                    
+                                    if blob_file.exists():
+                                        logger.debug("Checking target file: %s (hash: %s)", blob_file, blob_hash[:8])
+                                        # Ищем объект в этом файле
+                                        found_name = _find_object_in_blend_file(
+                                            blob_file, 
+                                            object_name, 
+                                            object_type
+                                        )
+                                        if found_name:
+                                            logger.debug("Found object '%s' in target file: %s", found_name, blob_file)
+                                            return (blob_hash, blob_file, found_name)
+                                        else:
+                                            logger.debug("Object '%s' not found in %s", object_name, blob_file)
+                
+                # Fallback: перебираем все .blend файлы (если не нашли по имени файла)
+                # Но сначала попробуем найти файл сцены (обычно это .blend файл в корне)
+                if source_info and source_info['source_type'] == 'scene_file':
+                    # Ищем .blend файлы, которые могут быть файлами сцен
+                    for entry in entries:
+                        if entry.get("type") == "blob" and entry.get("name", "").endswith(".blend"):
+                            entry_path = entry.get("name", "")
+                            # Проверяем, не является ли это файлом в корне или похожим путем
+                            entry_path_normalized = Path(entry_path).as_posix() if entry_path else None
+                            # Если путь короткий (вероятно файл в корне) или содержит имя файла
+                            if (len(Path(entry_path).parts) <= 2 or  # Файл в корне или одной подпапке
+                                target_file_name in entry_path_normalized):
+                                blob_hash = entry.get("hash")
+                                if blob_hash:
+                                    blob_hash_path = blob_hash[:2] + "/" + blob_hash[2:]
+                                    blob_file = blobs_path / blob_hash_path
+                                    
+                                    if blob_file.exists():
+                                        found_name = _find_object_in_blend_file(
+                                            blob_file, 
+                                            object_name, 
+                                            object_type
+                                        )
+                                        if found_name:
+                                            return (blob_hash, blob_file, found_name)
+                
+                # Если не нашли, перебираем все .blend файлы
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Searching in all %s .blend files", len([e for e in entries if e.get('name', '').endswith('.blend')]))
+                for entry in entries:
+                    if entry.get("type") == "blob" and entry.get("name", "").endswith(".blend"):
+                        blob_hash = entry.get("hash")
+                        if blob_hash:
+                            blob_hash_path = blob_hash[:2] + "/" + blob_hash[2:]
+                            blob_file = blobs_path / blob_hash_path
+                            
+                            if blob_file.exists():
+                                # Check if object exists in this blend file
+                                found_name = _find_object_in_blend_file(
+                                    blob_file, 
+                                    object_name, 
+                                    object_type
+                                )
+                                if found_name:
+                                    logger.debug("Found object '%s' in %s (hash: %s)", found_name, entry.get('name'), blob_hash[:8])
+                                    return (blob_hash, blob_file, found_name)
+            except Exception as e:
+                logger.error(f"Error searching tree: {e}", exc_info=True)
+    else:
+        logger.debug("No tree_hash in commit")
+    
+    logger.warning(f"Object '{object_name}' (type: {object_type}) not found in commit {commit_hash[:8]}")
+    return None
+
+
+@timed(CATEGORY_STAGE)
+def _find_mesh_in_commit_by_object_name(repo_path: Path, commit_hash: str, object_name: str) -> Optional[Tuple[str, Path]]:
+    """
+    Find mesh in commit by object_name.
+    
+    Меши хранятся в tree как blob'ы (полные коммиты проекта).
+    
+    Args:
+        repo_path: Repository root path
+        commit_hash: Commit hash
+        object_name: Object name to search for
+        
+    Returns:
+        Tuple of (blob_hash, blend_path) or None if not found
+    """
+    import json
+    import re
+    
+    # Read commit JSON from storage
+    dfm_path = repo_path / ".DFM"
+    commits_path = dfm_path / "objects" / "commits" / "sha256"
+    
+    # Convert hash to path (first 2 chars / rest)
+    hash_path = commit_hash[:2] + "/" + commit_hash[2:]
+    commit_file = commits_path / hash_path
+    
+    if not commit_file.exists():
+        return None
+    
+    commit_json = None
+    tree_hash = None
+    
+    try:
+        with open(commit_file, 'r', encoding='utf-8') as f:
+            commit_content = f.read()
+        
+        # Try to parse as JSON first
+        try:
+            commit_json = json.loads(commit_content)
+            tree_hash = commit_json.get("tree_hash", "")
+        except:
+            # If not valid JSON, try regex parsing
+            tree_hash_match = re.search(r'"tree_hash"\s*:\s*"([^"]+)"', commit_content)
+            if tree_hash_match:
+                tree_hash = tree_hash_match.group(1)
+    except Exception as e:
+        return None
+    
+    # Search in tree (for full project commits)
+    # Меши могут быть сохранены как .blend файлы в tree
+    if tree_hash:
+        trees_path = dfm_path / "objects" / "trees" / "sha256"
+        tree_hash_path = tree_hash[:2] + "/" + tree_hash[2:]
+        tree_file = trees_path / tree_hash_path
+        
+        if tree_file.exists():
+            try:
+                with open(tree_file, 'r', encoding='utf-8') as f:
+                    tree_content = f.read()
+                
+                # Parse tree JSON
+                try:
+                    tree_json = json.loads(tree_content)
+                    entries = tree_json.get("entries", [])
+                except:
+                    # Try regex parsing
+                    entries_match = re.search(r'"entries"\s*:\s*\[(.*?)\]', tree_content, re.DOTALL)
+                    if entries_match:
+                        entries_str = entries_match.group(1)
+                        # Extract entries
+                        entries = []
+                        entry_matches = re.finditer(r'\{"hash":"([^"]+)","name":"([^"]+)","type":"([^"]+)"', entries_str)
+                        for match in entry_matches:
+                            entries.append({
+                                "hash": match.group(1),
+                                "name": match.group(2),
+                                "type": match.group(3)
+                            })
+                    else:
+                        entries = []
+                
+                # Search for .blend files in tree
+                blobs_path = dfm_path / "objects" / "blobs" / "sha256"
+                
+                for entry in entries:
+                    # Check if it's a .blend file
+                    if entry.get("type") == "blob" and entry.get("name", "").endswith(".blend"):
+                        # Check if filename matches object_name (exact or partial)
+                        file_name = Path(entry.get("name", "")).stem
+                        
+                        # Try exact match first
+                        if file_name == object_name or entry.get("name") == object_name:
+                            # Load blob and check if it contains the mesh
+                            blob_hash = entry.get("hash")
+                            if blob_hash:
+                                blob_hash_path = blob_hash[:2] + "/" + blob_hash[2:]
+                                blob_file = blobs_path / blob_hash_path
+                                
+                                if blob_file.exists():
+                                    # Try to import and check object name
+                                    # For now, return the blob file as blend path
+                                    # (We'll check the object name when importing)
+                                    return (blob_hash, blob_file)
+                        
+            except Exception as e:
+                pass
+    
+    # Method 2: Try to find by filename pattern (if object_name looks like a filename)
+    # This is a fallback - try to match object_name with .blend filenames in tree
+    if tree_hash:
+        trees_path = dfm_path / "objects" / "trees"
+        tree_hash_path = tree_hash[:2] + "/" + tree_hash[2:]
+        tree_file = trees_path / tree_hash_path
+        
+        if tree_file.exists():
+            try:
+                with open(tree_file, 'r', encoding='utf-8') as f:
+                    tree_content = f.read()
+                
+                # Try to find .blend files that might contain the mesh
+                # Look for files where object_name matches or is part of filename
+                blend_file_matches = re.findall(r'\{"hash":"([^"]+)","name":"([^"]+\.blend)","type":"blob"', tree_content)
+                
+                blobs_path = dfm_path / "objects" / "blobs" / "sha256"
+                
+                for blob_hash, file_name in blend_file_matches:
+                    # Check if object_name matches filename (without extension)
+                    file_stem = Path(file_name).stem
+                    if object_name == file_stem or object_name in file_stem or file_stem in object_name:
+                        blob_hash_path = blob_hash[:2] + "/" + blob_hash[2:]
+                        blob_file = blobs_path / blob_hash_path
+                        
+                        if blob_file.exists():
+                            # Try to verify by loading and checking objects inside
+                            # For now, return the first match
+                            return (blob_hash, blob_file)
+            except:
+                pass
+    
+    return None
+
+
+@timed(CATEGORY_STAGE)
+def _extract_commit_to_tmp_review(
+    repo_path: Path, 
+    commit_hash: str, 
+    cleanup_old: bool = True,
+    current_commit: Optional[str] = None
+) -> Tuple[bool, Path, Optional[str]]:
+    """
+    Extract commit to tmp_review directory.
+    
+    Args:
+        repo_path: Repository root path
+        commit_hash: Commit hash to extract
+        cleanup_old: Whether to cleanup old tmp_review if it exists
+        current_commit: Current commit hash (for comparison, only cleanup if different)
+    
+    Returns:
+        Tuple of (success, tmp_review_path, error_message)
+        If successful: (True, Path, None)
+        If error: (False, Path, error_message)
+    """
+    cli = get_cli()
+    tmp_review_path = repo_path / ".DFM" / "tmp_review"
+    logger.debug("tmp_review path: %s", tmp_review_path)
+    
+    # Очищаем старую папку если есть
+    if cleanup_old and tmp_review_path.exists():
+        # Only cleanup if it's a different commit
+        if current_commit and current_commit == commit_hash:
+            logger.debug("tmp_review already exists for this commit, skipping cleanup")
+        else:
+            logger.debug("Cleaning up old tmp_review directory")
+            cleanup_commit = current_commit if current_commit else commit_hash
+            cli.compare(repo_path, cleanup_commit, cleanup=True)
+            # Wait for cleanup to complete
+            wait_for_path(tmp_review_path, timeout=1.0, interval=0.1)
+            # Check if directory was removed (it should be)
+            if tmp_review_path.exists():
+                logger.debug("tmp_review still exists after cleanup, will be overwritten")
+    
+    success, error_msg = cli.compare(repo_path, commit_hash)
+    if not success:
+        logger.error(f"forester compare failed: {error_msg}")
+        return False, tmp_review_path, error_msg
+    
+    logger.debug(f"forester compare completed, checking tmp_review...")
+    
+    # Wait for directory to be created
+    if not wait_for_path(tmp_review_path, timeout=5.0, interval=0.1):
+        error_msg = f"tmp_review directory was not created after 5s"
+        logger.error(f"{error_msg}: {tmp_review_path}")
+        return False, tmp_review_path, error_msg
+    
+    logger.debug("tmp_review directory exists: %s", tmp_review_path)
+    try:
+        contents = list(tmp_review_path.iterdir())
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Contents: %s", [str(c.name) for c in contents])
+    except (OSError, PermissionError) as e:
+        logger.debug("Error listing contents: %s", e)
+    
+    return True, tmp_review_path, None
+
+
+def _find_scene_file_in_tmp_review(tmp_review_path: Path, blend_file_name: str) -> Optional[Path]:
+    """
+    Find scene file in tmp_review directory.
+    
+    Args:
+        tmp_review_path: Path to tmp_review directory
+        blend_file_name: Name of the blend file to find (e.g., "2B.blend")
+    
+    Returns:
+        Path to scene file if found, None otherwise
+    """
+    scene_file_path = tmp_review_path / blend_file_name
+    
+    if scene_file_path.exists():
+        logger.debug("Found scene file at: %s", scene_file_path)
+        return scene_file_path
+    
+    # Try recursive search
+    found_files = list(tmp_review_path.rglob(blend_file_name))
+    if found_files:
+        scene_file_path = found_files[0]
+        logger.debug("Found scene file recursively at: %s", scene_file_path)
+        return scene_file_path
+    
+    logger.debug("Scene file '%s' not found in tmp_review", blend_file_name)
+    return None
+
+
+def _find_object_in_tmp_review_blend_files(
+    tmp_review_path: Path,
+    scene_file_path: Path,
+    object_name: str,
+    object_type: Optional[str] = None
+) -> Optional[Tuple[Path, str]]:
+    """
+    Find object in .blend files within tmp_review directory.
+    
+    Args:
+        tmp_review_path: Path to tmp_review directory
+        scene_file_path: Path to scene file (already checked)
+        object_name: Name of object to find
+        object_type: Optional object type (MESH, LIGHT, etc.)
+    
+    Returns:
+        Tuple of (blend_file_path, object_name_in_file) if found, None otherwise
+    """
+    from ..operators.mesh_io import _find_object_in_blend_file
+    
+    # First check scene file
+    logger.debug("Checking scene file %s for object '%s' (type: %s)", scene_file_path, object_name, object_type)
+    found_name = _find_object_in_blend_file(scene_file_path, object_name, object_type)
+    if found_name:
+        logger.debug("✓ Found object '%s' in scene file", found_name)
+        return scene_file_path, found_name
+    
+    logger.debug("Object not found in %s, searching all .blend files in tmp_review...", scene_file_path.name)
+    
+    # Find all .blend files (excluding backups)
+    all_blend_files = []
+    all_blend_files.extend(tmp_review_path.rglob("*.blend"))
+    
+    # Also check manually (in case rglob misses some)
+    try:
+        for item in tmp_review_path.iterdir():
+            if item.is_file() and item.name.endswith('.blend') and not item.name.endswith(('.blend1', '.blend2', '.blend3', '.blend4', '.blend5')):
+                if item.name.count('.blend') == 1:  # Only one occurrence of .blend
+                    if item not in all_blend_files:
+                        all_blend_files.append(item)
+                        logger.debug("Found .blend file via iterdir: %s", item.name)
+    except (OSError, PermissionError) as e:
+        logger.debug("Error listing files: %s", e)
+    
+    # Filter out backups
+    all_blend_files = [bf for bf in all_blend_files if not bf.name.endswith(('.blend1', '.blend2', '.blend3', '.blend4', '.blend5'))]
+    
+    logger.debug("Found %s .blend files in tmp_review (excluding backups)", len(all_blend_files))
+    if logger.isEnabledFor(logging.DEBUG):
+        for bf in all_blend_files:
+            logger.debug("  - %s (exists: %s, is_file: %s)", bf.name, bf.exists(), bf.is_file())
+    
+    # Check each blend file
+    for blend_file in all_blend_files:
+        if blend_file == scene_file_path:
+            logger.debug("Skipping %s (already checked)", blend_file.name)
+            continue
+        
+        if not blend_file.exists():
+            logger.debug("Skipping %s (does not exist)", blend_file.name)
+            continue
+        
+        logger.debug("Checking %s for object '%s'...", blend_file.name, object_name)
+        found_name = _find_object_in_blend_file(blend_file, object_name, object_type)
+        if found_name:
+            logger.debug("✓ Found object '%s' in %s", found_name, blend_file.name)
+            return blend_file, found_name
+        else:
+            logger.debug("  Object '%s' not found in %s", object_name, blend_file.name)
+    
+    logger.debug("Object '%s' (type: %s) not found in any .blend file", object_name, object_type)
+    return None
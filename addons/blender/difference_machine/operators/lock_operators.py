@@ -11,11 +11,39 @@ import os
 
 from ..utils.helpers import get_repository_path, get_blender_files, check_locked_files
 from ..utils.forester_cli import get_cli
+from ..utils.lock_cache import get_lock_cache
+from ..utils.image_paths import get_image_path_cache
 from ..utils.logging_config import get_logger
 
 logger = get_logger(__name__)
 
 
+def _get_texture_files() -> List[Path]:
+    """Собрать пути всех внешних (не упакованных) текстур, существующих на диске сейчас."""
+    return get_image_path_cache().get_external_files(refresh_signatures=True)
+
+
+def _to_repo_relative(repo_path: Path, file_paths: List[Path]) -> Dict[str, Path]:
+    """
+    Преобразовать пути в относительные от корня репозитория.
+    
+    Returns:
+        Словарь {относительный путь (posix): исходный путь}
+    """
+    repo_path_resolved = repo_path.resolve()
+    result = {}
+    for file_path in file_paths:
+        resolved = file_path.resolve()
+        try:
+            file_path_str = resolved.relative_to(repo_path_resolved).as_posix()
+        except ValueError:
+            # Файл вне репозитория: полный путь (по имени файлы с одинаковыми
+            # именами из разных папок перекрыли бы друг друга)
+            file_path_str = resolved.as_posix()
+        result[file_path_str] = file_path
+    return result
+
+
 class DF_OT_check_locks(Operator):
     """Check if current Blender files are locked."""
     bl_idname = "df.check_locks"
@@ -30,6 +58,7 @@ class DF_OT_check_locks(Operator):
             return {'CANCELLED'}
         
         locked_files = check_locked_files(repo_path)
+        get_lock_cache().store(repo_path, locked_files)
         
         if not locked_files:
             self.report({'INFO'}, "No locked files found")
@@ -112,6 +141,7 @@ class DF_OT_lock_file(Operator):
                 exclusive=self.exclusive,
                 expire_hours=self.expire_hours if self.expire_hours > 0 else None
             )
+            get_lock_cache().invalidate(repo_path)
             
             if success:
                 lock_type = "exclusive" if self.exclusive else "shared"
@@ -153,6 +183,7 @@ class DF_OT_unlock_file(Operator):
         try:
             cli = get_cli()
             success, error_msg = cli.unlock_file(repo_path, self.file_path)
+            get_lock_cache().invalidate(repo_path)
             
             if success:
                 self.report({'INFO'}, f"Unlocked {Path(self.file_path).name}")
@@ -197,67 +228,27 @@ class DF_OT_lock_current_blend(Operator):
             self.report({'ERROR'}, error)
             return {'CANCELLED'}
         
-        cli = get_cli()
-        locked_files = []
-        failed_files = []
-        
-        # 1. Блокируем текущий .blend файл
-        blend_path = Path(bpy.data.filepath).resolve()
-        repo_path_resolved = repo_path.resolve()
-        try:
-            file_path = blend_path.relative_to(repo_path_resolved)
-            file_path_str = file_path.as_posix()
-        except ValueError:
-            file_path_str = blend_path.name
+        # .blend файл и все текстуры блокируются одним вызовом CLI
+        blend_path = Path(bpy.data.filepath)
+        targets = _to_repo_relative(repo_path, [blend_path] + _get_texture_files())
         
-        success, error_msg = cli.lock_file(
+        results = get_cli().lock_files(
             repo_path,
-            file_path_str,
+            list(targets.keys()),
             exclusive=self.exclusive,
             expire_hours=self.expire_hours if self.expire_hours > 0 else None
         )
         
-        if success:
-            locked_files.append(blend_path.name)
-        else:
-            failed_files.append(f"{blend_path.name}: {error_msg or 'Already locked'}")
+        locked_files = []
+        failed_files = []
+        for file_path_str, (success, error_msg) in results.items():
+            name = targets[file_path_str].name
+            if success:
+                locked_files.append(name)
+            else:
+                failed_files.append(f"{name}: {error_msg or 'Already locked'}")
         
-        # 2. Блокируем все текстуры
-        texture_files = []
-        for image in bpy.data.images:
-            if image.packed_file:
-                continue  # Пропускаем упакованные текстуры
-            
-            if image.filepath:
-                try:
-                    abs_path = Path(bpy.path.abspath(image.filepath))
-                    if abs_path.exists() and abs_path.is_file():
-                        texture_files.append(abs_path)
-                except Exception as e:
-                    logger.debug(f"Failed to resolve texture path {image.filepath}: {e}")
-        
-        for texture_path in texture_files:
-            try:
-                try:
-                    file_path = texture_path.relative_to(repo_path_resolved)
-                    file_path_str = file_path.as_posix()
-                except ValueError:
-                    file_path_str = texture_path.name
-                
-                success, error_msg = cli.lock_file(
-                    repo_path,
-                    file_path_str,
-                    exclusive=self.exclusive,
-                    expire_hours=self.expire_hours if self.expire_hours > 0 else None
-                )
-                
-                if success:
-                    locked_files.append(texture_path.name)
-                else:
-                    failed_files.append(f"{texture_path.name}: {error_msg or 'Already locked'}")
-            except Exception as e:
-                failed_files.append(f"{texture_path.name}: {str(e)}")
-                logger.error(f"Error locking texture {texture_path}: {e}", exc_info=True)
+        get_lock_cache().invalidate(repo_path)
         
         # Формируем отчет
         lock_type = "exclusive" if self.exclusive else "shared"
@@ -291,57 +282,25 @@ class DF_OT_unlock_current_blend(Operator):
             self.report({'ERROR'}, error)
             return {'CANCELLED'}
         
-        cli = get_cli()
-        unlocked_files = []
-        failed_files = []
+        # .blend файл и все текстуры разблокируются одним вызовом CLI
+        blend_path = Path(bpy.data.filepath)
+        targets = _to_repo_relative(repo_path, [blend_path] + _get_texture_files())
         
-        # 1. Разблокируем текущий .blend файл
-        blend_path = Path(bpy.data.filepath).resolve()
-        repo_path_resolved = repo_path.resolve()
-        try:
-            file_path = blend_path.relative_to(repo_path_resolved)
-            file_path_str = file_path.as_posix()
-        except ValueError:
-            file_path_str = blend_path.name
+        results = get_cli().unlock_files(repo_path, list(targets.keys()))
         
-        success, error_msg = cli.unlock_file(repo_path, file_path_str)
-        if success:
-            unlocked_files.append(blend_path.name)
-        else:
-            failed_files.append(f"{blend_path.name}: {error_msg or 'Not locked'}")
+        unlocked_files = []
+        failed_files = []
+        for file_path_str, (success, error_msg) in results.items():
+            target = targets[file_path_str]
+            if success:
+                unlocked_files.append(target.name)
+            elif target == blend_path:
+                failed_files.append(f"{target.name}: {error_msg or 'Not locked'}")
+            elif error_msg and "not locked" not in error_msg.lower():
+                # Не считаем ошибкой, если текстура не была заблокирована
+                failed_files.append(f"{target.name}: {error_msg}")
         
-        # 2. Разблокируем все текстуры
-        texture_files = []
-        for image in bpy.data.images:
-            if image.packed_file:
-                continue  # Пропускаем упакованные текстуры
-            
-            if image.filepath:
-                try:
-                    abs_path = Path(bpy.path.abspath(image.filepath))
-                    if abs_path.exists() and abs_path.is_file():
-                        texture_files.append(abs_path)
-                except Exception as e:
-                    logger.debug(f"Failed to resolve texture path {image.filepath}: {e}")
-        
-        for texture_path in texture_files:
-            try:
-                try:
-                    file_path = texture_path.relative_to(repo_path_resolved)
-                    file_path_str = file_path.as_posix()
-                except ValueError:
-                    file_path_str = texture_path.name
-                
-                success, error_msg = cli.unlock_file(repo_path, file_path_str)
-                if success:
-                    unlocked_files.append(texture_path.name)
-                else:
-                    # Не считаем ошибкой, если файл не был заблокирован
-                    if error_msg and "not locked" not in error_msg.lower():
-                        failed_files.append(f"{texture_path.name}: {error_msg}")
-            except Exception as e:
-                failed_files.append(f"{texture_path.name}: {str(e)}")
-                logger.error(f"Error unlocking texture {texture_path}: {e}", exc_info=True)
+        get_lock_cache().invalidate(repo_path)
         
         # Формируем отчет
         if unlocked_files:
@@ -384,54 +343,31 @@ class DF_OT_lock_current_textures(Operator):
             return {'CANCELLED'}
         
         # Получаем список всех текстур
-        texture_files = []
-        for image in bpy.data.images:
-            if image.packed_file:
-                continue  # Пропускаем упакованные текстуры
-            
-            if image.filepath:
-                try:
-                    abs_path = Path(bpy.path.abspath(image.filepath))
-                    if abs_path.exists() and abs_path.is_file():
-                        texture_files.append(abs_path)
-                except Exception as e:
-                    logger.debug(f"Failed to resolve texture path {image.filepath}: {e}")
+        texture_files = _get_texture_files()
         
         if not texture_files:
             self.report({'INFO'}, "No external textures found")
             return {'FINISHED'}
         
-        # Блокируем каждую текстуру
-        cli = get_cli()
+        # Блокируем все текстуры одним вызовом CLI
+        targets = _to_repo_relative(repo_path, texture_files)
+        results = get_cli().lock_files(
+            repo_path,
+            list(targets.keys()),
+            exclusive=self.exclusive,
+            expire_hours=self.expire_hours if self.expire_hours > 0 else None
+        )
+        
         locked_count = 0
         failed_count = 0
-        
-        for texture_path in texture_files:
-            try:
-                # Получаем относительный путь от корня репозитория
-                repo_path_resolved = repo_path.resolve()
-                try:
-                    file_path = texture_path.relative_to(repo_path_resolved)
-                    file_path_str = file_path.as_posix()
-                except ValueError:
-                    # Если текстура вне репозитория, используем имя файла
-                    file_path_str = texture_path.name
-                
-                success, error_msg = cli.lock_file(
-                    repo_path,
-                    file_path_str,
-                    exclusive=self.exclusive,
-                    expire_hours=self.expire_hours if self.expire_hours > 0 else None
-                )
-                
-                if success:
-                    locked_count += 1
-                else:
-                    failed_count += 1
-                    logger.debug(f"Failed to lock {texture_path.name}: {error_msg}")
-            except Exception as e:
+        for file_path_str, (success, error_msg) in results.items():
+            if success:
+                locked_count += 1
+            else:
                 failed_count += 1
-                logger.error(f"Error locking texture {texture_path}: {e}", exc_info=True)
+                logger.debug(f"Failed to lock {targets[file_path_str].name}: {error_msg}")
+        
+        get_lock_cache().invalidate(repo_path)
         
         if locked_count > 0:
             lock_type = "exclusive" if self.exclusive else "shared"
@@ -9,6 +9,7 @@ import json
 import logging
 from pathlib import Path
 from typing import Optional, Dict, Any, List, Tuple
+from ..utils.perf import timed, CATEGORY_STAGE
 
 # Use configured logger from logging_config
 try:
@@ -33,6 +34,7 @@ except ImportError:
 
 # Constants
 MAX_TEXTURE_SIZE_MB = 50
+MATERIALS_DIR = "materials"  # Material files <material_hash>.json next to exported meshes
 FILE_READ_CHUNK_SIZE = 8192
 DEFAULT_COMPARISON_OFFSET = 2.0
 
@@ -77,33 +79,53 @@ def get_empty_blend_path() -> Path:
     return empty_blend_path
 
 
-def export_mesh_to_blend(obj, output_path: Path) -> Tuple[Path, Dict[str, Any]]:
+@timed(CATEGORY_STAGE)
+def export_mesh_to_blend(obj, output_path: Path, materials_path: Optional[Path] = None) -> Tuple[Path, Dict[str, Any]]:
     """
     Export mesh to .blend file + metadata JSON for diff and textures.
     
+    The material is not embedded in the metadata: it is written once to
+    ``<materials_path>/<material_hash>.json`` and the metadata stores only
+    ``material_hash``. Pass the same materials_path for all objects of an
+    export so objects sharing a material share one file.
+    
     Args:
         obj: Blender mesh object
         output_path: Directory to save mesh files
+        materials_path: Directory of material files (default: output_path / MATERIALS_DIR)
     
     Returns:
         Tuple of (blend_path, metadata_dict)
     """
     blend_path = output_path / "mesh.blend"
+    if materials_path is None:
+        materials_path = output_path / MATERIALS_DIR
     
     # Сохраняем имя объекта для использования в метаданных
     obj_name = obj.name
     
     # Извлекаем JSON для diff (всегда экспортируем все данные)
-    mesh_json, material_json = export_mesh_to_json(obj)
+    materials = {}
+    exported = export_mesh_to_json(obj, materials)
+    mesh_json = exported['mesh_json']
+    material_hash = exported['material_hash']
     
     # Save .blend file in background process (doesn't affect current scene)
     _save_object_to_blend(obj, blend_path)
     
+    # Материал записывается один раз: файл с тем же хешем уже содержит его
+    if material_hash:
+        material_path = materials_path / f"{material_hash}.json"
+        if not material_path.exists():
+            materials_path.mkdir(parents=True, exist_ok=True)
+            with open(material_path, 'w', encoding='utf-8') as f:
+                json.dump(materials[material_hash], f, indent=2, ensure_ascii=False)
+    
     # ВАЖНО: Используем сохраненное obj_name, НЕ obj.name (obj уже недействителен!)
     # Сохраняем метаданные
     metadata = {
         'mesh_json': mesh_json,  # Для diff
-        'material_json': material_json,  # Для diff и текстур
+        'material_hash': material_hash,  # Материал: <materials_path>/<material_hash>.json
         'object_name': obj_name,  # Используем сохраненное имя
     }
     
@@ -114,6 +136,27 @@ def export_mesh_to_blend(obj, output_path: Path) -> Tuple[Path, Dict[str, Any]]:
     return blend_path, metadata
 
 
+def load_material_json(materials_path: Path, material_hash: Optional[str]) -> Dict[str, Any]:
+    """
+    Read a material written by export_mesh_to_blend.
+    
+    Args:
+        materials_path: Directory of material files
+        material_hash: material_hash from mesh_metadata.json
+    
+    Returns:
+        Material JSON dict (empty if the object has no material or the file is missing)
+    """
+    if not material_hash:
+        return {}
+    try:
+        with open(Path(materials_path) / f"{material_hash}.json", 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        logger.warning(f"Failed to read material {material_hash[:16]}...: {e}")
+        return {}
+
+
 def _save_object_to_blend(obj, output_path: Path, timeout: int = 60) -> None:
     """
     Save any object type to minimal .blend file using background process.
@@ -202,7 +245,7 @@ def _save_object_to_blend(obj, output_path: Path, timeout: int = 60) -> None:
                 '--obj_scale', str(obj_scale[0]), str(obj_scale[1]), str(obj_scale[2])
             ]
             
-            logger.debug(f"Running background export: {' '.join(cmd)}")
+            logger.debug("Running background export: %s", ' '.join(cmd))
             
             # Execute background export with timeout
             try:
@@ -228,27 +271,29 @@ def _save_object_to_blend(obj, output_path: Path, timeout: int = 60) -> None:
                     stderr=result.stderr
                 )
             
-            logger.debug(f"Background export completed successfully: {output_path}")
+            logger.debug("Background export completed successfully: %s", output_path)
             
         except Exception as e:
             logger.error(f"Error during background export: {e}", exc_info=True)
             raise
 
 
-def export_mesh_to_json(obj):
+@timed(CATEGORY_STAGE)
+def export_mesh_to_json(obj, materials: Optional[Dict[str, Dict[str, Any]]] = None):
     """
     Export Blender mesh object to JSON format with texture tracking.
     Always exports all available data.
     
     Args:
         obj: Blender mesh object
+        materials: Dict of material_hash -> material_json shared by all
+            exported objects; the object's material is added once
         
     Returns:
-        Dict with mesh_json and material_json
+        Dict with mesh_json and material_hash (None if there is no material)
     """
     mesh = obj.data
     mesh_json = {}
-    material_json = {}
     
     # Vertices (always export)
     mesh_json['vertices'] = [[v.co.x, v.co.y, v.co.z] for v in mesh.vertices]
@@ -269,64 +314,16 @@ def export_mesh_to_json(obj):
     mesh_json['normals'] = [[v.normal.x, v.normal.y, v.normal.z] for v in mesh.vertices]
     
     # Materials with texture tracking (always export if available)
+    # Shared materials are exported once and identified by hash
+    material_hash = None
     if obj.material_slots:
         if obj.material_slots[0].material:
-            mat = obj.material_slots[0].material
-            material_json = {
-                'name': mat.name,
-                'use_nodes': mat.use_nodes,
-                'diffuse_color': list(mat.diffuse_color[:4]),
-                'specular_color': list(mat.specular_color[:3]),
-                'roughness': float(mat.roughness),
-                'metallic': float(mat.metallic),
-                'textures': []  # Список текстур с путями и хешами
-            }
-            
-            if mat.use_nodes and mat.node_tree:
-                # Собираем все текстуры из node tree
-                textures = []
-                for node in mat.node_tree.nodes:
-                    if node.type == 'TEX_IMAGE' and node.image:
-                        # Normalize original_path - convert to absolute and normalize separators
-                        original_path = None
-                        if node.image.filepath:
-                            # Get absolute path
-                            abs_path_str = bpy.path.abspath(node.image.filepath)
-                            # Normalize path separators - use Path.as_posix() for cross-platform compatibility
-                            original_path = Path(abs_path_str).as_posix()
-                        
-                        texture_info = {
-                            'node_name': node.name,
-                            'image_name': node.image.name,
-                            'original_path': original_path,
-                            'file_hash': None,  # Будет вычислен при создании коммита
-                            'copied': False,  # Будет установлено при создании коммита
-                            'commit_path': None  # Путь к текстуре в коммите (если скопирована)
-                        }
-                        
-                        # Вычисляем хеш файла текстуры (используем доступный хэшер с запасным вариантом)
-                        if original_path:
-                            abs_path = Path(original_path)
-                            if abs_path.exists():
-                                try:
-                                    texture_info['file_hash'] = compute_file_hash(abs_path)
-                                except Exception:
-                                    # If hashing fails, continue without blocking export
-                                    pass  # Не удалось вычислить хеш
-                        
-                        # Если текстура упакована в blend файл
-                        if node.image.packed_file:
-                            texture_info['is_packed'] = True
-                            texture_info['packed_size'] = len(node.image.packed_file.data)
-                        else:
-                            texture_info['is_packed'] = False
-                        
-                        textures.append(texture_info)
-                
-                material_json['textures'] = textures
-                
-                # Экспортируем полную структуру node tree с информацией о текстурах
-                material_json['node_tree'] = export_node_tree_structure(mat.node_tree, textures)
+            from ..utils.material_cache import get_material_export_cache
+            material_hash, material_json = get_material_export_cache().export(
+                obj.material_slots[0].material, _export_material_json
+            )
+            if materials is not None:
+                materials.setdefault(material_hash, material_json)
     
     # Metadata
     mesh_json['metadata'] = {
@@ -355,10 +352,77 @@ def export_mesh_to_json(obj):
     
     return {
         'mesh_json': mesh_json,
-        'material_json': material_json,
+        'material_hash': material_hash,
     }
 
 
+def _export_material_json(mat) -> Dict[str, Any]:
+    """
+    Export one material: base settings, textures and node tree structure.
+    
+    Called through the material export cache, so a material shared by
+    several objects is walked once.
+    """
+    material_json = {
+        'name': mat.name,
+        'use_nodes': mat.use_nodes,
+        'diffuse_color': list(mat.diffuse_color[:4]),
+        'specular_color': list(mat.specular_color[:3]),
+        'roughness': float(mat.roughness),
+        'metallic': float(mat.metallic),
+        'textures': []  # Список текстур с путями и хешами
+    }
+    
+    if mat.use_nodes and mat.node_tree:
+        # Собираем все текстуры из node tree
+        textures = []
+        for node in mat.node_tree.nodes:
+            if node.type == 'TEX_IMAGE' and node.image:
+                # Normalize original_path - convert to absolute and normalize separators
+                original_path = None
+                if node.image.filepath:
+                    # Get absolute path
+                    abs_path_str = bpy.path.abspath(node.image.filepath)
+                    # Normalize path separators - use Path.as_posix() for cross-platform compatibility
+                    original_path = Path(abs_path_str).as_posix()
+                
+                texture_info = {
+                    'node_name': node.name,
+                    'image_name': node.image.name,
+                    'original_path': original_path,
+                    'file_hash': None,  # Будет вычислен при создании коммита
+                    'copied': False,  # Будет установлено при создании коммита
+                    'commit_path': None  # Путь к текстуре в коммите (если скопирована)
+                }
+                
+                # Вычисляем хеш файла текстуры (используем доступный хэшер с запасным вариантом)
+                if original_path:
+                    abs_path = Path(original_path)
+                    if abs_path.exists():
+                        try:
+                            texture_info['file_hash'] = compute_file_hash(abs_path)
+                        except Exception:
+                            # If hashing fails, continue without blocking export
+                            pass  # Не удалось вычислить хеш
+                
+                # Если текстура упакована в blend файл
+                if node.image.packed_file:
+                    texture_info['is_packed'] = True
+                    texture_info['packed_size'] = len(node.image.packed_file.data)
+                else:
+                    texture_info['is_packed'] = False
+                
+                textures.append(texture_info)
+        
+        material_json['textures'] = textures
+        
+        # Экспортируем полную структуру node tree с информацией о текстурах
+        material_json['node_tree'] = export_node_tree_structure(mat.node_tree, textures)
+    
+    return material_json
+
+
+@timed(CATEGORY_STAGE)
 def export_node_tree_structure(node_tree, textures_info=None):
     """
     Экспортирует структуру node tree с информацией о текстурах для TEX_IMAGE узлов.
@@ -607,21 +671,32 @@ def _find_object_in_blend_file(blend_path: Path, object_name: str, object_type:
     Returns:
         Object name if found, None otherwise
     """
-    logger.debug(f"_find_object_in_blend_file: Looking for '{object_name}' (type: {object_type}) in {blend_path}")
+    logger.debug("_find_object_in_blend_file: Looking for '%s' (type: %s) in %s", object_name, object_type, blend_path)
     
     if not blend_path.exists():
         logger.warning(f"Blend file does not exist: {blend_path}")
         return None
     
+    # Object names alone rule out most files without loading any objects
+    from ..utils.blend_index import get_blend_object_index, FOUND, ABSENT
+    index = get_blend_object_index()
+    indexed = index.lookup(blend_path, object_name, object_type)
+    if indexed == FOUND:
+        logger.debug("✓ Found '%s' in object index of %s", object_name, blend_path)
+        return object_name
+    if indexed == ABSENT:
+        logger.debug("✗ Object index of %s has no match for '%s'", blend_path, object_name)
+        return None
+    
     try:
         with bpy.data.libraries.load(str(blend_path), link=False) as (data_from, data_to):
-            logger.debug(f"File contains {len(data_from.objects)} objects")
-            if data_from.objects:
-                logger.debug(f"Object names in file: {list(data_from.objects)[:20]}")
+            logger.debug("File contains %s objects", len(data_from.objects))
+            if data_from.objects and logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Object names in file: %s", list(data_from.objects)[:20])
             
             # First, try exact name match
             if object_name in data_from.objects:
-                logger.debug(f"Found exact match: '{object_name}'")
+                logger.debug("Found exact match: '%s'", object_name)
                 if object_type:
                     # Load temporarily to check type
                     data_to.objects = [object_name]
@@ -629,18 +704,18 @@ def _find_object_in_blend_file(blend_path: Path, object_name: str, object_type:
                     # data_to.objects is just a list of names that were requested
                     if object_name in bpy.data.objects:
                         obj = bpy.data.objects[object_name]
-                        logger.debug(f"Loaded object type: {obj.type}, expected: {object_type}")
+                        logger.debug("Loaded object type: %s, expected: %s", obj.type, object_type)
                         if obj.type == object_type:
                             obj_name = obj.name
                             bpy.data.objects.remove(obj)
-                            logger.debug(f"✓ Exact match found and type matches: '{obj_name}'")
+                            logger.debug("✓ Exact match found and type matches: '%s'", obj_name)
                             return obj_name
                         bpy.data.objects.remove(obj)
-                        logger.debug(f"Type mismatch: {obj.type} != {object_type}")
+                        logger.debug("Type mismatch: %s != %s", obj.type, object_type)
                     else:
-                        logger.debug(f"Object '{object_name}' was not loaded into bpy.data.objects")
+                        logger.debug("Object '%s' was not loaded into bpy.data.objects", object_name)
                 else:
-                    logger.debug(f"✓ Exact match found (no type check): '{object_name}'")
+                    logger.debug("✓ Exact match found (no type check): '%s'", object_name)
                     return object_name
             
             # If not found by exact name, check all objects
@@ -657,9 +732,9 @@ def _find_object_in_blend_file(blend_path: Path, object_name: str, object_type:
                     if obj_name in bpy.data.objects:
                         loaded_objects.append(bpy.data.objects[obj_name])
                 
-                logger.debug(f"Loaded {len(loaded_objects)} objects from file")
+                logger.debug("Loaded %s objects from file", len(loaded_objects))
                 for obj in loaded_objects:
-                    logger.debug(f"  Checking object: '{obj.name}' (type: {obj.type})")
+                    logger.debug("  Checking object: '%s' (type: %s)", obj.name, obj.type)
                     # Check if name matches (case-insensitive or partial match)
                     if (obj.name == object_name or 
                         obj.name.lower() == object_name.lower() or
@@ -668,24 +743,24 @@ def _find_object_in_blend_file(blend_path: Path, object_name: str, object_type:
                         # Check type if specified
                         if not object_type or obj.type == object_type:
                             obj_name = obj.name
-                            logger.debug(f"✓ Found matching object: '{obj_name}' (type: {obj.type})")
+                            logger.debug("✓ Found matching object: '%s' (type: %s)", obj_name, obj.type)
                             # Clean up all loaded objects
                             for loaded_obj in loaded_objects:
                                 bpy.data.objects.remove(loaded_obj)
                             return obj_name
                         else:
-                            logger.debug(f"  Object type mismatch: expected {object_type}, got {obj.type}")
+                            logger.debug("  Object type mismatch: expected %s, got %s", object_type, obj.type)
                     else:
-                        logger.debug(f"  Name mismatch: '{obj.name}' != '{object_name}'")
+                        logger.debug("  Name mismatch: '%s' != '%s'", obj.name, object_name)
                 
                 # Clean up if no match found
-                logger.debug(f"No matching object found in {len(loaded_objects)} objects")
+                logger.debug("No matching object found in %s objects", len(loaded_objects))
                 for obj in loaded_objects:
                     bpy.data.objects.remove(obj)
     except Exception as e:
         logger.error(f"Failed to check blend file {blend_path}: {e}", exc_info=True)
     
-    logger.debug(f"✗ Object '{object_name}' (type: {object_type}) not found in {blend_path}")
+    logger.debug("✗ Object '%s' (type: %s) not found in %s", object_name, object_type, blend_path)
     return None
 
 
@@ -793,7 +868,7 @@ def import_object_from_blend(
             if object_type and obj.type != object_type:
                 # Wrong type, remove and return None
                 bpy.data.objects.remove(obj)
-                logger.debug(f"Object type mismatch: expected {object_type}, got {obj.type}")
+                logger.debug("Object type mismatch: expected %s, got %s", object_type, obj.type)
                 return None
             
             # Link to scene (but don't change active object - let caller handle selection)
@@ -801,7 +876,7 @@ def import_object_from_blend(
             # Don't select or activate - let the caller decide
             # obj.select_set(True)
             # context.view_layer.objects.active = obj
-            logger.debug(f"Successfully imported object '{obj.name}' (type: {obj.type})")
+            logger.debug("Successfully imported object '%s' (type: %s)", obj.name, obj.type)
             return obj
         
         logger.warning(f"Object '{loaded_object_name}' was not loaded into bpy.data.objects")
@@ -811,6 +886,7 @@ def import_object_from_blend(
         return None
 
 
+@timed(CATEGORY_STAGE)
 def link_object_from_blend(
     blend_path: Path,
     object_name: str,
@@ -859,45 +935,18 @@ def link_object_from_blend(
                     else:
                         return None
         
-        # After linking, find the linked object by name and library reference
+        # After the with-block data_to holds the linked datablocks themselves
         linked_obj = None
-        if linked_obj_name and linked_obj_name in bpy.data.objects:
-            candidate = bpy.data.objects[linked_obj_name]
-            # Verify it's actually a linked object (has library attribute)
-            if hasattr(candidate, 'library') and candidate.library:
-                linked_obj = candidate
+        if linked_obj_name:
+            linked_obj = next((obj for obj in data_to.objects if obj is not None), None)
         
-        # If not found by name, search for any linked object from this file
-        if not linked_obj:
-            blend_path_str = str(blend_path.resolve())  # Use absolute path for comparison
-            for obj in bpy.data.objects:
-                if hasattr(obj, 'library') and obj.library:
-                    # Compare absolute paths
-                    try:
-                        lib_path = Path(obj.library.filepath).resolve()
-                        if lib_path == Path(blend_path_str).resolve():
-                            # Check if this matches our criteria
-                            if object_name and obj.name == object_name:
-                                linked_obj = obj
-                                break
-                            elif not object_name and object_type and obj.type == object_type:
-                                linked_obj = obj
-                                break
-                            elif not object_name and not object_type:
-                                linked_obj = obj
-                                break
-                    except Exception:
-                        # If path comparison fails, try string comparison
-                        if str(obj.library.filepath) == str(blend_path):
-                            if object_name and obj.name == object_name:
-                                linked_obj = obj
-                                break
-                            elif not object_name and object_type and obj.type == object_type:
-                                linked_obj = obj
-                                break
-                            elif not object_name and not object_type:
-                                linked_obj = obj
-                                break
+        from ..utils.blend_index import get_linked_library_index
+        library_index = get_linked_library_index()
+        if linked_obj is not None and getattr(linked_obj, 'library', None):
+            library_index.add(linked_obj)
+        else:
+            # Look the object up through its library instead of scanning all objects
+            linked_obj = library_index.find_object(blend_path, linked_obj_name, object_type if not linked_obj_name else None)
         
         if not linked_obj:
             logger.warning(f"Object '{object_name}' not found after linking from {blend_path}")
@@ -907,20 +956,21 @@ def link_object_from_blend(
         if object_type and linked_obj.type != object_type:
             # Wrong type, unlink and return None
             bpy.data.objects.remove(linked_obj)
-            logger.debug(f"Object type mismatch: expected {object_type}, got {linked_obj.type}")
+            logger.debug("Object type mismatch: expected %s, got %s", object_type, linked_obj.type)
             return None
         
         # Link to scene collection if not already linked
         if linked_obj.name not in context.collection.objects:
             context.collection.objects.link(linked_obj)
         
-        logger.debug(f"Successfully linked object '{linked_obj.name}' (type: {linked_obj.type}) from {blend_path}")
+        logger.debug("Successfully linked object '%s' (type: %s) from %s", linked_obj.name, linked_obj.type, blend_path)
         return linked_obj
     except Exception as e:
         logger.error(f"Failed to link object from blend: {e}", exc_info=True)
         return None
 
 
+@timed(CATEGORY_STAGE)
 def import_object_from_blend_background(
     blend_path: Path,
     object_name: str,
@@ -978,7 +1028,7 @@ def import_object_from_blend_background(
             '--output_file', str(temp_output_path)
         ]
         
-        logger.debug(f"Running background import: {' '.join(cmd)}")
+        logger.debug("Running background import: %s", ' '.join(cmd))
         
         try:
             # Execute background import with timeout
@@ -999,7 +1049,7 @@ def import_object_from_blend_background(
                 logger.error(f"Background import failed with code {result.returncode}: {error_msg}")
                 return None
             
-            logger.debug(f"Background import completed successfully: {temp_output_path}")
+            logger.debug("Background import completed successfully: %s", temp_output_path)
             
             # Now import object from temporary file (this is safe as it's a clean file)
             if not temp_output_path.exists():
@@ -1063,7 +1113,7 @@ def import_object_from_blend_background(
                     bpy.data.objects.remove(obj)
                 except:
                     pass
-                logger.debug(f"Object type mismatch: expected {object_type}, got {obj_type_actual}")
+                logger.debug("Object type mismatch: expected %s, got %s", object_type, obj_type_actual)
                 return None
             
             # Get fresh reference before linking to scene
@@ -1086,7 +1136,7 @@ def import_object_from_blend_background(
                 # Don't select or activate - let the caller decide
                 # obj.select_set(True)
                 # context.view_layer.objects.active = obj
-                logger.debug(f"Successfully imported object '{obj_name_for_linking}' (type: {obj.type}) from background process")
+                logger.debug("Successfully imported object '%s' (type: %s) from background process", obj_name_for_linking, obj.type)
             except (AttributeError, ReferenceError, KeyError) as e:
                 logger.error(f"Failed to link object to scene: {e}", exc_info=True)
                 return None
@@ -1108,6 +1158,7 @@ def import_object_from_blend_background(
             return None
 
 
+@timed(CATEGORY_STAGE)
 def import_mesh_to_blender(context, mesh_json, material_json, obj_name: str, mode: str = 'NEW', 
                           mesh_storage_path: Path = None, material_prefix: str = None):
     """
@@ -1116,7 +1167,7 @@ def import_mesh_to_blender(context, mesh_json, material_json, obj_name: str, mod
     Args:
         context: Blender context
         mesh_json: Mesh JSON data
-        material_json: Material JSON data
+        material_json: Material JSON data (see load_material_json)
         obj_name: Object name
         mode: 'NEW' to create new object, 'SELECTED' to replace selected object
         mesh_storage_path: Path to mesh storage directory (for loading textures)
@@ -1245,7 +1296,7 @@ def import_node_tree_structure(node_tree, node_tree_data, textures_info=None, me
         logger.error("node_tree is None or invalid")
         return
     
-    logger.debug(f"Importing node tree structure. nodes count: {len(node_tree_data.get('nodes', []))}, textures_info: {len(textures_info) if textures_info else 0}, mesh_storage_path: {mesh_storage_path}")
+    logger.debug("Importing node tree structure. nodes count: %s, textures_info: %s, mesh_storage_path: %s", len(node_tree_data.get('nodes', [])), len(textures_info) if textures_info else 0, mesh_storage_path)
     
     # Clear existing nodes (like in difference_engine)
     node_tree.nodes.clear()
@@ -1261,13 +1312,13 @@ def import_node_tree_structure(node_tree, node_tree_data, textures_info=None, me
             node_name = tex_info.get('node_name')
             if node_name:
                 texture_map[node_name] = tex_info
-                logger.debug(f"Added texture to map: node_name={node_name}, copied={tex_info.get('copied')}, commit_path={tex_info.get('commit_path')}, original_path={tex_info.get('original_path')}")
+                logger.debug("Added texture to map: node_name=%s, copied=%s, commit_path=%s, original_path=%s", node_name, tex_info.get('copied'), tex_info.get('commit_path'), tex_info.get('original_path'))
     
     # Get textures directory
     textures_dir = None
     if mesh_storage_path:
         textures_dir = mesh_storage_path / "textures"
-        logger.debug(f"Textures directory: {textures_dir}, exists: {textures_dir.exists() if textures_dir else False}")
+        logger.debug("Textures directory: %s, exists: %s", textures_dir, textures_dir.exists() if textures_dir else False)
     
     # Create nodes
     for node_data in node_tree_data.get('nodes', []):
@@ -1292,7 +1343,7 @@ def import_node_tree_structure(node_tree, node_tree_data, textures_info=None, me
         
         try:
             node = node_tree.nodes.new(type=node_type)
-            logger.debug(f"Created node: {node.name} (type: {node_type}, original: {original_type})")
+            logger.debug("Created node: %s (type: %s, original: %s)", node.name, node_type, original_type)
         except Exception as e:
             logger.error(f"Failed to create node type '{node_type}' (from '{original_type}'): {e}")
             continue
@@ -1315,67 +1366,79 @@ def import_node_tree_structure(node_tree, node_tree_data, textures_info=None, me
         # Note: We create TEX_IMAGE nodes even if textures_dir doesn't exist
         # The function will try to load the texture but won't fail if it can't find it
         if original_type == 'TEX_IMAGE':
-            logger.debug(f"Importing image texture node: {node.name}, textures_dir: {textures_dir}")
+            logger.debug("Importing image texture node: %s, textures_dir: %s", node.name, textures_dir)
             _import_image_texture(node, node_data, texture_map, textures_dir)
-            logger.debug(f"Finished importing image texture node: {node.name}, has image: {hasattr(node, 'image') and node.image is not None}")
+            logger.debug("Finished importing image texture node: %s, has image: %s", node.name, hasattr(node, 'image') and node.image is not None)
         
         # Restore node properties (AFTER image is loaded for TEX_IMAGE nodes)
         if 'properties' in node_data:
             _import_node_properties(node, node_data['properties'])
         
-        # Set input default values
+        # Set input default values (zip: indexing an RNA collection walks it)
         if 'inputs' in node_data:
-            for i, input_data in enumerate(node_data['inputs']):
-                if i < len(node.inputs):
-                    default_value = input_data.get('default_value')
-                    if default_value is not None:
-                        try:
-                            if isinstance(default_value, list):
-                                node.inputs[i].default_value = tuple(default_value)
-                            else:
-                                node.inputs[i].default_value = default_value
-                        except (TypeError, AttributeError, ValueError) as e:
-                            # Some sockets might not accept the value or wrong size
-                            pass
+            for input_socket, input_data in zip(node.inputs, node_data['inputs']):
+                default_value = input_data.get('default_value')
+                if default_value is not None:
+                    try:
+                        if isinstance(default_value, list):
+                            input_socket.default_value = tuple(default_value)
+                        else:
+                            input_socket.default_value = default_value
+                    except (TypeError, AttributeError, ValueError) as e:
+                        # Some sockets might not accept the value or wrong size
+                        pass
         
         created_nodes[node_data.get('name', node.name)] = node
     
-    # Create node links (connections between nodes)
+    # Resolve all links through (node, socket name) -> socket maps built once
+    # per node, then create them in one pass
+    output_maps = {}
+    input_maps = {}
+    resolved_links = []
     for link_data in node_tree_data.get('links', []):
         try:
-            from_node = created_nodes.get(link_data['from_node'])
-            to_node = created_nodes.get(link_data['to_node'])
+            from_name = link_data['from_node']
+            to_name = link_data['to_node']
+            from_node = created_nodes.get(from_name)
+            to_node = created_nodes.get(to_name)
             
             if from_node and to_node:
-                from_socket = None
-                to_socket = None
-                
-                # Find the output socket
-                for output in from_node.outputs:
-                    if output.name == link_data['from_socket']:
-                        from_socket = output
-                        break
+                if from_name not in output_maps:
+                    output_maps[from_name] = _index_by_name(from_node.outputs)
+                if to_name not in input_maps:
+                    input_maps[to_name] = _index_by_name(to_node.inputs)
                 
-                # Find the input socket
-                for input_socket in to_node.inputs:
-                    if input_socket.name == link_data['to_socket']:
-                        to_socket = input_socket
-                        break
-                
-                # Create the link
+                from_socket = output_maps[from_name].get(link_data['from_socket'])
+                to_socket = input_maps[to_name].get(link_data['to_socket'])
                 if from_socket and to_socket:
-                    node_tree.links.new(from_socket, to_socket)
+                    resolved_links.append((from_socket, to_socket))
+        except Exception as e:
+            logger.warning(f"Failed to resolve link: {e}")
+    
+    # Create node links (connections between nodes)
+    links = node_tree.links
+    for from_socket, to_socket in resolved_links:
+        try:
+            links.new(from_socket, to_socket)
         except Exception as e:
             logger.warning(f"Failed to create link: {e}")
 
 
+def _index_by_name(items) -> Dict[str, Any]:
+    """Map names to nodes or sockets; the first item wins on duplicate names."""
+    index = {}
+    for item in items:
+        index.setdefault(item.name, item)
+    return index
+
+
 def _import_image_texture(node, node_data, texture_map, textures_dir):
     """Import image texture node with multiple path resolution strategies"""
     # Note: We don't return early if textures_dir doesn't exist
     # The node is already created, we just try to load the image
     # If textures_dir is missing, we'll try alternative paths (original_path, etc.)
     if not textures_dir or not textures_dir.exists():
-        logger.debug(f"Textures directory doesn't exist: {textures_dir}, trying alternative paths")
+        logger.debug("Textures directory doesn't exist: %s, trying alternative paths", textures_dir)
         # Don't return - continue to try alternative paths
         textures_dir = None
     
@@ -1442,18 +1505,18 @@ def _import_image_texture(node, node_data, texture_map, textures_dir):
             cached_name = os.path.basename(resolved_path)
             image = bpy.data.images.get(cached_name)
             if image:
-                logger.debug(f"Reusing cached texture: {cached_name}")
+                logger.debug("Reusing cached texture: %s", cached_name)
                 image.filepath = resolved_path
                 # Force reload to ensure up-to-date display
                 image.reload()
             else:
                 image = bpy.data.images.load(resolved_path)
-                logger.debug(f"Loaded new texture from {resolved_path}")
+                logger.debug("Loaded new texture from %s", resolved_path)
             
             # Assign image to node
             if hasattr(node, 'image'):
                 node.image = image
-                logger.debug(f"Assigned texture {cached_name} to node {node.name}")
+                logger.debug("Assigned texture %s to node %s", cached_name, node.name)
             else:
                 logger.error(f"Node {node.name} doesn't have 'image' attribute!")
         except (OSError, ValueError, PermissionError) as e:
@@ -1497,7 +1560,7 @@ def _import_node_properties(node, props):
         # Try to find the node group in the blend file
         if node_tree_name in bpy.data.node_groups:
             node.node_tree = bpy.data.node_groups[node_tree_name]
-            logger.debug(f"Restored Group node reference: {node_tree_name}")
+            logger.debug("Restored Group node reference: %s", node_tree_name)
         else:
             logger.warning(f"Node group '{node_tree_name}' not found in blend file - Group node will be empty")
     
@@ -1560,6 +1623,7 @@ def _import_node_properties(node, props):
             mapping.update()
 
 
+@timed(CATEGORY_STAGE)
 def load_textures_to_material(material, textures_info, mesh_storage_path):
     """
     Загружает текстуры в материал.
@@ -1573,12 +1637,16 @@ def load_textures_to_material(material, textures_info, mesh_storage_path):
         logger.warning("Material has no node tree")
         return
     
-    logger.debug(f"Loading textures for material: {material.name}")
-    logger.debug(f"Mesh storage path: {mesh_storage_path}")
-    logger.debug(f"Textures info count: {len(textures_info)}")
+    logger.debug("Loading textures for material: %s", material.name)
+    logger.debug("Mesh storage path: %s", mesh_storage_path)
+    logger.debug("Textures info count: %s", len(textures_info))
     
     # Debug: log all nodes in material
-    logger.debug(f"Nodes in material: {[n.name + ' (' + n.type + ')' for n in material.node_tree.nodes]}")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Nodes in material: %s", [n.name + ' (' + n.type + ')' for n in material.node_tree.nodes])
+    
+    # Image texture nodes by name, built once instead of a scan per texture
+    texture_nodes = _index_by_name(node for node in material.node_tree.nodes if node.type == 'TEX_IMAGE')
     
     for texture_info in textures_info:
         node_name = texture_info.get('node_name')
@@ -1586,15 +1654,10 @@ def load_textures_to_material(material, textures_info, mesh_storage_path):
             logger.warning("Skipping texture: no node_name")
             continue
         
-        logger.debug(f"Looking for texture node: {node_name}")
+        logger.debug("Looking for texture node: %s", node_name)
         
         # Находим узел текстуры в node tree
-        texture_node = None
-        for node in material.node_tree.nodes:
-            if node.name == node_name and node.type == 'TEX_IMAGE':
-                texture_node = node
-                logger.debug(f"Found texture node: {node.name}")
-                break
+        texture_node = texture_nodes.get(node_name)
         
         if not texture_node:
             logger.warning(f"Texture node '{node_name}' not found in material node tree")
@@ -1613,7 +1676,7 @@ def load_textures_to_material(material, textures_info, mesh_storage_path):
                 commit_path = commit_path.replace('textures/', '', 1)
             # Use Path for cross-platform compatibility
             texture_path = mesh_storage_path / "textures" / commit_path
-            logger.debug(f"Using copied texture path: {texture_path}")
+            logger.debug("Using copied texture path: %s", texture_path)
         elif texture_info.get('original_path'):
             # Используем оригинальный путь
             original_path = str(texture_info['original_path'])
@@ -1621,7 +1684,7 @@ def load_textures_to_material(material, textures_info, mesh_storage_path):
             normalized_original = Path(original_path).as_posix()
             # Use bpy.path.abspath to resolve relative paths correctly
             texture_path = Path(bpy.path.abspath(normalized_original))
-            logger.debug(f"Using original texture path: {texture_path} (normalized from: {original_path})")
+            logger.debug("Using original texture path: %s (normalized from: %s)", texture_path, original_path)
         
         # Загружаем текстуру
         if texture_path and texture_path.exists() and texture_path.is_file():
@@ -1631,10 +1694,10 @@ def load_textures_to_material(material, textures_info, mesh_storage_path):
             
             if not image:
                 try:
-                    logger.debug(f"Loading texture: {texture_path}")
+                    logger.debug("Loading texture: %s", texture_path)
                     image = bpy.data.images.load(str(texture_path))
                     image.name = image_name
-                    logger.debug(f"Texture loaded: {image.name}")
+                    logger.debug("Texture loaded: %s", image.name)
                 except (OSError, ValueError, PermissionError) as e:
                     logger.error(f"Failed to load texture {texture_path}: {e}", exc_info=True)
                     continue
@@ -1646,12 +1709,12 @@ def load_textures_to_material(material, textures_info, mesh_storage_path):
                 if image.filepath != str(texture_path):
                     image.filepath = str(texture_path)
                     image.reload()
-                logger.debug(f"Using existing texture: {image.name}")
+                logger.debug("Using existing texture: %s", image.name)
             
             # Назначаем текстуру узлу
             if hasattr(texture_node, 'image'):
                 texture_node.image = image
-                logger.debug(f"Assigned texture {image.name} to node {texture_node.name}")
+                logger.debug("Assigned texture %s to node %s", image.name, texture_node.name)
             else:
                 logger.error(f"Texture node {texture_node.name} has no 'image' attribute")
         else:
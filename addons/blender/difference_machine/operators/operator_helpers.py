@@ -37,21 +37,25 @@ def get_addon_preferences(context):
     return _get_addon_preferences(context)
 
 
-def cleanup_old_preview_temp(repo_path: Path, keep_current: Optional[str] = None) -> None:
+def _cleanup_temp_subdirs(repo_path: Path, temp_name: str, keep_current: Optional[str] = None) -> None:
     """
-    Clean up old preview_temp directories, optionally keeping a specific one.
+    Queue stale subdirectories of .DFM/<temp_name> for background deletion.
+    
+    Directories are renamed into the trash area immediately and removed by
+    a worker thread, so this returns without walking or deleting anything.
     
     Args:
         repo_path: Path to repository root
-        keep_current: Optional path to current preview directory to keep (as string)
+        temp_name: Name of the temp directory under .DFM
+        keep_current: Optional path to current directory to keep (as string)
     """
-    import shutil
+    from ..utils.deferred_delete import get_deferred_deleter
     
     dfm_dir = repo_path / ".DFM"
     if not dfm_dir.exists():
         return
     
-    temp_dir = dfm_dir / "preview_temp"
+    temp_dir = dfm_dir / temp_name
     if not temp_dir.exists():
         return
     
@@ -62,35 +66,44 @@ def cleanup_old_preview_temp(repo_path: Path, keep_current: Optional[str] = None
             keep_path = Path(keep_current)
             if not keep_path.exists():
                 keep_path = None  # If path doesn't exist, don't try to keep it
+            else:
+                keep_path = keep_path.resolve()
         
-        # Find all commit directories in preview_temp
-        removed_count = 0
-        total_size = 0
+        deleter = get_deferred_deleter()
+        deleter.recover(repo_path)
+        queued_count = 0
         
         for item in temp_dir.iterdir():
             if not item.is_dir():
                 continue
             
-            # Skip if this is the current preview directory
-            if keep_path and item.resolve() == keep_path.resolve():
+            # Skip if this is the current directory
+            if keep_path and item.resolve() == keep_path:
                 continue
             
-            # Remove old preview directory
-            try:
-                # Calculate size before removal
-                size = sum(f.stat().st_size for f in item.rglob('*') if f.is_file())
-                shutil.rmtree(item)
-                removed_count += 1
-                total_size += size
-                logger.debug(f"Removed old preview_temp directory: {item.name} ({size / (1024*1024):.1f} MB)")
-            except Exception as e:
-                logger.warning(f"Failed to remove preview_temp directory {item.name}: {e}")
+            if deleter.schedule(repo_path, item):
+                queued_count += 1
+                logger.debug(f"Queued old {temp_name} directory for deletion: {item.name}")
         
-        if removed_count > 0:
-            logger.info(f"Cleaned up {removed_count} old preview_temp directories ({total_size / (1024*1024):.1f} MB freed)")
-    
+        if queued_count > 0:
+            _, _, freed_bytes = deleter.stats()
+            logger.info(
+                f"Queued {queued_count} old {temp_name} directories for deletion "
+                f"({freed_bytes / (1024 * 1024):.1f} MB freed so far this session)"
+            )
     except Exception as e:
-        logger.warning(f"Failed to clean up preview_temp directories: {e}", exc_info=True)
+        logger.warning(f"Failed to clean up {temp_name} directories: {e}", exc_info=True)
+
+
+def cleanup_old_preview_temp(repo_path: Path, keep_current: Optional[str] = None) -> None:
+    """
+    Clean up old preview_temp directories, optionally keeping a specific one.
+    
+    Args:
+        repo_path: Path to repository root
+        keep_current: Optional path to current preview directory to keep (as string)
+    """
+    _cleanup_temp_subdirs(repo_path, "preview_temp", keep_current)
 
 
 def cleanup_old_compare_temp(repo_path: Path, keep_current: Optional[str] = None) -> None:
@@ -103,51 +116,7 @@ def cleanup_old_compare_temp(repo_path: Path, keep_current: Optional[str] = None
         repo_path: Path to repository root
         keep_current: Optional path to current compare directory to keep (as string)
     """
-    import shutil
-
-    dfm_dir = repo_path / ".DFM"
-    if not dfm_dir.exists():
-        return
-
-    temp_dir = dfm_dir / "compare_temp"
-    if not temp_dir.exists():
-        return
-
-    try:
-        keep_path = None
-        if keep_current:
-            keep_path = Path(keep_current)
-            if not keep_path.exists():
-                keep_path = None
-
-        removed_count = 0
-        total_size = 0
-
-        for item in temp_dir.iterdir():
-            if not item.is_dir():
-                continue
-
-            if keep_path and item.resolve() == keep_path.resolve():
-                continue
-
-            try:
-                size = sum(f.stat().st_size for f in item.rglob("*") if f.is_file())
-                shutil.rmtree(item)
-                removed_count += 1
-                total_size += size
-                logger.debug(
-                    f"Removed old compare_temp directory: {item.name} ({size / (1024 * 1024):.1f} MB)"
-                )
-            except Exception as e:
-                logger.warning(f"Failed to remove compare_temp directory {item.name}: {e}")
-
-        if removed_count > 0:
-            logger.info(
-                f"Cleaned up {removed_count} old compare_temp directories "
-                f"({total_size / (1024 * 1024):.1f} MB freed)"
-            )
-    except Exception as e:
-        logger.warning("Failed to clean up compare_temp directories: %s", e, exc_info=True)
+    _cleanup_temp_subdirs(repo_path, "compare_temp", keep_current)
 
 
 def copy_project_textures_for_compare(source_root: Path, compare_root: Path) -> None:
@@ -262,23 +231,33 @@ def check_and_run_garbage_collect(context, repo_path: Path) -> None:
                 should_run = True
         
         if should_run:
-            # Run garbage collection using CLI
-            from ..utils.forester_cli import get_cli
+            from ..utils.background_gc import get_background_gc, is_user_idle
+            from ..utils.helpers import get_repository_busy_reason
+            
+            scheduler = get_background_gc()
+            # Never overlap another GC or a commit running in background
+            if get_repository_busy_reason():
+                return
+            
+            # Never start GC while the user is working; the timer retries later
+            if not is_user_idle():
+                scheduler.defer()
+                return
             
-            logger.info("Running scheduled garbage collection...")
-            cli = get_cli()
             # Используем настройку периода хранения reflog из preferences
             reflog_expire_days = getattr(prefs, 'reflog_expire_days', 90)
-            success, stats, error = cli.gc(repo_path, dry_run=False, reflog_expire_days=reflog_expire_days)
             
-            if success and stats:
-                # Update last run time
-                prefs.gc_last_run = current_time
-                logger.info(f"Garbage collection completed: {stats.get('commits_deleted', 0)} commits, "
-                          f"{stats.get('trees_deleted', 0)} trees, {stats.get('blobs_deleted', 0)} blobs deleted")
-            else:
-                error_msg = error if error else "Unknown error"
-                logger.warning(f"Garbage collection failed: {error_msg}")
+            def on_complete(job):
+                # A failed or timed-out run also advances the schedule, so it
+                # is not retried on every check; only a cancelled run is
+                if job.state != 'CANCELLED':
+                    get_addon_preferences(bpy.context).gc_last_run = current_time
+            
+            scheduler.start(
+                repo_path,
+                reflog_expire_days,
+                on_complete=on_complete
+            )
     except Exception as e:
         logger.error(f"Error in scheduled garbage collection: {e}", exc_info=True)
 
@@ -0,0 +1,85 @@
+"""
+Performance statistics operators for Difference Machine addon.
+"""
+
+import time
+import bpy
+from bpy.types import Operator
+from pathlib import Path
+from ..utils.perf import get_perf_registry
+
+
+class DF_OT_perf_reset(Operator):
+    """Reset recorded latency statistics."""
+    bl_idname = "df.perf_reset"
+    bl_label = "Reset Performance Stats"
+    bl_description = "Clear all recorded operator, CLI and stage latency histograms"
+    bl_options = {'REGISTER'}
+
+    def execute(self, context):
+        get_perf_registry().reset()
+        self.report({'INFO'}, "Performance statistics reset")
+        return {'FINISHED'}
+
+
+class DF_OT_perf_export(Operator):
+    """Export recorded latency statistics to JSON."""
+    bl_idname = "df.perf_export"
+    bl_label = "Export Performance Stats"
+    bl_description = "Save latency histograms as a JSON file"
+    bl_options = {'REGISTER'}
+
+    filepath: bpy.props.StringProperty(
+        name="File Path",
+        description="Path of the JSON file to write",
+        subtype='FILE_PATH',
+        default="",
+    )
+
+    filter_glob: bpy.props.StringProperty(
+        default="*.json",
+        options={'HIDDEN'},
+    )
+
+    def invoke(self, context, event):
+        """Open file browser with a timestamped default name."""
+        if not self.filepath:
+            name = time.strftime("dfm_perf_%Y%m%d_%H%M%S.json")
+            self.filepath = str(Path.home() / name)
+        context.window_manager.fileselect_add(self)
+        return {'RUNNING_MODAL'}
+
+    def execute(self, context):
+        if not self.filepath:
+            return {'CANCELLED'}
+
+        path = Path(bpy.path.abspath(self.filepath))
+        if path.suffix.lower() != ".json":
+            path = path.with_suffix(".json")
+
+        try:
+            get_perf_registry().export_json(path)
+        except OSError as e:
+            self.report({'ERROR'}, f"Failed to export performance stats: {e}")
+            return {'CANCELLED'}
+
+        self.report({'INFO'}, f"Performance stats exported to {path}")
+        return {'FINISHED'}
+
+
+classes = [
+    DF_OT_perf_reset,
+    DF_OT_perf_export,
+]
+
+
+def register():
+    """Register performance operators."""
+    for cls in classes:
+        bpy.utils.register_class(cls)
+
+
+def unregister():
+    """Unregister performance operators."""
+    for cls in reversed(classes):
+        bpy.utils.unregister_class(cls)
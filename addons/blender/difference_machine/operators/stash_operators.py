@@ -9,7 +9,7 @@ from bpy.types import Operator
 from pathlib import Path
 from datetime import datetime
 from ..utils.forester_cli import get_cli
-from ..utils.helpers import get_repository_path
+from ..utils.helpers import get_repository_path, get_repository_busy_reason
 
 
 class DF_OT_stash_and_checkout(Operator):
@@ -28,6 +28,11 @@ class DF_OT_stash_and_checkout(Operator):
             self.report({'ERROR'}, error_msg)
             return {'CANCELLED'}
 
+        busy = get_repository_busy_reason()
+        if busy:
+            self.report({'WARNING'}, busy)
+            return {'CANCELLED'}
+
         cli = get_cli()
         
         # Save stash with timestamp to ensure unique hash
@@ -120,6 +125,11 @@ class DF_OT_save_stash(Operator):
             self.report({'ERROR'}, error_msg)
             return {'CANCELLED'}
 
+        busy = get_repository_busy_reason()
+        if busy:
+            self.report({'WARNING'}, busy)
+            return {'CANCELLED'}
+
         cli = get_cli()
         success, stash_hash, error_msg = cli.stash(
             repo_path, 
@@ -184,6 +194,11 @@ class DF_OT_apply_stash(Operator):
             self.report({'ERROR'}, error_msg)
             return {'CANCELLED'}
 
+        busy = get_repository_busy_reason()
+        if busy:
+            self.report({'WARNING'}, busy)
+            return {'CANCELLED'}
+
         cli = get_cli()
         success, error_msg = cli.stash_apply(
             repo_path, 
@@ -219,6 +234,11 @@ class DF_OT_pop_stash(Operator):
             self.report({'ERROR'}, error_msg)
             return {'CANCELLED'}
 
+        busy = get_repository_busy_reason()
+        if busy:
+            self.report({'WARNING'}, busy)
+            return {'CANCELLED'}
+
         cli = get_cli()
         success, error_msg = cli.stash_pop(
             repo_path, 
@@ -298,6 +318,11 @@ class DF_OT_stash_drop(Operator):
             self.report({'ERROR'}, error_msg)
             return {'CANCELLED'}
 
+        busy = get_repository_busy_reason()
+        if busy:
+            self.report({'WARNING'}, busy)
+            return {'CANCELLED'}
+
         if not self.stash_hash:
             self.report({'ERROR'}, "Stash hash required")
             return {'CANCELLED'}
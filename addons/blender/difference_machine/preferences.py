@@ -7,6 +7,15 @@ from bpy.types import AddonPreferences
 from bpy.props import StringProperty, IntProperty, BoolProperty, EnumProperty
 from pathlib import Path
 
+# Number of slowest entries listed per category in the Performance box
+PERF_ROWS_PER_CATEGORY = 8
+
+
+def _update_log_level(prefs, context):
+    """Apply log level change immediately."""
+    from .utils.logging_config import set_log_level
+    set_log_level(prefs.log_level)
+
 
 class DifferenceMachinePreferences(AddonPreferences):
     bl_idname = __package__
@@ -17,6 +26,41 @@ class DifferenceMachinePreferences(AddonPreferences):
         default="Unknown",
     )
     
+    capture_thumbnails: BoolProperty(
+        name="Capture Thumbnails",
+        description="Store a small viewport thumbnail with every project commit and show it in the history",
+        default=True,
+    )
+    
+    prefetch_budget_mb: IntProperty(
+        name="Prefetch Budget (MB)",
+        description="Largest .blend prefetched when a commit is selected in the history, so Compare and Replace start instantly (0 disables prefetch)",
+        default=512,
+        min=0,
+        max=16384,
+    )
+    
+    # Logging
+    log_level: EnumProperty(
+        name="Log Level",
+        description="Minimum level of messages written to console and ~/blender_addon.log",
+        items=[
+            ('DEBUG', "Debug", "Verbose diagnostics (slower)"),
+            ('INFO', "Info", "Normal operation messages"),
+            ('WARNING', "Warning", "Only warnings and errors"),
+            ('ERROR', "Error", "Only errors"),
+        ],
+        default='INFO',
+        update=_update_log_level,
+    )
+    
+    # Performance statistics
+    show_perf_stats: BoolProperty(
+        name="Show Performance Stats",
+        description="Show recorded latency of operators, forester calls and pipeline stages",
+        default=False,
+    )
+    
     # Reflog settings
     reflog_expire_days: IntProperty(
         name="Reflog Expiration (Days)",
@@ -70,25 +114,22 @@ class DifferenceMachinePreferences(AddonPreferences):
         box = layout.box()
         box.label(text="Commit Settings", icon='SETTINGS')
         box.prop(self, "default_author")
+        box.prop(self, "capture_thumbnails")
+        box.prop(self, "prefetch_budget_mb")
+        box.prop(self, "log_level")
         
         # Garbage collection settings
         box = layout.box()
         box.label(text="Garbage Collection", icon='BRUSH_DATA')
         
-        # Check if repository exists using CLI
+        # Check if repository exists (no CLI call: this panel redraws
+        # continuously while a background GC reports progress)
         blend_file = Path(bpy.data.filepath) if bpy.data.filepath else None
         repo_exists = False
         if blend_file:
             try:
-                from .utils.forester_cli import get_cli
                 from .utils.helpers import find_repository_root
-                
-                repo_path = find_repository_root(blend_file.parent)
-                if repo_path:
-                    # Check if repository is valid by trying status
-                    cli = get_cli()
-                    success, _, _ = cli.status(repo_path)
-                    repo_exists = success
+                repo_exists = find_repository_root(blend_file.parent) is not None
             except Exception:
                 pass
         
@@ -140,6 +181,16 @@ class DifferenceMachinePreferences(AddonPreferences):
                 
                 box.prop(self, "gc_schedule_interval_days", text="Every (days)")
                 
+                # Background run status
+                from .utils.background_gc import get_background_gc
+                scheduler = get_background_gc()
+                row = box.row()
+                if scheduler.is_running:
+                    row.label(text=scheduler.status_text(), icon='SORTTIME')
+                    row.operator("df.cancel_scheduled_gc", text="", icon='CANCEL')
+                else:
+                    row.label(text=f"Status: {scheduler.status_text()}", icon='INFO')
+                
                 # Show last run time if available
                 if self.gc_last_run > 0:
                     import time
@@ -176,6 +227,37 @@ class DifferenceMachinePreferences(AddonPreferences):
         else:
             box.label(text="Save Blender file to enable", icon='INFO')
             box.label(text="database maintenance tools")
+        
+        # Performance statistics
+        box = layout.box()
+        row = box.row()
+        row.prop(self, "show_perf_stats", text="Performance",
+                 icon='TRIA_DOWN' if self.show_perf_stats else 'TRIA_RIGHT', emboss=False)
+        row.operator("df.perf_export", text="", icon='EXPORT')
+        row.operator("df.perf_reset", text="", icon='TRASH')
+        
+        if self.show_perf_stats:
+            from .utils.perf import (
+                get_perf_registry, CATEGORY_OPERATOR, CATEGORY_CLI, CATEGORY_STAGE
+            )
+            registry = get_perf_registry()
+            for category, title in (
+                (CATEGORY_OPERATOR, "Operators"),
+                (CATEGORY_CLI, "Forester Commands"),
+                (CATEGORY_STAGE, "Stages"),
+            ):
+                col = box.column(align=True)
+                col.label(text=title)
+                entries = registry.top(category, limit=PERF_ROWS_PER_CATEGORY)
+                if not entries:
+                    col.label(text="No calls recorded", icon='INFO')
+                    continue
+                for entry in entries:
+                    split = col.split(factor=0.55)
+                    split.label(text=entry["name"])
+                    split.label(
+                        text=f"{entry['count']}x  avg {entry['mean_ms']:.0f} ms  p95 {entry['p95_ms']:.0f} ms"
+                    )
 
 
 def register():
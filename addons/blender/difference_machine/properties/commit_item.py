@@ -6,6 +6,15 @@ import bpy
 from bpy.props import StringProperty, IntProperty, BoolProperty
 
 
+def _update_is_selected(item, context):
+    """Keep the check mark in sync between the filtered and the full commit list."""
+    scene = context.scene
+    for commits in (getattr(scene, 'df_commits_all', ()), getattr(scene, 'df_commits', ())):
+        for commit in commits:
+            if commit.hash == item.hash and commit.is_selected != item.is_selected:
+                commit.is_selected = item.is_selected
+
+
 class DFCommitItem(bpy.types.PropertyGroup):
     """Property group for a single commit in the list."""
     
@@ -17,7 +26,12 @@ class DFCommitItem(bpy.types.PropertyGroup):
     selected_mesh_names: StringProperty(name="Mesh Names")  # JSON string
     screenshot_hash: StringProperty(name="Screenshot Hash")
     tag: StringProperty(name="Tag", default="")
-    is_selected: BoolProperty(name="Selected", default=False)
+    is_selected: BoolProperty(
+        name="Selected",
+        description="Include this commit in the timeline comparison",
+        default=False,
+        update=_update_is_selected,
+    )
     is_head: BoolProperty(name="Is HEAD", default=False)
 
 
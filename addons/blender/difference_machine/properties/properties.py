@@ -3,6 +3,7 @@ Custom properties for Difference Machine add-on.
 """
 
 import bpy
+from pathlib import Path
 from bpy.props import (
     EnumProperty,
     StringProperty,
@@ -78,6 +79,43 @@ def _update_tag_search_filter(prop_group, context):
         scene.df_commit_list_index = max(0, len(scene.df_commits) - 1)
 
 
+def _update_commit_list_index(scene, context):
+    """
+    Update callback for the commit list selection.
+    Prefetches the selected commit so Compare/Replace find warm caches.
+    """
+    if not bpy.data.filepath or not (0 <= scene.df_commit_list_index < len(scene.df_commits)):
+        return
+    from ..utils.helpers import get_repository_path, get_addon_preferences
+    from ..utils.commit_prefetch import get_commit_prefetcher
+    repo_path, _ = get_repository_path()
+    if not repo_path:
+        return
+    try:
+        rel_path = Path(bpy.data.filepath).resolve().relative_to(repo_path.resolve()).as_posix()
+    except ValueError:
+        return
+    budget_mb = getattr(get_addon_preferences(context), 'prefetch_budget_mb', 0)
+    get_commit_prefetcher().request(
+        repo_path, scene.df_commits[scene.df_commit_list_index].hash, rel_path, budget_mb * 1024 * 1024
+    )
+
+
+def _update_history_range(prop_group, context):
+    """
+    Update callback for history range properties.
+    Re-filters the commit list from the in-memory history index.
+    """
+    if not bpy.data.filepath:
+        return
+    try:
+        bpy.ops.df.refresh_history(reload=False)
+    except (RuntimeError, AttributeError) as e:
+        import logging
+        logger = logging.getLogger(__name__)
+        logger.debug(f"Failed to apply history range: {e}")
+
+
 class DFCommitProperties(bpy.types.PropertyGroup):
     """Properties for commit operations."""
     
@@ -96,6 +134,16 @@ class DFCommitProperties(bpy.types.PropertyGroup):
         comparison_obj_name = getattr(scene, 'df_object_comparison_object_name', None)
         original_obj_name = getattr(scene, 'df_object_comparison_original_name', None)
         
+        # With several comparisons, move the one whose object is selected
+        # (linked objects of a timeline share names, so use the object itself)
+        from ..utils.compare_sessions import get_compare_sessions
+        active_obj = context.active_object
+        session = get_compare_sessions().find_by_object(active_obj) if active_obj else None
+        if session is not None:
+            comparison_obj_name = session.object_name
+            original_obj_name = session.original_name
+        slot = session.slot if session is not None else 1
+        
         if not comparison_obj_name or not original_obj_name:
             return
         
@@ -108,7 +156,7 @@ class DFCommitProperties(bpy.types.PropertyGroup):
         
         try:
             # Get objects
-            comparison_obj = bpy.data.objects[comparison_obj_name]
+            comparison_obj = active_obj if session is not None else bpy.data.objects[comparison_obj_name]
             original_obj = bpy.data.objects[original_obj_name]
             
             # Get base location from original object
@@ -122,11 +170,11 @@ class DFCommitProperties(bpy.types.PropertyGroup):
             offset_vector = [0.0, 0.0, 0.0]
             
             if axis == 'X':
-                offset_vector[0] = float(offset)
+                offset_vector[0] = float(offset) * slot
             elif axis == 'Y':
-                offset_vector[1] = float(offset)
+                offset_vector[1] = float(offset) * slot
             elif axis == 'Z':
-                offset_vector[2] = float(offset)
+                offset_vector[2] = float(offset) * slot
             
             # Calculate new location
             new_location = (
@@ -165,6 +213,20 @@ class DFCommitProperties(bpy.types.PropertyGroup):
         default="",
     )
     
+    # Selective staging
+    commit_changed_only: BoolProperty(
+        name="Commit Only Changed Files",
+        description="Stage only files that differ from HEAD instead of letting forester scan the whole project",
+        default=False,
+    )
+    
+    # Modified objects list in the commit panel
+    show_modified_objects: BoolProperty(
+        name="Show Modified Objects",
+        description="List objects changed since the last commit",
+        default=False,
+    )
+    
     # Tag search filter
     tag_search_filter: StringProperty(
         name="Tag Search",
@@ -174,6 +236,39 @@ class DFCommitProperties(bpy.types.PropertyGroup):
         update=_update_tag_search_filter,
     )
     
+    # History time range
+    history_range: EnumProperty(
+        name="Time Range",
+        description="Show only commits made within this period",
+        items=[
+            ('ALL', "All", "Show all commits"),
+            ('DAY', "24 Hours", "Commits from the last 24 hours"),
+            ('WEEK', "Week", "Commits from the last 7 days"),
+            ('TWO_WEEKS', "2 Weeks", "Commits from the last 14 days"),
+            ('MONTH', "Month", "Commits from the last 30 days"),
+            ('YEAR', "Year", "Commits from the last 365 days"),
+            ('CUSTOM', "Custom", "Commits between two points in time"),
+        ],
+        default='ALL',
+        update=_update_history_range,
+    )
+    
+    history_since_days: IntProperty(
+        name="Since (days ago)",
+        description="Start of custom range in days before now (0 = unbounded)",
+        default=30,
+        min=0,
+        update=_update_history_range,
+    )
+    
+    history_until_days: IntProperty(
+        name="Until (days ago)",
+        description="End of custom range in days before now (0 = now)",
+        default=0,
+        min=0,
+        update=_update_history_range,
+    )
+    
     # Branch search filter
     branch_search_filter: StringProperty(
         name="Branch Search",
@@ -237,6 +332,7 @@ def register():
     bpy.types.Scene.df_commit_list_index = bpy.props.IntProperty(
         name="Commit List Index", 
         default=0,
+        update=_update_commit_list_index,
     )
     bpy.types.Scene.df_stash_list_index = bpy.props.IntProperty(name="Stash List Index", default=0)
     
@@ -6,6 +6,15 @@ import bpy
 from bpy.types import UIList
 
 
+def _thumbnail_icon(item, large: bool = False) -> int:
+    """Icon id of a commit's thumbnail, or 0 if it has none (yet)."""
+    if not getattr(item, 'screenshot_hash', ''):
+        return 0
+    from ..utils.thumbnails import get_thumbnail_previews, THUMBNAIL_SIZE_LIST, THUMBNAIL_SIZE_DETAILS
+    size = THUMBNAIL_SIZE_DETAILS if large else THUMBNAIL_SIZE_LIST
+    return get_thumbnail_previews().icon_id(item.screenshot_hash, size)
+
+
 class DF_UL_branch_list(UIList):
     """UIList for displaying branches."""
     bl_idname = "DF_UL_branch_list"
@@ -43,14 +52,19 @@ class DF_UL_commit_list(UIList):
                 message = message[:50] + "..."
             
             row = layout.row()
+            # Check box for the timeline comparison (Selected Object tab)
+            props = getattr(context.scene, 'df_commit_props', None)
+            if props is not None and props.load_commit_tab == 'SELECTED':
+                row.prop(item, "is_selected", text="")
             # Show HEAD indicator if this is the HEAD commit
             is_head_commit = getattr(item, 'is_head', False)
             if is_head_commit:
-                # Show HEAD with icon, then message with icon
                 row.label(text="HEAD", icon='BOOKMARKS')
-                row.label(text=message, icon='COMMUNITY')
+            # Show message with the commit thumbnail, or the generic icon
+            icon_value = _thumbnail_icon(item)
+            if icon_value:
+                row.label(text=message, icon_value=icon_value)
             else:
-                # Show message with icon
                 row.label(text=message, icon='COMMUNITY')
         elif self.layout_type in {'GRID'}:
             layout.alignment = 'CENTER'
@@ -62,7 +76,10 @@ class DF_UL_commit_list(UIList):
                 message = message[:20] + "..."
             if is_head_commit:
                 layout.label(text="HEAD", icon='BOOKMARKS')
-            layout.label(text=message, icon='COMMUNITY')
+            icon_value = _thumbnail_icon(item, large=True)
+            if icon_value:
+                layout.template_icon(icon_value=icon_value, scale=3.0)
+            layout.label(text=message, icon='NONE' if icon_value else 'COMMUNITY')
 
 
 class DF_UL_stash_list(UIList):
@@ -7,31 +7,54 @@ from bpy.types import Panel, Context
 from pathlib import Path
 from typing import Optional, Any
 
+# Rows shown in the "Modified objects" list before it is truncated
+MODIFIED_OBJECTS_ROWS = 12
+
+
+def _modified_object_icon(flags) -> str:
+    """Icon for the most significant change of a modified object."""
+    for flag, icon in (('REMOVED', 'REMOVE'), ('ADDED', 'ADD'), ('GEOMETRY', 'MESH_DATA'),
+                       ('MATERIAL', 'MATERIAL'), ('TRANSFORM', 'ORIENTATION_GLOBAL')):
+        if flag in flags:
+            return icon
+    return 'OBJECT_DATA'
+
+
+def _is_comparison_object(obj) -> bool:
+    """Check whether an object was linked by an active comparison session."""
+    if obj is None:
+        return False
+    from ..utils.compare_sessions import get_compare_sessions
+    return get_compare_sessions().find_by_object(obj) is not None
+
+
 def get_current_branch_name(context: Context) -> str:
-    """Get current branch name from repository or return default."""
+    """
+    Get current branch name without running forester.
+    
+    Panels redraw constantly, so the name comes from the ``.DFM`` HEAD ref
+    (re-read only when it changes, so external switches show up), then
+    from state filled by the refresh operators: the history index, the
+    branch list, props.
+    """
     try:
-        blend_file = Path(bpy.data.filepath)
-        if not blend_file:
-            return "main"
-        
-        from ..utils.helpers import find_repository_root
-        from ..utils.forester_cli import get_cli
-        
-        project_root = blend_file.parent
-        repo_path = find_repository_root(project_root)
-        if repo_path:
-            cli = get_cli()
-            success, status_data, _ = cli.status(repo_path)
-            if success and status_data:
-                return status_data.get("branch", "main")
+        if bpy.data.filepath:
+            from ..utils.helpers import find_repository_root
+            from ..utils.history_index import get_history_index, read_head_branch
+            
+            repo_path = find_repository_root(Path(bpy.data.filepath).parent)
+            if repo_path:
+                branch = read_head_branch(repo_path) or get_history_index().current_branch(repo_path)
+                if branch:
+                    return branch
+        
+        for branch in context.scene.df_branches:
+            if branch.is_current:
+                return branch.name
     except (AttributeError, RuntimeError, ValueError, KeyError) as e:
         import logging
         logger = logging.getLogger(__name__)
         logger.debug(f"Error getting current branch name: {e}")
-    except Exception as e:
-        import logging
-        logger = logging.getLogger(__name__)
-        logger.warning(f"Unexpected error getting current branch name: {e}")
     
     # Fallback to props or default
     try:
@@ -57,12 +80,10 @@ class DF_PT_commit_panel(Panel):
         if not is_repository_initialized(context):
             return False
         
-        # Hide panel if comparison object "compare" is selected
+        # Hide panel if a comparison object is selected
         active_obj = context.active_object
         if active_obj:
-            scene = context.scene
-            comparison_obj_name = getattr(scene, 'df_object_comparison_object_name', '')
-            if comparison_obj_name == 'compare' and active_obj.name == 'compare':
+            if _is_comparison_object(active_obj):
                 return False
         
         return True
@@ -103,7 +124,8 @@ class DF_PT_commit_panel(Panel):
         # Show working directory status (if available)
         box = layout.box()
         box.label(text="Full Project Commit", icon='FILE_FOLDER')
-        # Note: File count and changes can be displayed here in future versions
+        self._draw_working_tree_status(box)
+        self._draw_modified_objects(box, props)
         
         # Common fields
         layout.separator()
@@ -120,21 +142,72 @@ class DF_PT_commit_panel(Panel):
         # Tag (optional)
         layout.prop(props, "commit_tag", text="Tag", icon='BOOKMARKS')
         
+        layout.prop(props, "commit_changed_only")
+        
         # Validate field: Message must not be empty
         message_text = props.message if props.message else ""
         message_valid = bool(message_text and message_text.strip())
         
-        # Create commit button (disabled if message is empty)
+        # Create commit button (disabled if message is empty or a commit is running)
+        from ..utils.commit_pipeline import get_commit_pipeline
+        pipeline = get_commit_pipeline()
         layout.separator()
         row = layout.row()
-        row.enabled = message_valid
+        row.enabled = message_valid and not pipeline.is_running
         row.operator("df.create_project_commit", text="Create Commit", icon='EXPORT')
+        if pipeline.is_running:
+            layout.label(text=pipeline.status_text(), icon='SORTTIME')
         
         # Show validation message if message is empty
         if not message_valid:
             box = layout.box()
             box.label(text="Message is required", icon='ERROR')
 
+    def _draw_working_tree_status(self, box: Any) -> None:
+        """Draw the last computed file status (refreshing stays an explicit action)."""
+        from ..utils.helpers import get_repository_path
+        from ..utils.working_tree import get_working_tree
+        
+        repo_path, _ = get_repository_path()
+        status_data = get_working_tree().last_status(repo_path) if repo_path else None
+        row = box.row()
+        if status_data is None:
+            row.label(text="Files: not checked", icon='QUESTION')
+        elif status_data.get("clean"):
+            row.label(text="Files: no changes", icon='CHECKMARK')
+        else:
+            row.label(
+                text=(f"Files: {len(status_data.get('modified', []))} modified, "
+                      f"{len(status_data.get('deleted', []))} deleted, "
+                      f"{len(status_data.get('untracked', []))} untracked"),
+                icon='FILE_TICK'
+            )
+        row.operator("df.refresh_working_tree_status", text="", icon='FILE_REFRESH')
+
+    def _draw_modified_objects(self, box: Any, props: Any) -> None:
+        """Draw objects changed since the last commit (collapsible)."""
+        from ..utils.dirty_tracker import get_dirty_tracker
+        
+        tracker = get_dirty_tracker()
+        if not tracker.is_known:
+            box.label(text="Changes since last commit: unknown", icon='QUESTION')
+            return
+        
+        modified = tracker.modified_objects()
+        row = box.row()
+        row.prop(props, "show_modified_objects", text=f"Modified objects: {len(modified)}",
+                 icon='TRIA_DOWN' if props.show_modified_objects else 'TRIA_RIGHT', emboss=False)
+        if not props.show_modified_objects or not modified:
+            return
+        
+        col = box.column(align=True)
+        for entry in modified[:MODIFIED_OBJECTS_ROWS]:
+            row = col.row()
+            row.label(text=entry.name, icon=_modified_object_icon(entry.flags))
+            row.label(text=", ".join(flag.lower() for flag in sorted(entry.flags)))
+        if len(modified) > MODIFIED_OBJECTS_ROWS:
+            col.label(text=f"... and {len(modified) - MODIFIED_OBJECTS_ROWS} more")
+
 
 
 class DF_PT_branch_panel(Panel):
@@ -148,12 +221,10 @@ class DF_PT_branch_panel(Panel):
     
     @classmethod
     def poll(cls, context: Context) -> bool:
-        """Hide panel if comparison object 'compare' is selected."""
+        """Hide panel if a comparison object is selected."""
         active_obj = context.active_object
         if active_obj:
-            scene = context.scene
-            comparison_obj_name = getattr(scene, 'df_object_comparison_object_name', '')
-            if comparison_obj_name == 'compare' and active_obj.name == 'compare':
+            if _is_comparison_object(active_obj):
                 return False
         return True
 
@@ -296,13 +367,8 @@ class DF_PT_history_panel(Panel):
         return is_repository_initialized(context)
     
     def _is_compare_object_selected(self, context: Context) -> bool:
-        """Check if comparison object 'compare' is selected."""
-        active_obj = context.active_object
-        if not active_obj:
-            return False
-        scene = context.scene
-        comparison_obj_name = getattr(scene, 'df_object_comparison_object_name', '')
-        return comparison_obj_name == 'compare' and active_obj.name == 'compare'
+        """Check if a comparison object is selected."""
+        return _is_comparison_object(context.active_object)
 
     def draw(self, context: Context) -> None:
         """Draw the panel UI."""
@@ -315,7 +381,9 @@ class DF_PT_history_panel(Panel):
             # Show only Compare Settings and Compare button
             scene = context.scene
             props = context.scene.df_commit_props
-            comparison_commit_hash = getattr(scene, 'df_object_comparison_commit_hash', '')
+            from ..utils.compare_sessions import get_compare_sessions
+            session = get_compare_sessions().find_by_object(context.active_object)
+            comparison_commit_hash = session.commit_hash if session else ''
             
             if comparison_commit_hash:
                 # Compare settings
@@ -363,6 +431,14 @@ class DF_PT_history_panel(Panel):
             row = box.row()
             row.operator("df.clear_tag_filter", text="Clear Filter", icon='X')
         
+        # Time range filter
+        row = box.row()
+        row.prop(props, "history_range", text="", icon='TIME')
+        if props.history_range == 'CUSTOM':
+            row = box.row(align=True)
+            row.prop(props, "history_since_days", text="Since")
+            row.prop(props, "history_until_days", text="Until")
+        
         # Branch (display as text)
         layout.separator()
         row = layout.row()
@@ -427,8 +503,19 @@ class DF_PT_history_panel(Panel):
                 if commit and commit.hash:
                     box = layout.box()
                     
+                    # Viewport thumbnail captured when the commit was created
+                    if commit.screenshot_hash:
+                        from ..utils.thumbnails import get_thumbnail_previews, THUMBNAIL_SIZE_DETAILS
+                        icon_value = get_thumbnail_previews().icon_id(commit.screenshot_hash, THUMBNAIL_SIZE_DETAILS)
+                        if icon_value:
+                            box.template_icon(icon_value=icon_value, scale=6.0)
+                    
                     # Commit details: Author, Hash, Message, Tag, HEAD (if exists)
                     box.label(text=f"Author: {commit.author}")
+                    if commit.timestamp:
+                        from datetime import datetime
+                        commit_dt = datetime.fromtimestamp(commit.timestamp)
+                        box.label(text=f"Date: {commit_dt.strftime('%Y-%m-%d %H:%M')}")
                     box.label(text=f"Hash: {commit.hash}")
                     box.label(text=f"Message: {commit.message}")
                     # Always show Tag (even if empty)
@@ -437,6 +524,7 @@ class DF_PT_history_panel(Panel):
                     is_head_commit = getattr(commit, 'is_head', False)
                     if is_head_commit:
                         box.label(text="HEAD: true", icon='BOOKMARKS')
+                    self._draw_commit_extra_details(box, commits, commit_list_index)
                     
                     # Проверяем, является ли активный объект объектом сравнения
                     scene = context.scene
@@ -479,6 +567,31 @@ class DF_PT_history_panel(Panel):
                         op = row.operator("df.delete_commit", text="Delete This Version", icon='TRASH')
                         op.commit_hash = commit.hash
 
+    def _draw_commit_extra_details(self, box: Any, commits: Any, commit_list_index: int) -> None:
+        """Draw details from the commit cache, loading them lazily in the background."""
+        from ..utils.helpers import get_repository_path
+        from ..utils.commit_cache import get_commit_cache, neighbour_hashes
+        
+        repo_path, _ = get_repository_path()
+        if not repo_path:
+            return
+        
+        cache = get_commit_cache()
+        commit = commits[commit_list_index]
+        details = cache.peek(repo_path, commit.hash)
+        
+        # Selected row first, then its neighbours; never blocks the draw
+        cache.prefetch(repo_path, neighbour_hashes(commits, commit_list_index))
+        
+        if details is None:
+            box.label(text="Loading details...", icon='TIME')
+            return
+        
+        parent_hash = details.get("parent") or ""
+        box.label(text=f"Parent: {parent_hash[:16] + '...' if parent_hash else '(нет)'}")
+        files = details.get("files") or []
+        box.label(text=f"Files: {len(files)}")
+
     def _draw_selected_object_tab(self, context: Context, layout: Any, props: Any, commits: Any, commit_list_index: int) -> None:
         """Draw Selected Object tab content."""
         active_obj = context.active_object
@@ -561,54 +674,24 @@ class DF_PT_history_panel(Panel):
             row = layout.row()
             row.scale_y = 1.2
             
-            # Check if comparison is active
-            # Compare is active if:
-            # 1. Comparison is marked as active
-            # 2. Commit hash matches
-            # 3. Original object name matches (to handle cases where user selects different object)
-            # 4. Comparison object exists in scene
-            scene = context.scene
-            comparison_active = getattr(scene, 'df_object_comparison_active', False)
-            comparison_commit_hash = getattr(scene, 'df_object_comparison_commit_hash', '')
-            comparison_obj_name = getattr(scene, 'df_object_comparison_object_name', '')
-            original_obj_name = getattr(scene, 'df_object_comparison_original_name', '')
-            
-            # Check if comparison object exists in scene
-            comparison_obj_exists = (
-                comparison_obj_name and 
-                comparison_obj_name in bpy.data.objects
-            )
-            
-            # Check if current active object matches original object
-            # If original_obj_name is not set, allow any object (for backward compatibility)
-            current_obj_matches = (
-                active_obj and 
-                (not original_obj_name or original_obj_name == active_obj.name)
-            )
-            
-            # Comparison is active if all conditions are met
-            is_comparison_active = (
-                comparison_active and
-                comparison_commit_hash == commit.hash and
-                comparison_obj_exists and
-                current_obj_matches
-            )
-            
-            # Debug logging (can be removed later)
-            if comparison_active:
-                import logging
-                logger = logging.getLogger(__name__)
-                logger.debug(f"Comparison check: active={comparison_active}, "
-                           f"commit_match={comparison_commit_hash == commit.hash}, "
-                           f"obj_exists={comparison_obj_exists}, "
-                           f"obj_matches={current_obj_matches}, "
-                           f"result={is_comparison_active}")
+            # Comparison is active if a session of this commit and object exists
+            from ..utils.compare_sessions import get_compare_sessions
+            is_comparison_active = get_compare_sessions().get(commit.hash, active_obj.name) is not None
             
             op = row.operator("df.compare_object", text="Compare", icon='SPLIT_HORIZONTAL', depress=is_comparison_active)
             op.commit_hash = commit.hash
             op.axis = props.compare_object_axis
             op.offset = props.compare_object_offset
             
+            # Timeline: compare with every checked commit at once
+            checked_count = sum(1 for item in commits if item.is_selected)
+            row = layout.row()
+            row.enabled = checked_count > 0
+            op = row.operator("df.compare_object_timeline",
+                              text=f"Compare Timeline ({checked_count} checked)", icon='SEQUENCE')
+            op.axis = props.compare_object_axis
+            op.offset = props.compare_object_offset
+            
             if is_comparison_active:
                 layout.separator()
                 box = layout.box()
@@ -640,12 +723,10 @@ class DF_PT_lock_panel(Panel):
         if not is_repository_initialized(context):
             return False
         
-        # Hide panel if comparison object 'compare' is selected
+        # Hide panel if a comparison object is selected
         active_obj = context.active_object
         if active_obj:
-            scene = context.scene
-            comparison_obj_name = getattr(scene, 'df_object_comparison_object_name', '')
-            if comparison_obj_name == 'compare' and active_obj.name == 'compare':
+            if _is_comparison_object(active_obj):
                 return False
         return True
 
@@ -655,7 +736,8 @@ class DF_PT_lock_panel(Panel):
         scene = context.scene
         
         # Check repository state
-        from ..utils.helpers import is_repository_initialized, get_repository_path, check_locked_files
+        from ..utils.helpers import is_repository_initialized, get_repository_path
+        from ..utils.lock_cache import get_lock_cache
         repo_initialized = is_repository_initialized(context)
         
         if not repo_initialized:
@@ -690,9 +772,13 @@ class DF_PT_lock_panel(Panel):
         layout.separator()
         repo_path, error = get_repository_path()
         if repo_path:
-            locked_files = check_locked_files(repo_path)
+            # Read from memory only; stale state is refreshed in the background
+            locked_files = get_lock_cache().get(repo_path)
             
-            if locked_files:
+            if locked_files is None:
+                box = layout.box()
+                box.label(text="Checking locks...", icon='TIME')
+            elif locked_files:
                 box = layout.box()
                 box.label(text=f"⚠️ {len(locked_files)} file(s) locked:", icon='ERROR')
                 
@@ -743,12 +829,10 @@ class DF_PT_stash_panel(Panel):
         if not is_repository_initialized(context):
             return False
         
-        # Hide panel if comparison object 'compare' is selected
+        # Hide panel if a comparison object is selected
         active_obj = context.active_object
         if active_obj:
-            scene = context.scene
-            comparison_obj_name = getattr(scene, 'df_object_comparison_object_name', '')
-            if comparison_obj_name == 'compare' and active_obj.name == 'compare':
+            if _is_comparison_object(active_obj):
                 return False
         return True
 
@@ -1,9 +1,16 @@
 """
 Utilities module for Difference Machine addon.
+
+Submodules are imported on first attribute access, so enabling the add-on
+only loads the utilities that registration actually uses.
 """
 
-from . import config_loader
-from . import forester_cli
-from . import helpers
+import importlib
+
+__all__ = ['background_gc', 'blend_index', 'commit_cache', 'commit_pipeline', 'commit_prefetch', 'compare_sessions', 'config_loader', 'deferred_delete', 'dirty_tracker', 'forester_cli', 'helpers', 'history_index', 'image_paths', 'lock_cache', 'material_cache', 'perf', 'save_hashing', 'staging', 'thumbnails', 'viewport_capture', 'working_tree']
+
 
-__all__ = ['config_loader', 'forester_cli', 'helpers']
+def __getattr__(name):
+    if name in __all__:
+        return importlib.import_module(f"{__name__}.{name}")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
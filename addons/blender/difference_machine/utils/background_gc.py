@@ -0,0 +1,258 @@
+"""
+Background garbage collection for Difference Machine addon.
+
+Scheduled GC runs ``forester gc`` on a worker thread so Blender never
+freezes. Runs are deferred while the user is actively editing and can be
+cancelled from Preferences. forester has no bounded GC mode, so every run
+is a full run; operators that change the repository refuse to start while
+it is in progress.
+"""
+
+import threading
+import time
+from pathlib import Path
+from typing import Optional, Callable, Dict, Any
+import bpy
+from bpy.app.handlers import persistent
+from .forester_cli import get_cli
+from .logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Seconds without edits before the user is considered idle
+GC_IDLE_SECONDS: float = 120.0
+
+# Timeout for a scheduled GC run
+GC_TIMEOUT: int = 300
+
+# Interval of the main-thread timer that watches a running job
+GC_POLL_INTERVAL: float = 1.0
+
+# Job states
+GC_STATE_RUNNING = 'RUNNING'
+GC_STATE_COMPLETED = 'COMPLETED'
+GC_STATE_CANCELLED = 'CANCELLED'
+GC_STATE_FAILED = 'FAILED'
+
+_last_activity: float = time.monotonic()
+
+
+def note_user_activity() -> None:
+    """Record that the user just changed something."""
+    global _last_activity
+    _last_activity = time.monotonic()
+
+
+def seconds_since_activity() -> float:
+    """Seconds since the last recorded user edit."""
+    return time.monotonic() - _last_activity
+
+
+def is_user_idle() -> bool:
+    """Check whether the user has been idle long enough to run GC."""
+    return seconds_since_activity() >= GC_IDLE_SECONDS
+
+
+class GCJob:
+    """Cancellable handle of one background GC run."""
+
+    def __init__(self, repo_path: Path, reflog_expire_days: int):
+        self.repo_path = Path(repo_path)
+        self.reflog_expire_days = reflog_expire_days
+        self.cancel_event = threading.Event()
+        self.started_at = time.time()
+        self.finished_at: Optional[float] = None
+        self.state = GC_STATE_RUNNING
+        self.stats: Optional[Dict[str, Any]] = None
+        self.error: Optional[str] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def is_running(self) -> bool:
+        return self.state == GC_STATE_RUNNING
+
+    @property
+    def elapsed(self) -> float:
+        end = self.finished_at if self.finished_at is not None else time.time()
+        return end - self.started_at
+
+    def cancel(self) -> None:
+        """Request cancellation; the forester process is killed promptly."""
+        self.cancel_event.set()
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="dfm-gc", daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        try:
+            success, stats, error = get_cli().gc(
+                self.repo_path,
+                dry_run=False,
+                reflog_expire_days=self.reflog_expire_days,
+                timeout=GC_TIMEOUT,
+                cancel_event=self.cancel_event
+            )
+        except Exception as e:
+            success, stats, error = False, None, str(e)
+            logger.error(f"Unexpected error in background GC: {e}", exc_info=True)
+
+        self.stats = stats
+        self.error = error
+        if success:
+            self.state = GC_STATE_COMPLETED
+        elif self.cancel_event.is_set():
+            self.state = GC_STATE_CANCELLED
+        else:
+            self.state = GC_STATE_FAILED
+        self.finished_at = time.time()
+
+
+class BackgroundGC:
+    """Owns the current background GC job and reports its status."""
+
+    def __init__(self):
+        self.job: Optional[GCJob] = None
+        self.waiting_since: Optional[float] = None
+        self._on_complete: Optional[Callable[[GCJob], None]] = None
+
+    @property
+    def is_running(self) -> bool:
+        return self.job is not None and self.job.is_running
+
+    def defer(self) -> None:
+        """Note that a due GC is waiting for the user to become idle."""
+        if self.waiting_since is None:
+            self.waiting_since = time.time()
+            logger.debug("Scheduled garbage collection deferred until user is idle")
+
+    def start(
+        self,
+        repo_path: Path,
+        reflog_expire_days: int,
+        on_complete: Optional[Callable[[GCJob], None]] = None
+    ) -> Optional[GCJob]:
+        """
+        Start GC on a worker thread unless a run is already in progress.
+
+        Args:
+            repo_path: Path to repository root
+            reflog_expire_days: Reflog retention passed to forester gc
+            on_complete: Called on the main thread with the finished job
+
+        Returns:
+            The started job, or None if one is already running
+        """
+        if self.is_running:
+            return None
+
+        self.waiting_since = None
+        self._on_complete = on_complete
+        self.job = GCJob(repo_path, reflog_expire_days)
+        self.job.start()
+        logger.info("Running scheduled garbage collection in background...")
+
+        if not bpy.app.timers.is_registered(_poll_gc_job):
+            bpy.app.timers.register(_poll_gc_job, first_interval=GC_POLL_INTERVAL)
+        return self.job
+
+    def cancel(self) -> bool:
+        """Cancel the running job. Returns False if nothing was running."""
+        self.waiting_since = None
+        if not self.is_running:
+            return False
+        self.job.cancel()
+        return True
+
+    def status_text(self) -> str:
+        """Short human-readable status for the Preferences panel."""
+        job = self.job
+        if job is not None and job.is_running:
+            return f"Running ({job.elapsed:.0f}s)"
+        if self.waiting_since is not None:
+            return "Waiting for user to be idle"
+        if job is None:
+            return "Idle"
+        if job.state == GC_STATE_COMPLETED:
+            stats = job.stats or {}
+            return (
+                f"Completed: {stats.get('commits_deleted', 0)} commits, "
+                f"{stats.get('trees_deleted', 0)} trees, {stats.get('blobs_deleted', 0)} blobs"
+            )
+        if job.state == GC_STATE_CANCELLED:
+            return "Cancelled"
+        return f"Failed: {job.error or 'Unknown error'}"
+
+    def _finish(self) -> None:
+        job = self.job
+        callback, self._on_complete = self._on_complete, None
+        if job.state == GC_STATE_COMPLETED:
+            stats = job.stats or {}
+            logger.info(f"Garbage collection completed: {stats.get('commits_deleted', 0)} commits, "
+                        f"{stats.get('trees_deleted', 0)} trees, {stats.get('blobs_deleted', 0)} blobs deleted")
+        elif job.state == GC_STATE_FAILED:
+            logger.warning(f"Garbage collection failed: {job.error}")
+        else:
+            logger.info(f"Garbage collection stopped: {job.state.lower()}")
+
+        if callback is not None:
+            try:
+                callback(job)
+            except Exception as e:
+                logger.error(f"Error in GC completion callback: {e}", exc_info=True)
+
+
+def _redraw_preferences() -> None:
+    try:
+        for window in bpy.context.window_manager.windows:
+            for area in window.screen.areas:
+                if area.type == 'PREFERENCES':
+                    area.tag_redraw()
+    except (AttributeError, RuntimeError, ReferenceError):
+        pass
+
+
+def _poll_gc_job():
+    """Timer callback: refresh progress and finish the job on the main thread."""
+    scheduler = get_background_gc()
+    _redraw_preferences()
+    if scheduler.is_running:
+        return GC_POLL_INTERVAL
+    if scheduler.job is not None:
+        scheduler._finish()
+    return None
+
+
+# Global scheduler instance
+_scheduler_instance: Optional[BackgroundGC] = None
+
+
+def get_background_gc() -> BackgroundGC:
+    """Get global background GC scheduler instance."""
+    global _scheduler_instance
+    if _scheduler_instance is None:
+        _scheduler_instance = BackgroundGC()
+    return _scheduler_instance
+
+
+@persistent
+def _on_depsgraph_update_post(scene, depsgraph):
+    """Any depsgraph update counts as user activity."""
+    note_user_activity()
+
+
+def register():
+    """Register the activity handler used to defer GC."""
+    if _on_depsgraph_update_post not in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.append(_on_depsgraph_update_post)
+
+
+def unregister():
+    """Unregister the activity handler and stop a running GC."""
+    if _on_depsgraph_update_post in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.remove(_on_depsgraph_update_post)
+    get_background_gc().cancel()
+    try:
+        bpy.app.timers.unregister(_poll_gc_job)
+    except ValueError:
+        pass
@@ -0,0 +1,256 @@
+"""
+Object name index of .blend files for Difference Machine addon.
+
+Finding an object in a commit's .blend loads objects from the file to
+compare names and types. Most files can be ruled in or out by name alone,
+and reading the names does not load anything, so the index keeps the object
+names of recently inspected files keyed by path and stat signature. Blobs in
+the object store never change, so their entries stay valid for the whole
+session.
+
+Linked objects are found through a second index: resolved library path ->
+library -> names of objects linked from it. Library paths are resolved once
+per library, and the index follows ``bpy.data.libraries`` as libraries are
+added or removed, so finding a linked object does not scan the scene.
+
+Reading a .blend goes through ``bpy.data.libraries.load`` and must run on
+the main thread.
+"""
+
+import os
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional, FrozenSet, Iterable, List, Dict, Set
+import bpy
+from bpy.app.handlers import persistent
+from .image_paths import get_stat_signature, StatSignature
+from .logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Number of indexed files kept in memory
+BLEND_INDEX_MAX_FILES: int = 64
+
+# Lookup results
+FOUND = 'FOUND'
+ABSENT = 'ABSENT'
+
+
+def name_candidates(names: Iterable[str], object_name: str) -> List[str]:
+    """Names matching ``object_name`` the way object lookup does (exact, case-insensitive, partial)."""
+    lowered = object_name.lower()
+    return [
+        name for name in names
+        if name == object_name or name.lower() == lowered or object_name in name or name in object_name
+    ]
+
+
+class BlendObjectIndex:
+    """LRU index of object names per .blend file."""
+
+    def __init__(self, max_files: int = BLEND_INDEX_MAX_FILES):
+        self.max_files = max_files
+        self._files: "OrderedDict[str, tuple[StatSignature, FrozenSet[str]]]" = OrderedDict()
+
+    @staticmethod
+    def _key(blend_path: Path) -> str:
+        return str(Path(blend_path).resolve())
+
+    def cached_names(self, blend_path: Path) -> Optional[FrozenSet[str]]:
+        """Object names if the file is indexed and unchanged; never reads the file."""
+        key = self._key(blend_path)
+        entry = self._files.get(key)
+        if entry is None:
+            return None
+        if entry[0] != get_stat_signature(blend_path):
+            del self._files[key]
+            return None
+        self._files.move_to_end(key)
+        return entry[1]
+
+    def object_names(self, blend_path: Path) -> Optional[FrozenSet[str]]:
+        """
+        Object names of a .blend file, reading them if needed (main thread only).
+
+        Args:
+            blend_path: Path to .blend file
+
+        Returns:
+            Object names, or None if the file cannot be read
+        """
+        names = self.cached_names(blend_path)
+        if names is not None:
+            return names
+
+        signature = get_stat_signature(blend_path)
+        if signature is None:
+            return None
+        try:
+            with bpy.data.libraries.load(str(blend_path), link=False) as (data_from, data_to):
+                names = frozenset(data_from.objects)
+        except (OSError, RuntimeError) as e:
+            logger.debug("Could not index %s: %s", blend_path, e)
+            return None
+
+        self._files[self._key(blend_path)] = (signature, names)
+        while len(self._files) > self.max_files:
+            self._files.popitem(last=False)
+        logger.debug("Indexed %s objects in %s", len(names), blend_path)
+        return names
+
+    def lookup(self, blend_path: Path, object_name: str, object_type: Optional[str] = None) -> Optional[str]:
+        """
+        Answer an object lookup from names alone.
+
+        Returns:
+            FOUND if the exact name is present and no type was requested,
+            ABSENT if no name can match, None if objects have to be loaded
+            to decide
+        """
+        names = self.object_names(blend_path)
+        if names is None:
+            return None
+        if object_name in names and not object_type:
+            return FOUND
+        if not name_candidates(names, object_name):
+            return ABSENT
+        return None
+
+    def clear(self) -> None:
+        """Forget all indexed files."""
+        self._files.clear()
+
+
+def _resolved_key(filepath: str) -> str:
+    """Comparable form of a (possibly blend-relative) library path."""
+    return os.path.normcase(str(Path(bpy.path.abspath(filepath)).resolve()))
+
+
+class LinkedLibraryIndex:
+    """Resolved library path -> library -> linked object names, kept in step with ``bpy.data.libraries``."""
+
+    def __init__(self):
+        # resolved path -> (library name, raw filepath)
+        self._libraries: Dict[str, tuple] = {}
+        # library name -> names of objects linked from it; None until scanned
+        self._objects: Optional[Dict[str, Set[str]]] = None
+        self._library_count = -1
+
+    def _sync(self) -> None:
+        """Re-resolve library paths only after libraries were added, removed or changed."""
+        libraries = bpy.data.libraries
+        if len(libraries) == self._library_count and all(
+            (library := libraries.get(name)) is not None and library.filepath == raw
+            for name, raw in self._libraries.values()
+        ):
+            return
+        known = {entry: key for key, entry in self._libraries.items()}
+        resolved = {}
+        for library in libraries:
+            key = known.get((library.name, library.filepath))
+            if key is None:
+                try:
+                    key = _resolved_key(library.filepath)
+                except (OSError, ValueError, RuntimeError):
+                    continue
+            resolved[key] = (library.name, library.filepath)
+        self._libraries = resolved
+        self._library_count = len(libraries)
+        if self._objects is not None:
+            names = {name for name, _ in resolved.values()}
+            self._objects = {name: objs for name, objs in self._objects.items() if name in names}
+
+    def library(self, blend_path: Path):
+        """The library loaded from ``blend_path``, or None."""
+        self._sync()
+        try:
+            entry = self._libraries.get(_resolved_key(str(blend_path)))
+        except (OSError, ValueError, RuntimeError):
+            return None
+        return bpy.data.libraries.get(entry[0]) if entry else None
+
+    def add(self, obj) -> None:
+        """Record an object that was just linked."""
+        library = getattr(obj, "library", None)
+        if library is None:
+            return
+        self._sync()
+        if self._objects is not None:
+            self._objects.setdefault(library.name, set()).add(obj.name)
+
+    def _object_names(self, library) -> Set[str]:
+        if self._objects is None:
+            # One pass over the scene the first time, kept up to date by add()
+            self._objects = {}
+            for obj in bpy.data.objects:
+                if obj.library is not None:
+                    self._objects.setdefault(obj.library.name, set()).add(obj.name)
+        return self._objects.get(library.name, set())
+
+    def find_object(self, blend_path: Path, object_name: Optional[str] = None, object_type: Optional[str] = None):
+        """
+        Find an object linked from ``blend_path``.
+
+        Args:
+            blend_path: Library .blend file
+            object_name: Object name, or None for any object
+            object_type: Optional object type filter
+
+        Returns:
+            The linked object, or None
+        """
+        library = self.library(blend_path)
+        if library is None:
+            return None
+        names = [object_name] if object_name else sorted(self._object_names(library))
+        for name in names:
+            obj = bpy.data.objects.get((name, library.filepath))
+            if obj is not None and (not object_type or obj.type == object_type):
+                return obj
+        return None
+
+    def clear(self) -> None:
+        """Forget everything (after a file was loaded)."""
+        self._libraries.clear()
+        self._objects = None
+        self._library_count = -1
+
+
+# Global index instances
+_index_instance: Optional[BlendObjectIndex] = None
+_linked_index_instance: Optional[LinkedLibraryIndex] = None
+
+
+def get_blend_object_index() -> BlendObjectIndex:
+    """Get global .blend object index instance."""
+    global _index_instance
+    if _index_instance is None:
+        _index_instance = BlendObjectIndex()
+    return _index_instance
+
+
+def get_linked_library_index() -> LinkedLibraryIndex:
+    """Get global linked library index instance."""
+    global _linked_index_instance
+    if _linked_index_instance is None:
+        _linked_index_instance = LinkedLibraryIndex()
+    return _linked_index_instance
+
+
+@persistent
+def _on_load_post(*args):
+    """Relative library paths of the previous file resolve differently now."""
+    get_linked_library_index().clear()
+
+
+def register():
+    """Register index handlers."""
+    if _on_load_post not in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.append(_on_load_post)
+
+
+def unregister():
+    """Unregister index handlers."""
+    if _on_load_post in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.remove(_on_load_post)
+    get_linked_library_index().clear()
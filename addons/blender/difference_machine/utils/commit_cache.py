@@ -0,0 +1,241 @@
+"""
+Commit details cache for Difference Machine addon.
+
+Commits are content-addressed and never change once written, so the output
+of ``forester show`` can be cached forever. Details are kept in memory and
+persisted as JSON under ``.DFM/cache/commits`` so they survive restarts.
+"""
+
+import json
+import os
+import threading
+from collections import deque
+from pathlib import Path
+from typing import Optional, Tuple, Dict, Any, Iterable, List
+from .forester_cli import get_cli
+from .helpers import request_view3d_redraw
+from .logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Location of the on-disk cache relative to repository root
+COMMIT_CACHE_DIR: str = os.path.join(".DFM", "cache", "commits")
+
+# Bump when the cached payload layout changes; old entries are then ignored
+COMMIT_CACHE_VERSION: int = 2
+
+# Number of commits around the selected row to prefetch in the background
+DEFAULT_PREFETCH_RADIUS: int = 3
+
+
+class CommitDetailsCache:
+    """Two-level (memory + disk) cache for immutable commit details."""
+
+    def __init__(self):
+        self._memory: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._queue: deque = deque()
+        self._queued: set = set()
+        self._worker: Optional[threading.Thread] = None
+
+    @staticmethod
+    def _key(repo_path: Path, commit_hash: str) -> Tuple[str, str]:
+        return str(Path(repo_path)), commit_hash.strip().lower()
+
+    @staticmethod
+    def _disk_path(repo_path: Path, commit_hash: str) -> Path:
+        return Path(repo_path) / COMMIT_CACHE_DIR / commit_hash[:2] / f"{commit_hash[2:]}.json"
+
+    def _read_disk(self, repo_path: Path, commit_hash: str) -> Optional[Dict[str, Any]]:
+        path = self._disk_path(repo_path, commit_hash)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                payload = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.debug(f"Ignoring unreadable commit cache entry {path}: {e}")
+            return None
+
+        if payload.get("version") != COMMIT_CACHE_VERSION:
+            return None
+        return payload.get("data")
+
+    def _write_disk(self, repo_path: Path, commit_hash: str, data: Dict[str, Any]) -> None:
+        path = self._disk_path(repo_path, commit_hash)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(f".{threading.get_ident()}.tmp")
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({"version": COMMIT_CACHE_VERSION, "data": data}, f)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.debug(f"Failed to persist commit cache entry {path}: {e}")
+
+    def peek(self, repo_path: Path, commit_hash: str) -> Optional[Dict[str, Any]]:
+        """
+        Return cached details without ever calling forester.
+
+        Only memory and disk are consulted, which makes this safe to call
+        from panel ``draw()``.
+
+        Args:
+            repo_path: Path to repository root
+            commit_hash: Commit hash
+
+        Returns:
+            Commit data dict or None if not cached yet
+        """
+        if not repo_path or not commit_hash:
+            return None
+
+        key = self._key(repo_path, commit_hash)
+        with self._lock:
+            data = self._memory.get(key)
+        if data is not None:
+            return data
+
+        data = self._read_disk(repo_path, key[1])
+        if data is not None:
+            with self._lock:
+                self._memory[key] = data
+        return data
+
+    def get(self, repo_path: Path, commit_hash: str) -> Tuple[bool, Optional[Dict[str, Any]], Optional[str]]:
+        """
+        Return commit details, calling ``forester show`` only on a cache miss.
+
+        Args:
+            repo_path: Path to repository root
+            commit_hash: Commit hash
+
+        Returns:
+            Tuple of (success, commit_data, error_message)
+        """
+        if not repo_path:
+            return False, None, "Repository path is required"
+        if not commit_hash or not commit_hash.strip():
+            return False, None, "Commit hash is required"
+
+        data = self.peek(repo_path, commit_hash)
+        if data is not None:
+            return True, data, None
+
+        key = self._key(repo_path, commit_hash)
+        success, data, error_msg = get_cli().show(Path(repo_path), key[1])
+        if not success or not data:
+            return False, None, error_msg
+
+        with self._lock:
+            self._memory[key] = data
+        self._write_disk(repo_path, key[1], data)
+        return True, data, None
+
+    def invalidate(self, repo_path: Path, commit_hash: str) -> None:
+        """Drop a commit from the cache (e.g. after it was deleted)."""
+        if not repo_path or not commit_hash:
+            return
+
+        key = self._key(repo_path, commit_hash)
+        with self._lock:
+            self._memory.pop(key, None)
+        try:
+            self._disk_path(repo_path, key[1]).unlink()
+        except OSError:
+            pass
+
+    def prefetch(self, repo_path: Path, commit_hashes: Iterable[str]) -> None:
+        """
+        Queue commits for background loading.
+
+        Already cached or already queued commits are skipped, so this is
+        cheap to call on every redraw.
+
+        Args:
+            repo_path: Path to repository root
+            commit_hashes: Commit hashes to load
+        """
+        if not repo_path:
+            return
+
+        added = False
+        with self._lock:
+            for commit_hash in commit_hashes:
+                if not commit_hash:
+                    continue
+                key = self._key(repo_path, commit_hash)
+                if key in self._memory or key in self._queued:
+                    continue
+                self._queue.append(key)
+                self._queued.add(key)
+                added = True
+
+            if added and (self._worker is None or not self._worker.is_alive()):
+                self._worker = threading.Thread(
+                    target=self._prefetch_worker,
+                    name="dfm-commit-prefetch",
+                    daemon=True
+                )
+                self._worker.start()
+
+    def _prefetch_worker(self) -> None:
+        while True:
+            with self._lock:
+                if not self._queue:
+                    self._worker = None
+                    return
+                key = self._queue.popleft()
+
+            try:
+                success, _, error_msg = self.get(Path(key[0]), key[1])
+                if not success:
+                    logger.debug(f"Prefetch of commit {key[1][:16]}... failed: {error_msg}")
+            except Exception as e:
+                logger.warning(f"Unexpected error prefetching commit {key[1][:16]}...: {e}")
+            finally:
+                with self._lock:
+                    self._queued.discard(key)
+
+            request_view3d_redraw()
+
+    def clear_memory(self) -> None:
+        """Drop the in-memory level (disk entries are kept)."""
+        with self._lock:
+            self._memory.clear()
+            self._queue.clear()
+            self._queued.clear()
+
+
+def neighbour_hashes(commits: Any, index: int, radius: int = DEFAULT_PREFETCH_RADIUS) -> List[str]:
+    """
+    Collect hashes of the selected commit and its neighbours in a list.
+
+    Args:
+        commits: Sequence of commit items with a ``hash`` attribute
+        index: Selected index
+        radius: Number of rows to include on each side
+
+    Returns:
+        Hashes ordered by distance from the selected row
+    """
+    result = []
+    count = len(commits)
+    for offset in range(radius + 1):
+        for i in ((index,) if offset == 0 else (index + offset, index - offset)):
+            if 0 <= i < count:
+                commit_hash = getattr(commits[i], 'hash', '')
+                if commit_hash:
+                    result.append(commit_hash)
+    return result
+
+
+# Global cache instance
+_cache_instance: Optional[CommitDetailsCache] = None
+
+
+def get_commit_cache() -> CommitDetailsCache:
+    """Get global commit details cache instance."""
+    global _cache_instance
+    if _cache_instance is None:
+        _cache_instance = CommitDetailsCache()
+    return _cache_instance
@@ -0,0 +1,218 @@
+"""
+Pipelined project commit for Difference Machine addon.
+
+A project commit used to run its steps one after another. The pipeline
+overlaps them after the mainfile is saved:
+
+- a worker thread plans the staging (changed textures and the .blend are
+  hashed in parallel), stages and commits with forester and updates the
+  stat cache;
+- meanwhile the viewport is captured on the main thread and a second
+  worker downsamples and encodes the thumbnail;
+- once the commit hash is known the thumbnail is stored under it.
+
+Commit wall time is bounded by the slowest stage instead of the sum of all
+stages. The job exposes its stage and progress for the modal operator and
+the commit panel.
+"""
+
+import threading
+import time
+from pathlib import Path
+from typing import Optional, List
+from .forester_cli import get_cli
+from .helpers import normalize_commit_hash
+from .logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Interval of the modal operator's timer that watches a running commit
+PIPELINE_POLL_INTERVAL: float = 0.1
+
+# Job states
+COMMIT_STATE_RUNNING = 'RUNNING'
+COMMIT_STATE_COMPLETED = 'COMPLETED'
+COMMIT_STATE_NOTHING = 'NOTHING'
+COMMIT_STATE_FAILED = 'FAILED'
+
+
+def _full_commit_hash(repo_path: Path, commit_hash: Optional[str]) -> Optional[str]:
+    """Full lowercase hash of a new commit (``forester commit`` may print it abbreviated)."""
+    full_hash = normalize_commit_hash(commit_hash)
+    if full_hash or not commit_hash:
+        return full_hash
+    success, details, error_msg = get_cli().show(repo_path, commit_hash)
+    if not success:
+        logger.warning(f"Could not resolve commit hash {commit_hash}: {error_msg}")
+        return None
+    return normalize_commit_hash((details or {}).get("hash"))
+
+
+class CommitJob:
+    """One pipelined project commit."""
+
+    def __init__(self, repo_path: Path, head_commit: Optional[str], message: str,
+                 author: Optional[str], tag: Optional[str], changed_only: bool):
+        self.repo_path = Path(repo_path)
+        self.head_commit = head_commit
+        self.message = message
+        self.author = author
+        self.tag = tag
+        self.changed_only = changed_only
+        self.state = COMMIT_STATE_RUNNING
+        self.stage = "Starting"
+        self.progress = 0.0
+        self.commit_hash: Optional[str] = None
+        self.error: Optional[str] = None
+        self.files: Optional[List[str]] = None
+        self.thumbnail = None
+        self.started_at = time.time()
+        self._commit_thread: Optional[threading.Thread] = None
+        self._thumbnail_thread: Optional[threading.Thread] = None
+
+    @property
+    def is_running(self) -> bool:
+        return self.state == COMMIT_STATE_RUNNING
+
+    @property
+    def done(self) -> bool:
+        """Commit finished and the thumbnail (if any) is prepared."""
+        return not self.is_running and not (self._thumbnail_thread and self._thumbnail_thread.is_alive())
+
+    @property
+    def elapsed(self) -> float:
+        return time.time() - self.started_at
+
+    def start(self) -> None:
+        self._commit_thread = threading.Thread(target=self._run_commit, name="dfm-commit", daemon=True)
+        self._commit_thread.start()
+
+    def start_thumbnail(self, pixels) -> None:
+        """Downsample and encode a viewport capture while the commit runs."""
+        if pixels is None:
+            return
+        self._thumbnail_thread = threading.Thread(
+            target=self._run_thumbnail, args=(pixels,), name="dfm-commit-thumbnail", daemon=True
+        )
+        self._thumbnail_thread.start()
+
+    def wait(self) -> None:
+        """Block until all stages finished (for non-interactive calls)."""
+        for thread in (self._commit_thread, self._thumbnail_thread):
+            if thread is not None:
+                thread.join()
+
+    def _set_stage(self, stage: str, progress: float) -> None:
+        self.stage = stage
+        self.progress = progress
+        logger.debug("Commit pipeline: %s (%.1fs)", stage, self.elapsed)
+
+    def _run_commit(self) -> None:
+        from .staging import get_staging_planner
+        planner = get_staging_planner()
+        cli = get_cli()
+        try:
+            staging_started_ns = time.time_ns()
+            if self.changed_only:
+                self._set_stage("Hashing changed files", 0.1)
+                plan = planner.plan(self.repo_path, self.head_commit)
+                if plan.full:
+                    logger.debug(f"Staging all files: {plan.reason}")
+                elif not plan.paths:
+                    self.state = COMMIT_STATE_NOTHING
+                    return
+                self.files = plan.files
+
+            self._set_stage("Staging files", 0.4)
+            success, error_msg = cli.add(self.repo_path, files=self.files)
+            if not success:
+                self.error = f"Failed to stage files: {error_msg}"
+                self.state = COMMIT_STATE_FAILED
+                return
+
+            self._set_stage("Committing", 0.7)
+            success, commit_hash, error_msg = cli.commit(
+                self.repo_path,
+                message=self.message,
+                author=self.author,
+                tag=self.tag,
+                no_verify=True  # Skip hooks by default (hooks may not be executable)
+            )
+            if not success:
+                self.error = f"Failed to create commit: {error_msg}"
+                self.state = COMMIT_STATE_FAILED
+                return
+
+            self._set_stage("Updating file cache", 0.9)
+            commit_hash = _full_commit_hash(self.repo_path, commit_hash)
+            self.commit_hash = commit_hash
+            planner.record_commit(self.repo_path, commit_hash, self.files, staging_started_ns)
+            self.progress = 1.0
+            self.state = COMMIT_STATE_COMPLETED
+        except Exception as e:
+            logger.error(f"Unexpected error in commit pipeline: {e}", exc_info=True)
+            self.error = str(e)
+            self.state = COMMIT_STATE_FAILED
+
+    def _run_thumbnail(self, pixels) -> None:
+        try:
+            from .thumbnails import prepare_thumbnail
+            prepared = prepare_thumbnail(pixels)
+            if prepared is not None:
+                prepared.encode()
+            self.thumbnail = prepared
+        except Exception as e:
+            logger.warning(f"Failed to prepare commit thumbnail: {e}")
+
+
+class CommitPipeline:
+    """Owns the running project commit."""
+
+    def __init__(self):
+        self.job: Optional[CommitJob] = None
+
+    @property
+    def is_running(self) -> bool:
+        return self.job is not None and not self.job.done
+
+    def start(self, repo_path: Path, head_commit: Optional[str], message: str,
+              author: Optional[str] = None, tag: Optional[str] = None,
+              changed_only: bool = False) -> Optional[CommitJob]:
+        """
+        Start staging and committing on a worker thread.
+
+        Args:
+            repo_path: Path to repository root
+            head_commit: HEAD before the commit, used to plan staging
+            message: Commit message
+            author: Author name
+            tag: Optional tag
+            changed_only: Stage only files that differ from HEAD
+
+        Returns:
+            The started job, or None if a commit is already running
+        """
+        if self.is_running:
+            return None
+        self.job = CommitJob(repo_path, head_commit, message, author, tag, changed_only)
+        self.job.start()
+        return self.job
+
+    def status_text(self) -> str:
+        """Short human-readable progress for the commit panel."""
+        job = self.job
+        if job is None or job.done:
+            return ""
+        return f"{job.stage}... ({job.elapsed:.0f}s)"
+
+
+# Global pipeline instance
+_pipeline_instance: Optional[CommitPipeline] = None
+
+
+def get_commit_pipeline() -> CommitPipeline:
+    """Get global commit pipeline instance."""
+    global _pipeline_instance
+    if _pipeline_instance is None:
+        _pipeline_instance = CommitPipeline()
+    return _pipeline_instance
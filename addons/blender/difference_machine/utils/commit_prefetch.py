@@ -0,0 +1,218 @@
+"""
+Speculative prefetch of the selected commit for Difference Machine addon.
+
+Compare and Replace used to start from scratch when pressed. Selecting a
+row in the commit list now prefetches that commit: a worker thread fetches
+the commit details (``forester show``) and resolves the blob of the open
+.blend in the commit's tree and materializes the commit directory from the
+object store, then a main-thread timer indexes the object names of that
+blob. Compare and Replace find the object in the blob with warm caches and,
+instead of extracting the commit, link or import it from the ready commit
+directory (the blob itself is never linked, its relative paths would
+resolve inside ``.DFM``).
+
+A prefetch starts only after the selection rests for PREFETCH_DELAY
+seconds, is cancelled as soon as the selection moves, and skips blobs
+larger than the prefetch budget.
+"""
+
+import threading
+from pathlib import Path
+from typing import Optional, Tuple
+import bpy
+from bpy.app.handlers import persistent
+from .logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Seconds the selection must rest before a prefetch starts
+PREFETCH_DELAY: float = 0.3
+
+# Interval of the main-thread timer that watches a running prefetch
+PREFETCH_POLL_INTERVAL: float = 0.1
+
+# Job states
+PREFETCH_STATE_RUNNING = 'RUNNING'
+PREFETCH_STATE_RESOLVED = 'RESOLVED'
+PREFETCH_STATE_DONE = 'DONE'
+PREFETCH_STATE_SKIPPED = 'SKIPPED'
+PREFETCH_STATE_CANCELLED = 'CANCELLED'
+PREFETCH_STATE_FAILED = 'FAILED'
+
+
+class PrefetchJob:
+    """Cancellable prefetch of one commit."""
+
+    def __init__(self, repo_path: Path, commit_hash: str, rel_path: str, budget_bytes: int):
+        self.repo_path = Path(repo_path)
+        self.commit_hash = commit_hash
+        self.rel_path = rel_path
+        self.budget_bytes = budget_bytes
+        self.cancel_event = threading.Event()
+        self.state = PREFETCH_STATE_RUNNING
+        self.blob_path: Optional[Path] = None
+        self.error: Optional[str] = None
+
+    @property
+    def cancelled(self) -> bool:
+        return self.cancel_event.is_set()
+
+    def cancel(self) -> None:
+        """Request cancellation; checked between prefetch steps."""
+        self.cancel_event.set()
+
+    def start(self) -> None:
+        threading.Thread(target=self._run, name="dfm-prefetch", daemon=True).start()
+
+    def _run(self) -> None:
+        from .compare_sessions import get_compare_sessions
+        sessions = get_compare_sessions()
+        try:
+            blob_hash = sessions.resolve_blobs(self.repo_path, [self.commit_hash], self.rel_path).get(self.commit_hash)
+        except Exception as e:
+            self.error = str(e)
+            self.state = PREFETCH_STATE_FAILED
+            logger.debug("Prefetch of %s failed: %s", self.commit_hash, e)
+            return
+
+        if self.cancelled:
+            self.state = PREFETCH_STATE_CANCELLED
+            return
+        if not blob_hash:
+            self.state = PREFETCH_STATE_DONE
+            return
+
+        blob_path = sessions.blob_file(self.repo_path, blob_hash)
+        try:
+            size = blob_path.stat().st_size
+        except OSError:
+            self.state = PREFETCH_STATE_DONE
+            return
+        if size > self.budget_bytes:
+            logger.debug("Prefetch of %s skipped: %s bytes over budget", self.commit_hash, size)
+            self.state = PREFETCH_STATE_SKIPPED
+            return
+
+        # Link the commit directory here so Compare/Replace do not build it on the main thread
+        if self.cancelled:
+            self.state = PREFETCH_STATE_CANCELLED
+            return
+        try:
+            sessions.materialize(self.repo_path, self.commit_hash)
+        except Exception as e:
+            logger.debug("Materializing %s failed: %s", self.commit_hash, e)
+
+        self.blob_path = blob_path
+        self.state = PREFETCH_STATE_RESOLVED
+
+
+class CommitPrefetcher:
+    """Owns the prefetch of the currently selected commit."""
+
+    def __init__(self):
+        self.job: Optional[PrefetchJob] = None
+        self._pending: Optional[Tuple[Path, str, str, int]] = None
+
+    def request(self, repo_path: Path, commit_hash: str, rel_path: str, budget_bytes: int) -> None:
+        """
+        Prefetch a commit once the selection rests, cancelling the previous prefetch.
+
+        Args:
+            repo_path: Path to repository root
+            commit_hash: Selected commit
+            rel_path: POSIX path of the open .blend relative to repo root
+            budget_bytes: Largest blob that is indexed; 0 disables prefetch
+        """
+        self.cancel()
+        if budget_bytes <= 0 or not commit_hash:
+            return
+        self._pending = (Path(repo_path), commit_hash, rel_path, budget_bytes)
+        try:
+            # Restart the delay on every selection change
+            if bpy.app.timers.is_registered(_start_pending_prefetch):
+                bpy.app.timers.unregister(_start_pending_prefetch)
+            bpy.app.timers.register(_start_pending_prefetch, first_interval=PREFETCH_DELAY)
+        except (AttributeError, ValueError) as e:
+            logger.debug(f"Failed to schedule prefetch: {e}")
+            self._pending = None
+
+    def cancel(self) -> None:
+        """Drop a pending prefetch and cancel the running one."""
+        self._pending = None
+        job = self.job
+        if job is not None and job.state in (PREFETCH_STATE_RUNNING, PREFETCH_STATE_RESOLVED):
+            job.cancel()
+
+    def _start(self) -> None:
+        pending, self._pending = self._pending, None
+        if pending is None:
+            return
+        self.job = PrefetchJob(*pending)
+        self.job.start()
+        if not bpy.app.timers.is_registered(_poll_prefetch):
+            bpy.app.timers.register(_poll_prefetch, first_interval=PREFETCH_POLL_INTERVAL)
+
+    def _finish(self, job: PrefetchJob) -> None:
+        """Index the resolved blob (main thread)."""
+        if job.cancelled:
+            job.state = PREFETCH_STATE_CANCELLED
+            return
+        from .blend_index import get_blend_object_index
+        get_blend_object_index().object_names(job.blob_path)
+        job.state = PREFETCH_STATE_DONE
+        logger.debug("Prefetched commit %s", job.commit_hash)
+
+
+def _start_pending_prefetch():
+    """Timer callback: start the pending prefetch after the selection rested."""
+    get_commit_prefetcher()._start()
+    return None
+
+
+def _poll_prefetch():
+    """Timer callback: finish the running prefetch on the main thread."""
+    prefetcher = get_commit_prefetcher()
+    job = prefetcher.job
+    if job is None:
+        return None
+    if job.state == PREFETCH_STATE_RUNNING:
+        return PREFETCH_POLL_INTERVAL
+    if job.state == PREFETCH_STATE_RESOLVED:
+        prefetcher._finish(job)
+    return None
+
+
+# Global prefetcher instance
+_prefetcher_instance: Optional[CommitPrefetcher] = None
+
+
+def get_commit_prefetcher() -> CommitPrefetcher:
+    """Get global commit prefetcher instance."""
+    global _prefetcher_instance
+    if _prefetcher_instance is None:
+        _prefetcher_instance = CommitPrefetcher()
+    return _prefetcher_instance
+
+
+@persistent
+def _on_load_post(*args):
+    """A prefetch belongs to the previously open file."""
+    get_commit_prefetcher().cancel()
+
+
+def register():
+    """Register prefetch handlers."""
+    if _on_load_post not in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.append(_on_load_post)
+
+
+def unregister():
+    """Unregister prefetch handlers and stop a running prefetch."""
+    if _on_load_post in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.remove(_on_load_post)
+    get_commit_prefetcher().cancel()
+    for timer in (_start_pending_prefetch, _poll_prefetch):
+        try:
+            bpy.app.timers.unregister(timer)
+        except ValueError:
+            pass
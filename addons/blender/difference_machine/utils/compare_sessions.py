@@ -0,0 +1,552 @@
+"""
+Object comparison sessions for Difference Machine addon.
+
+A session is one object from a commit linked next to the original for
+comparison. Several sessions can be active at once, so each commit is
+extracted into its own ``.DFM/compare/<commit>`` directory, not the shared
+``tmp_review``.
+
+Linked libraries are tracked per blob hash of the .blend they were loaded
+from and reference counted by sessions. Comparing the same blob again (the
+same commit, or another commit with an identical file) reuses the loaded
+library. Ending the last session of a library removes it with
+``bpy.data.libraries.remove``, which deletes all its linked data in one step.
+Unused commit directories are handed to the deferred deleter.
+
+A saved file keeps its comparison libraries, so loading it recreates
+their sessions from ``bpy.data.libraries``; their blob hashes are resolved
+on a worker thread afterwards. Loading also sweeps commit directories that
+none of them uses, but only those this Blender created (e.g. left by a file
+closed unsaved) or that nobody has used for ``COMPARE_SWEEP_AGE``: another
+Blender may have the rest open. Using a directory refreshes its mtime.
+
+Commit directories are normally materialized from the object store by
+hard-linking the blobs of the commit tree into the project layout, which
+needs no ``forester compare`` and keeps relative paths inside the .blend
+files valid. Never link a blob from the object store itself: its
+``//`` paths would resolve against ``.DFM/objects/blobs``. The prefetch
+worker materializes the selected commit ahead of Compare/Replace, and
+materialized files are made read-only because they share their inode with
+the blob.
+
+A timeline compares one object across many commits. Its .blend blobs are
+resolved and its commit directories materialized concurrently, and commits
+with an identical file share one linked object.
+"""
+
+import os
+import shutil
+import stat
+import threading
+import time
+from pathlib import Path
+from typing import Optional, Dict, List, Tuple, Iterable
+import bpy
+from bpy.app.handlers import persistent
+from .logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Per-commit extraction directories relative to repository root
+COMPARE_DIR: str = os.path.join(".DFM", "compare")
+
+# Blob store; a blob is the raw file content
+BLOBS_DIR: str = os.path.join(".DFM", "objects", "blobs", "sha256")
+
+# Concurrent workers when resolving blobs or materializing many commits
+MAX_RESOLVE_WORKERS: int = 8
+
+# Permissions of materialized files (shared with their blob when hard-linked)
+READ_ONLY_MODE: int = stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH
+
+# Seconds after which an unused commit directory is swept even if another
+# Blender created it
+COMPARE_SWEEP_AGE: float = 24 * 3600.0
+
+
+class CompareLibrary:
+    """A linked library loaded for comparison sessions."""
+
+    __slots__ = ("blob_hash", "filepath", "directory", "refcount")
+
+    def __init__(self, blob_hash: str, filepath: str, directory: Optional[Path]):
+        self.blob_hash = blob_hash
+        self.filepath = filepath
+        self.directory = directory
+        self.refcount = 0
+
+
+class CompareSession:
+    """One compared object."""
+
+    __slots__ = ("commit_hash", "original_name", "object_name", "blob_hash", "slot")
+
+    def __init__(self, commit_hash: str, original_name: str, object_name: str, blob_hash: str, slot: int = 1):
+        self.commit_hash = commit_hash
+        self.original_name = original_name
+        self.object_name = object_name
+        self.blob_hash = blob_hash
+        # Position along the compare axis, in multiples of the offset
+        self.slot = slot
+
+    @property
+    def key(self) -> Tuple[str, str]:
+        return self.commit_hash, self.original_name
+
+
+class CompareSessionManager:
+    """Active comparison sessions and the libraries they use."""
+
+    def __init__(self):
+        self._sessions: Dict[Tuple[str, str], CompareSession] = {}
+        self._libraries: Dict[str, CompareLibrary] = {}
+        self._repo_path: Optional[Path] = None
+        # (repo, commit, path) -> blob hash; commits never change
+        self._blob_memo: Dict[Tuple[str, str, str], Optional[str]] = {}
+        # Commit directories created by this Blender
+        self._created: set = set()
+
+    @staticmethod
+    def blob_file(repo_path: Path, blob_hash: str) -> Path:
+        """Path of a blob in the object store."""
+        return Path(repo_path) / BLOBS_DIR / blob_hash[:2] / blob_hash[2:]
+
+    def resolve_blobs(self, repo_path: Path, commit_hashes: Iterable[str], rel_path: str) -> Dict[str, Optional[str]]:
+        """
+        Blob hash of one file in several commits.
+
+        Commit details missing from the commit cache are fetched
+        concurrently; each tree is read once even if commits share it.
+
+        Args:
+            repo_path: Repository root
+            commit_hashes: Commits to resolve
+            rel_path: POSIX path of the file relative to repo root
+
+        Returns:
+            Dict of commit hash -> blob hash (None if the file is not in the commit)
+        """
+        from .commit_cache import get_commit_cache
+        from .working_tree import read_tree_paths
+
+        repo_key = str(repo_path)
+        result = {}
+        pending = []
+        for commit_hash in dict.fromkeys(commit_hashes):
+            memo_key = (repo_key, commit_hash, rel_path)
+            if memo_key in self._blob_memo:
+                result[commit_hash] = self._blob_memo[memo_key]
+            else:
+                pending.append(commit_hash)
+        if not pending:
+            return result
+
+        def tree_of(commit_hash: str) -> Optional[str]:
+            success, details, _ = get_commit_cache().get(repo_path, commit_hash)
+            return (details or {}).get("tree") if success else None
+
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=min(MAX_RESOLVE_WORKERS, len(pending))) as executor:
+            trees = dict(zip(pending, executor.map(tree_of, pending)))
+            unique_trees = [t for t in dict.fromkeys(trees.values()) if t]
+            tree_paths = dict(zip(unique_trees, executor.map(lambda t: read_tree_paths(repo_path, t), unique_trees)))
+
+        for commit_hash, tree_hash in trees.items():
+            paths = tree_paths.get(tree_hash) if tree_hash else None
+            blob_hash = paths.get(rel_path) if paths else None
+            if paths is not None:
+                self._blob_memo[(repo_key, commit_hash, rel_path)] = blob_hash
+            result[commit_hash] = blob_hash
+        return result
+
+    @staticmethod
+    def commit_directory(repo_path: Path, commit_hash: str) -> Path:
+        """Extraction directory of a commit."""
+        return Path(repo_path) / COMPARE_DIR / commit_hash
+
+    def adopt_directory(self, repo_path: Path, commit_hash: str, extracted_path: Path) -> Path:
+        """
+        Move a fresh extraction (e.g. ``tmp_review``) to the commit's directory.
+
+        Returns:
+            The commit directory, or ``extracted_path`` if it could not be
+            moved (then only one session can use it safely)
+        """
+        self._repo_path = Path(repo_path)
+        target = self.commit_directory(repo_path, commit_hash)
+        if target.exists():
+            _touch(target)
+            return target
+        try:
+            target.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(extracted_path, target)
+            self._created.add(target)
+            return target
+        except OSError as e:
+            logger.warning(f"Could not move extraction to {target}: {e}")
+            return extracted_path
+
+    def materialize(self, repo_path: Path, commit_hash: str) -> Optional[Path]:
+        """
+        Build the commit's directory from the object store, mirroring the project layout.
+
+        Every file of the commit tree is hard-linked from its blob (copied if
+        the filesystem refuses links), so relative paths inside the .blend
+        files (``//textures/...``, nested libraries) resolve as they did in
+        the project. Each file is made read-only: a link shares its inode
+        with the blob, so a write through it would corrupt the object store
+        (blobs are content-addressed and never change, so the blob losing
+        write permission is harmless). Safe to call from worker threads; the
+        directory is built aside and renamed into place.
+
+        Returns:
+            The commit directory, or None if the tree or a blob is missing
+            (then the commit has to be extracted with ``forester compare``)
+        """
+        from .commit_cache import get_commit_cache
+        from .working_tree import read_tree_paths
+
+        self._repo_path = Path(repo_path)
+        target = self.commit_directory(repo_path, commit_hash)
+        if target.exists():
+            _touch(target)
+            return target
+        success, details, _ = get_commit_cache().get(repo_path, commit_hash)
+        tree_hash = (details or {}).get("tree") if success else None
+        paths = read_tree_paths(repo_path, tree_hash) if tree_hash else None
+        if paths is None:
+            return None
+
+        partial = target.with_name(f"{commit_hash}.{os.urandom(4).hex()}.part")
+        try:
+            for rel_path, blob_hash in paths.items():
+                destination = partial / rel_path
+                destination.parent.mkdir(parents=True, exist_ok=True)
+                source = self.blob_file(repo_path, blob_hash)
+                try:
+                    os.link(source, destination)
+                except OSError:
+                    shutil.copyfile(source, destination)
+                _make_read_only(destination)
+            os.replace(partial, target)
+            self._created.add(target)
+        except OSError as e:
+            if not target.exists():
+                logger.debug("Cannot materialize %s: %s", commit_hash[:16], e)
+            shutil.rmtree(partial, ignore_errors=True)
+            return target if target.exists() else None
+        logger.debug("Materialized %s files of %s", len(paths), commit_hash[:16])
+        return target
+
+    def materialize_many(self, repo_path: Path, commit_hashes: Iterable[str]) -> Dict[str, Optional[Path]]:
+        """Materialize several commits concurrently (see ``materialize``)."""
+        pending = list(dict.fromkeys(commit_hashes))
+        if not pending:
+            return {}
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=min(MAX_RESOLVE_WORKERS, len(pending))) as executor:
+            directories = executor.map(lambda h: self.materialize(repo_path, h), pending)
+            return dict(zip(pending, directories))
+
+    def sessions(self) -> List[CompareSession]:
+        """All active sessions, oldest first."""
+        return list(self._sessions.values())
+
+    def get(self, commit_hash: str, object_name: str) -> Optional[CompareSession]:
+        """Find the session of a commit by original or comparison object name."""
+        session = self._sessions.get((commit_hash, object_name))
+        if session is not None:
+            return session
+        for session in self._sessions.values():
+            if session.commit_hash == commit_hash and session.object_name == object_name:
+                return session
+        return None
+
+    def find_by_object(self, obj) -> Optional[CompareSession]:
+        """Find a session whose comparison object is ``obj`` (linked objects may share names)."""
+        library = getattr(obj, "library", None)
+        if library is None:
+            return None
+        filepath = os.path.normcase(os.path.abspath(bpy.path.abspath(library.filepath)))
+        for session in self._sessions.values():
+            entry = self._libraries.get(session.blob_hash)
+            if (session.object_name == obj.name and entry is not None
+                    and os.path.normcase(os.path.abspath(entry.filepath)) == filepath):
+                return session
+        return None
+
+    def library_for_blob(self, blob_hash: str) -> Optional[CompareLibrary]:
+        """Return the loaded library of a blob, or None."""
+        entry = self._libraries.get(blob_hash)
+        if entry is None:
+            return None
+        if self._find_library(entry.filepath) is None:
+            # Removed by the user or by undo
+            del self._libraries[blob_hash]
+            return None
+        return entry
+
+    def _library_for_path(self, filepath: str) -> Optional[CompareLibrary]:
+        key = os.path.normcase(os.path.abspath(filepath))
+        for entry in self._libraries.values():
+            if os.path.normcase(os.path.abspath(entry.filepath)) == key:
+                return entry
+        return None
+
+    @staticmethod
+    def _find_library(filepath: str):
+        from .blend_index import get_linked_library_index
+        return get_linked_library_index().library(Path(filepath))
+
+    def open(self, repo_path: Path, commit_hash: str, original_name: str, linked_obj, blob_hash: str,
+             directory: Optional[Path], slot: int = 1) -> CompareSession:
+        """
+        Register a session for an object linked from a commit.
+
+        Args:
+            repo_path: Repository root
+            commit_hash: Compared commit
+            original_name: Name of the object it is compared with
+            linked_obj: Linked comparison object
+            blob_hash: Blob hash of the .blend the object was linked from
+            directory: Commit directory containing that .blend
+            slot: Position along the compare axis
+
+        Returns:
+            The new session
+        """
+        self._repo_path = Path(repo_path)
+        entry = self._libraries.get(blob_hash)
+        if entry is None:
+            filepath = bpy.path.abspath(linked_obj.library.filepath)
+            # A library recreated on load may still be keyed by its path
+            entry = self._library_for_path(filepath)
+            if entry is None:
+                entry = self._libraries[blob_hash] = CompareLibrary(
+                    blob_hash, filepath, Path(directory) if directory else None
+                )
+            blob_hash = entry.blob_hash
+        entry.refcount += 1
+
+        session = CompareSession(commit_hash, original_name, linked_obj.name, blob_hash, slot)
+        self._sessions[session.key] = session
+        return session
+
+    def close(self, session: CompareSession) -> None:
+        """End a session, removing its library if no other session uses it."""
+        if self._sessions.pop(session.key, None) is None:
+            return
+        entry = self._libraries.get(session.blob_hash)
+        if entry is None:
+            return
+        entry.refcount -= 1
+        if entry.refcount > 0:
+            return
+
+        del self._libraries[session.blob_hash]
+        library = self._find_library(entry.filepath)
+        if library is not None:
+            bpy.data.libraries.remove(library)
+            logger.debug("Removed comparison library %s", entry.filepath)
+        self.release_directory(entry.directory)
+
+    def release_directory(self, directory: Optional[Path]) -> None:
+        """Delete an extraction directory unless a loaded library is inside it."""
+        if directory is None:
+            return
+        directory = Path(directory)
+        if any(entry.directory == directory for entry in self._libraries.values()):
+            return
+        if self._repo_path is None or not directory.exists():
+            return
+        from .deferred_delete import get_deferred_deleter
+        if get_deferred_deleter().schedule(self._repo_path, directory):
+            self._created.discard(directory)
+
+    def close_all(self) -> None:
+        """End all sessions."""
+        for session in self.sessions():
+            self.close(session)
+
+    def forget(self) -> None:
+        """Drop all state without touching Blender data."""
+        self._sessions.clear()
+        self._libraries.clear()
+
+    def rebuild(self, repo_path: Path) -> int:
+        """
+        Recreate sessions from comparison libraries saved in the open file.
+
+        Every library under ``.DFM/compare/<commit>`` gets one session per
+        directly linked object, so Compare can end them and remove the
+        library like in the session that created them. Libraries are keyed
+        by their path until a worker thread resolves their blob hashes
+        (which may need ``forester show``), so loading never waits on it.
+
+        Returns:
+            Number of sessions recreated
+        """
+        self.forget()
+        self._repo_path = Path(repo_path)
+        compare_root = Path(repo_path).resolve() / COMPARE_DIR
+        pending: Dict[str, Tuple[str, str]] = {}
+        for library in list(bpy.data.libraries):
+            filepath = os.path.abspath(bpy.path.abspath(library.filepath))
+            try:
+                parts = Path(filepath).resolve().relative_to(compare_root).parts
+            except (ValueError, OSError):
+                continue
+            if len(parts) < 2:
+                continue
+            commit_hash = parts[0]
+            placeholder = f"library:{filepath}"
+            directory = self.commit_directory(repo_path, commit_hash)
+            _touch(directory)
+            for obj in bpy.data.objects:
+                if obj.library == library and not obj.is_library_indirect:
+                    self.open(repo_path, commit_hash, obj.name, obj, placeholder, directory)
+                    pending[placeholder] = (commit_hash, Path(*parts[1:]).as_posix())
+        if pending:
+            threading.Thread(
+                target=self._resolve_worker,
+                args=(Path(repo_path), pending),
+                name="dfm-compare-resolve",
+                daemon=True
+            ).start()
+        logger.debug("Recreated %s comparison sessions", len(self._sessions))
+        return len(self._sessions)
+
+    def _resolve_worker(self, repo_path: Path, pending: Dict[str, Tuple[str, str]]) -> None:
+        resolved = {}
+        for placeholder, (commit_hash, rel_path) in pending.items():
+            try:
+                resolved[placeholder] = self.resolve_blobs(repo_path, [commit_hash], rel_path).get(commit_hash)
+            except Exception as e:
+                logger.debug(f"Could not resolve blob of {rel_path} in {commit_hash[:16]}: {e}")
+        if not any(resolved.values()):
+            return
+
+        def apply():
+            self._rekey_libraries(resolved)
+            return None
+
+        try:
+            bpy.app.timers.register(apply, first_interval=0.0)
+        except (AttributeError, ValueError) as e:
+            logger.debug(f"Failed to schedule blob rekey: {e}")
+
+    def _rekey_libraries(self, resolved: Dict[str, Optional[str]]) -> None:
+        """Key libraries recreated on load by their resolved blob hashes (main thread)."""
+        for placeholder, blob_hash in resolved.items():
+            entry = self._libraries.get(placeholder)
+            if entry is None or not blob_hash or blob_hash in self._libraries:
+                continue
+            entry.blob_hash = blob_hash
+            self._libraries[blob_hash] = self._libraries.pop(placeholder)
+            for session in self._sessions.values():
+                if session.blob_hash == placeholder:
+                    session.blob_hash = blob_hash
+
+    def sweep(self, repo_path: Path) -> int:
+        """
+        Delete commit directories that no loaded comparison library uses.
+
+        A directory is swept only if this Blender created it or nobody
+        used it for ``COMPARE_SWEEP_AGE``; another running Blender may have
+        a library loaded from any other.
+
+        Returns:
+            Number of directories handed to the deferred deleter
+        """
+        from .deferred_delete import get_deferred_deleter
+        self._repo_path = Path(repo_path)
+        in_use = {entry.directory for entry in self._libraries.values()}
+        try:
+            entries = list(os.scandir(Path(repo_path) / COMPARE_DIR))
+        except OSError:
+            return 0
+        now = time.time()
+        swept = 0
+        for entry in entries:
+            directory = self.commit_directory(repo_path, entry.name)
+            if directory in in_use:
+                continue
+            if directory not in self._created:
+                try:
+                    if now - entry.stat(follow_symlinks=False).st_mtime < COMPARE_SWEEP_AGE:
+                        continue
+                except OSError:
+                    continue
+            if get_deferred_deleter().schedule(self._repo_path, directory):
+                self._created.discard(directory)
+                swept += 1
+        if swept:
+            logger.debug("Swept %s unused comparison directories", swept)
+        return swept
+
+
+def _make_read_only(path: Path) -> None:
+    """Drop write permission from a materialized file (best effort, the blob may not be ours)."""
+    try:
+        if os.stat(path).st_mode & (stat.S_IWUSR | stat.S_IWGRP | stat.S_IWOTH):
+            os.chmod(path, READ_ONLY_MODE)
+    except OSError as e:
+        logger.debug("Cannot make %s read-only: %s", path, e)
+
+
+def _touch(directory: Path) -> None:
+    """Mark a commit directory as in use so other Blenders do not sweep it."""
+    try:
+        os.utime(directory)
+    except OSError:
+        pass
+
+
+# Global instance
+_manager_instance: Optional[CompareSessionManager] = None
+
+
+def get_compare_sessions() -> CompareSessionManager:
+    """Get global comparison session manager instance."""
+    global _manager_instance
+    if _manager_instance is None:
+        _manager_instance = CompareSessionManager()
+    return _manager_instance
+
+
+@persistent
+def _on_load_post(*args):
+    """Recreate the sessions of the loaded file and sweep unused commit directories."""
+    from .helpers import get_repository_path
+    manager = get_compare_sessions()
+    manager.forget()
+    repo_path, _ = get_repository_path()
+    if not repo_path:
+        return
+    try:
+        manager.rebuild(repo_path)
+        manager.sweep(repo_path)
+    except (AttributeError, ReferenceError, RuntimeError, OSError) as e:
+        logger.debug(f"Could not restore comparison sessions: {e}")
+        return
+    for scene in bpy.data.scenes:
+        if not getattr(scene, 'df_object_comparison_active', False):
+            continue
+        if manager.get(scene.df_object_comparison_commit_hash, scene.df_object_comparison_object_name) is None:
+            scene.df_object_comparison_active = False
+            scene.df_object_comparison_object_name = ""
+            scene.df_object_comparison_commit_hash = ""
+            scene.df_object_comparison_original_name = ""
+
+
+def register():
+    """Register comparison session handlers."""
+    if _on_load_post not in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.append(_on_load_post)
+
+
+def unregister():
+    """Unregister comparison session handlers."""
+    if _on_load_post in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.remove(_on_load_post)
+    get_compare_sessions().forget()
@@ -3,7 +3,6 @@ Configuration loader for Difference Machine addon.
 Loads forester CLI executable path from setup.cfg.
 """
 
-import configparser
 from pathlib import Path
 from typing import Optional
 
@@ -21,6 +20,7 @@ def get_forester_path() -> Optional[str]:
         return None
     
     try:
+        import configparser
         config = configparser.ConfigParser()
         config.read(setup_cfg_path)
         
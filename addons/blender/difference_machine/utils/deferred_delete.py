@@ -0,0 +1,172 @@
+"""
+Deferred directory deletion for Difference Machine addon.
+
+Removing multi-GB preview/compare folders with ``shutil.rmtree`` on the UI
+thread stalls Blender. Instead, stale directories are atomically renamed
+into ``.DFM/trash`` (instant, same filesystem) and deleted by a background
+thread. Freed space is accounted while deleting, so nothing walks the tree
+on the main thread.
+"""
+
+import os
+import queue
+import stat
+import threading
+from pathlib import Path
+from typing import Optional, Tuple
+from .logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Trash area relative to repository root
+TRASH_DIR: str = os.path.join(".DFM", "trash")
+
+
+class DeferredDeleter:
+    """Rename-then-delete queue served by a single background thread."""
+
+    def __init__(self):
+        self._queue: "queue.Queue[Path]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._worker: Optional[threading.Thread] = None
+        self.pending_count: int = 0
+        self.deleted_count: int = 0
+        self.freed_bytes: int = 0
+        self._recovered: set = set()
+
+    def schedule(self, repo_path: Path, path: Path) -> bool:
+        """
+        Move a directory to the trash area and queue it for deletion.
+
+        Args:
+            repo_path: Path to repository root (trash lives under its .DFM)
+            path: Directory to delete
+
+        Returns:
+            True if the directory was moved to trash
+        """
+        trash_dir = Path(repo_path) / TRASH_DIR
+        try:
+            trash_dir.mkdir(parents=True, exist_ok=True)
+            target = trash_dir / f"{path.name}-{os.urandom(4).hex()}"
+            os.replace(path, target)
+        except OSError as e:
+            logger.warning(f"Failed to move {path} to trash: {e}")
+            return False
+
+        self._enqueue(target)
+        return True
+
+    def recover(self, repo_path: Path) -> int:
+        """
+        Queue leftovers in the trash area (e.g. after Blender was closed mid-delete).
+
+        Only the first call per repository does anything.
+
+        Returns:
+            Number of entries queued
+        """
+        trash_dir = Path(repo_path) / TRASH_DIR
+        with self._lock:
+            if str(trash_dir) in self._recovered:
+                return 0
+            self._recovered.add(str(trash_dir))
+        try:
+            entries = list(os.scandir(trash_dir))
+        except OSError:
+            return 0
+
+        for entry in entries:
+            self._enqueue(Path(entry.path))
+        return len(entries)
+
+    def stats(self) -> Tuple[int, int, int]:
+        """Return (pending, deleted, freed_bytes)."""
+        with self._lock:
+            return self.pending_count, self.deleted_count, self.freed_bytes
+
+    def _enqueue(self, path: Path) -> None:
+        with self._lock:
+            self.pending_count += 1
+            self._queue.put(path)
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(
+                    target=self._run,
+                    name="dfm-deferred-delete",
+                    daemon=True
+                )
+                self._worker.start()
+
+    def _run(self) -> None:
+        while True:
+            try:
+                path = self._queue.get(timeout=1.0)
+            except queue.Empty:
+                with self._lock:
+                    if self._queue.empty():
+                        self._worker = None
+                        return
+                continue
+
+            freed = self._delete_tree(path)
+            with self._lock:
+                self.pending_count -= 1
+                self.deleted_count += 1
+                self.freed_bytes += freed
+            logger.debug(f"Deleted {path.name} from trash ({freed / (1024 * 1024):.1f} MB)")
+
+    def _delete_tree(self, path: Path) -> int:
+        """Delete a tree bottom-up, returning the number of bytes freed."""
+        freed = 0
+        try:
+            if not path.is_dir() or path.is_symlink():
+                freed = path.lstat().st_size
+                path.unlink()
+                return freed
+        except OSError as e:
+            logger.warning(f"Failed to delete {path}: {e}")
+            return 0
+
+        for root, dirs, files in os.walk(path, topdown=False):
+            for name in files:
+                file_path = os.path.join(root, name)
+                try:
+                    freed += os.lstat(file_path).st_size
+                    _unlink(file_path)
+                except OSError as e:
+                    logger.debug(f"Failed to delete {file_path}: {e}")
+            for name in dirs:
+                dir_path = os.path.join(root, name)
+                try:
+                    if os.path.islink(dir_path):
+                        os.unlink(dir_path)
+                    else:
+                        os.rmdir(dir_path)
+                except OSError as e:
+                    logger.debug(f"Failed to delete {dir_path}: {e}")
+        try:
+            os.rmdir(path)
+        except OSError as e:
+            logger.warning(f"Failed to delete {path}: {e}")
+        return freed
+
+
+def _unlink(file_path: str) -> None:
+    """Delete a file; read-only files (e.g. materialized blobs) need write permission on Windows."""
+    try:
+        os.unlink(file_path)
+    except PermissionError:
+        os.chmod(file_path, stat.S_IWRITE | stat.S_IREAD)
+        os.unlink(file_path)
+
+
+# Global deleter instance
+_deleter_instance: Optional[DeferredDeleter] = None
+
+
+def get_deferred_deleter() -> DeferredDeleter:
+    """Get global deferred deleter instance."""
+    global _deleter_instance
+    if _deleter_instance is None:
+        _deleter_instance = DeferredDeleter()
+    return _deleter_instance
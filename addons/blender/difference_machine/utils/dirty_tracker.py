@@ -0,0 +1,320 @@
+"""
+Tracking of objects modified since the last commit for Difference Machine addon.
+
+depsgraph_update_post records which objects had their geometry, transform
+or materials changed; the set is reset when a project commit is created or
+a commit is checked out. The baseline (commit hash, .blend mtime) is
+persisted in ``.DFM/cache/dirty_baseline.json``; save_post stores the
+recorded changes next to it with the mtime of the saved file. When a file is
+opened and its mtime matches either, tracking continues from that state,
+otherwise the changes are unknown until the next commit.
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Optional, Dict, Set, List, FrozenSet
+import bpy
+from bpy.app.handlers import persistent
+from .logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Location of the persisted baseline relative to repository root
+DIRTY_BASELINE_FILE: str = os.path.join(".DFM", "cache", "dirty_baseline.json")
+
+# Change flags
+FLAG_GEOMETRY = 'GEOMETRY'
+FLAG_TRANSFORM = 'TRANSFORM'
+FLAG_MATERIAL = 'MATERIAL'
+FLAG_ADDED = 'ADDED'
+FLAG_REMOVED = 'REMOVED'
+
+
+class DirtyObject:
+    """One object changed since the last commit."""
+
+    __slots__ = ("name", "data_name", "flags")
+
+    def __init__(self, name: str, data_name: str = ""):
+        self.name = name
+        self.data_name = data_name
+        self.flags: Set[str] = set()
+
+
+def _file_mtime_ns(filepath: str) -> Optional[int]:
+    try:
+        return os.stat(filepath).st_mtime_ns
+    except OSError:
+        return None
+
+
+class DirtyTracker:
+    """Objects, data and materials changed since the last commit."""
+
+    def __init__(self):
+        self._objects: Dict[str, DirtyObject] = {}
+        self._materials: Set[str] = set()
+        self._baseline_names: Optional[FrozenSet[str]] = None
+        self._baseline_mtime: Optional[int] = None
+        self._commit_hash: str = ""
+        self._version: int = 0
+        self._result_key = None
+        self._result: List[DirtyObject] = []
+
+    @property
+    def is_known(self) -> bool:
+        """False if the file was opened without a matching baseline."""
+        return self._baseline_names is not None
+
+    @property
+    def commit_hash(self) -> str:
+        """Commit the tracked changes are relative to."""
+        return self._commit_hash
+
+    def _reset(self, known: bool) -> None:
+        self._objects.clear()
+        self._materials.clear()
+        self._baseline_names = frozenset(bpy.data.objects.keys()) if known else None
+        self._version += 1
+
+    def record_object(self, obj, flags: Set[str]) -> None:
+        """Record changes of an object."""
+        entry = self._objects.get(obj.name)
+        if entry is None:
+            entry = self._objects[obj.name] = DirtyObject(obj.name, obj.data.name if obj.data else "")
+        if not flags <= entry.flags:
+            entry.flags |= flags
+            self._version += 1
+
+    def record_material(self, material_name: str) -> None:
+        """Record a material change (applies to every object using it)."""
+        if material_name not in self._materials:
+            self._materials.add(material_name)
+            self._version += 1
+
+    def touch(self) -> None:
+        """Note a change that may have added or removed objects."""
+        self._version += 1
+
+    def modified_objects(self) -> List[DirtyObject]:
+        """
+        Return objects changed since the last commit, sorted by name.
+
+        Empty if the changes are unknown (see ``is_known``).
+        """
+        if not self.is_known:
+            return []
+
+        key = (self._version, len(bpy.data.objects))
+        if key == self._result_key:
+            return self._result
+
+        # Copies: derived flags must not leak into the recorded entries
+        result: Dict[str, DirtyObject] = {}
+        for name, recorded in self._objects.items():
+            if recorded.flags and name in bpy.data.objects:
+                entry = result[name] = DirtyObject(name, recorded.data_name)
+                entry.flags.update(recorded.flags)
+
+        if self._materials:
+            for obj in bpy.data.objects:
+                for slot in obj.material_slots:
+                    if slot.material and slot.material.name in self._materials:
+                        entry = result.get(obj.name)
+                        if entry is None:
+                            entry = result[obj.name] = DirtyObject(obj.name, obj.data.name if obj.data else "")
+                        entry.flags.add(FLAG_MATERIAL)
+                        break
+
+        current_names = set(bpy.data.objects.keys())
+        for name in current_names - self._baseline_names:
+            obj = bpy.data.objects[name]
+            entry = result.setdefault(name, DirtyObject(name, obj.data.name if obj.data else ""))
+            entry.flags.add(FLAG_ADDED)
+        for name in self._baseline_names - current_names:
+            entry = DirtyObject(name)
+            entry.flags.add(FLAG_REMOVED)
+            result[name] = entry
+
+        self._result = [result[name] for name in sorted(result)]
+        self._result_key = key
+        return self._result
+
+    def modified_object_names(self) -> Optional[List[str]]:
+        """Names of changed objects, or None if the changes are unknown."""
+        if not self.is_known:
+            return None
+        return [entry.name for entry in self.modified_objects()]
+
+    def file_changed_since_commit(self) -> bool:
+        """Check whether the .blend file on disk differs from the commit baseline."""
+        if not bpy.data.filepath or self._baseline_mtime is None:
+            return True
+        return _file_mtime_ns(bpy.data.filepath) != self._baseline_mtime
+
+    @staticmethod
+    def _baseline_key(repo_path: Path, filepath: str) -> str:
+        try:
+            return Path(filepath).resolve().relative_to(Path(repo_path).resolve()).as_posix()
+        except ValueError:
+            return Path(filepath).as_posix()
+
+    def _read_baselines(self, repo_path: Path) -> Dict[str, Dict]:
+        try:
+            with open(Path(repo_path) / DIRTY_BASELINE_FILE, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            return data if isinstance(data, dict) else {}
+        except (OSError, ValueError):
+            return {}
+
+    def _write_baseline(self, repo_path: Path, entry: Dict) -> None:
+        baselines = self._read_baselines(repo_path)
+        baselines[self._baseline_key(repo_path, bpy.data.filepath)] = entry
+        path = Path(repo_path) / DIRTY_BASELINE_FILE
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(".tmp")
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(baselines, f)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.debug(f"Failed to persist dirty baseline: {e}")
+
+    def mark_committed(self, repo_path: Path, commit_hash: str) -> None:
+        """
+        Reset tracking: the current file state equals ``commit_hash``.
+
+        Call after a project commit or a checkout that reloaded the file.
+        """
+        self._reset(known=True)
+        self._commit_hash = commit_hash or ""
+        self._baseline_mtime = _file_mtime_ns(bpy.data.filepath) if bpy.data.filepath else None
+        if self._baseline_mtime is None:
+            return
+        self._write_baseline(repo_path, {"commit": self._commit_hash, "mtime_ns": self._baseline_mtime})
+
+    def save_state(self, repo_path: Path) -> None:
+        """Persist recorded changes for the file that was just saved."""
+        if not self.is_known or not bpy.data.filepath:
+            return
+        self._write_baseline(repo_path, {
+            "commit": self._commit_hash,
+            "mtime_ns": self._baseline_mtime,
+            "saved_mtime_ns": _file_mtime_ns(bpy.data.filepath),
+            "names": sorted(self._baseline_names),
+            "objects": {name: [entry.data_name, sorted(entry.flags)] for name, entry in self._objects.items()},
+            "materials": sorted(self._materials),
+        })
+
+    def load_baseline(self, repo_path: Optional[Path]) -> None:
+        """Start tracking for a freshly opened file."""
+        self._commit_hash = ""
+        self._baseline_mtime = None
+        entry = {}
+        if repo_path and bpy.data.filepath:
+            entry = self._read_baselines(repo_path).get(self._baseline_key(repo_path, bpy.data.filepath)) or {}
+        mtime = _file_mtime_ns(bpy.data.filepath) if bpy.data.filepath else None
+
+        if mtime is not None and entry.get("mtime_ns") == mtime:
+            # File unchanged since the commit
+            self._reset(known=True)
+        elif mtime is not None and entry.get("saved_mtime_ns") == mtime and "names" in entry:
+            # Saved by us with changes recorded up to that point
+            self._reset(known=True)
+            self._baseline_names = frozenset(entry["names"])
+            for name, (data_name, flags) in entry.get("objects", {}).items():
+                dirty = self._objects[name] = DirtyObject(name, data_name)
+                dirty.flags.update(flags)
+            self._materials.update(entry.get("materials", []))
+        else:
+            self._reset(known=False)
+            return
+        self._commit_hash = entry.get("commit", "")
+        self._baseline_mtime = entry.get("mtime_ns")
+
+
+# Global tracker instance
+_tracker_instance: Optional[DirtyTracker] = None
+
+
+def get_dirty_tracker() -> DirtyTracker:
+    """Get global dirty object tracker instance."""
+    global _tracker_instance
+    if _tracker_instance is None:
+        _tracker_instance = DirtyTracker()
+    return _tracker_instance
+
+
+@persistent
+def _on_depsgraph_update_post(scene, depsgraph):
+    """Record geometry, transform and material changes."""
+    tracker = get_dirty_tracker()
+    if not tracker.is_known:
+        return
+    try:
+        if depsgraph.id_type_updated('COLLECTION') or depsgraph.id_type_updated('SCENE'):
+            tracker.touch()
+        for update in depsgraph.updates:
+            data = update.id
+            if isinstance(data, bpy.types.Object):
+                flags = set()
+                if update.is_updated_geometry:
+                    flags.add(FLAG_GEOMETRY)
+                if update.is_updated_transform:
+                    flags.add(FLAG_TRANSFORM)
+                if flags:
+                    tracker.record_object(data.original, flags)
+            elif isinstance(data, bpy.types.Material):
+                tracker.record_material(data.original.name)
+    except (AttributeError, ReferenceError) as e:
+        logger.debug(f"Dirty tracking update failed: {e}")
+
+
+def _current_repository() -> Optional[Path]:
+    from .helpers import find_repository_root
+    return find_repository_root(Path(bpy.data.filepath).parent) if bpy.data.filepath else None
+
+
+@persistent
+def _on_load_post(*args):
+    """Restore the baseline of the opened file."""
+    get_dirty_tracker().load_baseline(_current_repository())
+
+
+@persistent
+def _on_save_post(*args):
+    """Keep recorded changes valid for the saved file."""
+    repo_path = _current_repository()
+    if repo_path:
+        get_dirty_tracker().save_state(repo_path)
+
+
+def _load_initial_baseline():
+    """Timer callback: the add-on may be enabled with a file already open."""
+    _on_load_post()
+    return None
+
+
+def register():
+    """Register dirty tracking handlers."""
+    if _on_depsgraph_update_post not in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.append(_on_depsgraph_update_post)
+    if _on_load_post not in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.append(_on_load_post)
+    if _on_save_post not in bpy.app.handlers.save_post:
+        bpy.app.handlers.save_post.append(_on_save_post)
+    if not bpy.app.timers.is_registered(_load_initial_baseline):
+        bpy.app.timers.register(_load_initial_baseline, first_interval=0.0)
+
+
+def unregister():
+    """Unregister dirty tracking handlers."""
+    if bpy.app.timers.is_registered(_load_initial_baseline):
+        bpy.app.timers.unregister(_load_initial_baseline)
+    if _on_depsgraph_update_post in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.remove(_on_depsgraph_update_post)
+    if _on_load_post in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.remove(_on_load_post)
+    if _on_save_post in bpy.app.handlers.save_post:
+        bpy.app.handlers.save_post.remove(_on_save_post)
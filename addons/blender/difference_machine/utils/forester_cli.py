@@ -3,14 +3,87 @@ Forester CLI wrapper for Difference Machine addon.
 Provides functions to execute forester CLI commands and parse their output.
 """
 
+import re
 import subprocess
 import logging
+import threading
+import time
+from datetime import datetime
 from pathlib import Path
 from typing import Optional, Tuple, List, Dict, Any
 from .config_loader import get_forester_path, validate_forester_path
+from .perf import measure, CATEGORY_CLI
 
 logger = logging.getLogger(__name__)
 
+# Seconds between cancellation checks while a cancellable command runs
+CANCEL_POLL_INTERVAL: float = 0.25
+
+# Second-level words recorded as part of the subcommand name in latency stats
+CLI_SUBCOMMAND_ACTIONS: Dict[str, Tuple[str, ...]] = {
+    "stash": ("save", "list", "pop", "apply", "drop"),
+    "lock": ("list", "unlock"),
+}
+
+# Date formats that forester may print in log/show output (tried in order)
+COMMIT_DATE_FORMATS: Tuple[str, ...] = (
+    "%a %b %d %H:%M:%S %Y %z",
+    "%a %b %d %H:%M:%S %Y",
+    "%Y-%m-%d %H:%M:%S %z",
+    "%Y-%m-%d %H:%M:%S",
+    "%Y-%m-%dT%H:%M:%S%z",
+    "%Y-%m-%dT%H:%M:%S",
+)
+
+
+def cli_subcommand_label(command: List[str]) -> str:
+    """
+    Name of a forester invocation for latency stats ("log", "stash pop", ...).
+    
+    Arguments such as paths and hashes are left out so calls aggregate.
+    """
+    if not command:
+        return "<none>"
+    name = command[0]
+    actions = CLI_SUBCOMMAND_ACTIONS.get(name)
+    if actions and len(command) > 1 and command[1] in actions:
+        return f"{name} {command[1]}"
+    if name == "commit" and "--delete" in command:
+        return "commit --delete"
+    return name
+
+
+def parse_commit_date(date_str: Optional[str]) -> int:
+    """
+    Parse a commit date string into a Unix timestamp.
+    
+    Args:
+        date_str: Date as printed by forester (git-style or ISO 8601)
+        
+    Returns:
+        Seconds since epoch, or 0 if the date could not be parsed
+    """
+    if not date_str:
+        return 0
+    
+    value = date_str.strip()
+    if value.endswith("Z"):
+        value = value[:-1] + "+0000"
+    
+    try:
+        return int(datetime.fromisoformat(value).timestamp())
+    except ValueError:
+        pass
+    
+    for fmt in COMMIT_DATE_FORMATS:
+        try:
+            return int(datetime.strptime(value, fmt).timestamp())
+        except ValueError:
+            continue
+    
+    logger.debug(f"Unrecognized commit date format: {date_str}")
+    return 0
+
 
 class ForesterCLIError(Exception):
     """Exception raised when forester CLI command fails."""
@@ -35,7 +108,8 @@ class ForesterCLI:
         self,
         command: List[str],
         cwd: Optional[Path] = None,
-        timeout: Optional[int] = 30
+        timeout: Optional[int] = 30,
+        cancel_event: Optional[threading.Event] = None
     ) -> Tuple[int, str, str]:
         """
         Execute forester CLI command.
@@ -44,6 +118,8 @@ class ForesterCLI:
             command: Command and arguments as list
             cwd: Working directory for command execution
             timeout: Timeout in seconds (None for no timeout)
+            cancel_event: If given and set while the command runs, the
+                process is killed and ForesterCLIError is raised
             
         Returns:
             Tuple of (exit_code, stdout, stderr)
@@ -58,20 +134,60 @@ class ForesterCLI:
         
         full_command = [forester_path] + command
         
+        with measure(CATEGORY_CLI, cli_subcommand_label(command)):
+            if cancel_event is not None:
+                return self._execute_cancellable(full_command, cwd, timeout, cancel_event)
+            
+            try:
+                result = subprocess.run(
+                    full_command,
+                    cwd=str(cwd) if cwd else None,
+                    capture_output=True,
+                    text=True,
+                    timeout=timeout
+                )
+                
+                return result.returncode, result.stdout, result.stderr
+            except subprocess.TimeoutExpired:
+                raise ForesterCLIError(f"Command timed out after {timeout} seconds")
+            except Exception as e:
+                raise ForesterCLIError(f"Failed to execute command: {str(e)}")
+    
+    def _execute_cancellable(
+        self,
+        full_command: List[str],
+        cwd: Optional[Path],
+        timeout: Optional[int],
+        cancel_event: threading.Event
+    ) -> Tuple[int, str, str]:
+        """Run a command that can be interrupted from another thread."""
         try:
-            result = subprocess.run(
+            process = subprocess.Popen(
                 full_command,
                 cwd=str(cwd) if cwd else None,
-                capture_output=True,
-                text=True,
-                timeout=timeout
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=True
             )
-            
-            return result.returncode, result.stdout, result.stderr
-        except subprocess.TimeoutExpired:
-            raise ForesterCLIError(f"Command timed out after {timeout} seconds")
         except Exception as e:
             raise ForesterCLIError(f"Failed to execute command: {str(e)}")
+        
+        deadline = time.monotonic() + timeout if timeout else None
+        while True:
+            try:
+                stdout, stderr = process.communicate(timeout=CANCEL_POLL_INTERVAL)
+                return process.returncode, stdout, stderr
+            except subprocess.TimeoutExpired:
+                pass
+            
+            if cancel_event.is_set():
+                process.kill()
+                process.communicate()
+                raise ForesterCLIError("Command cancelled")
+            if deadline is not None and time.monotonic() >= deadline:
+                process.kill()
+                process.communicate()
+                raise ForesterCLIError(f"Command timed out after {timeout} seconds")
     
     def init(self, repo_path: Path) -> Tuple[bool, Optional[str]]:
         """
@@ -138,12 +254,15 @@ class ForesterCLI:
         lines = output.split('\n')
         current_section = None
         
-        for line in lines:
-            line = line.strip()
+        for raw_line in lines:
+            line = raw_line.strip()
             if not line:
                 continue
             
-            if line.startswith("On branch "):
+            if raw_line.startswith("  ") and current_section:
+                # File entry (indented with 2 spaces); checked before stripping
+                status[current_section].append(line)
+            elif line.startswith("On branch "):
                 status["branch"] = line.replace("On branch ", "").strip()
             elif line.startswith("HEAD: "):
                 status["head"] = line.replace("HEAD: ", "").strip()
@@ -157,22 +276,26 @@ class ForesterCLI:
                 current_section = "deleted"
             elif line == "Untracked files:":
                 current_section = "untracked"
-            elif line.startswith("  ") and current_section:
-                # File entry (indented with 2 spaces)
-                file_path = line.strip()
-                if file_path:
-                    status[current_section].append(file_path)
         
         return status
     
-    def log(self, repo_path: Path, branch: Optional[str] = None, limit: int = 100) -> Tuple[bool, Optional[List[Dict[str, Any]]], Optional[str]]:
+    def log(
+        self,
+        repo_path: Path,
+        branch: Optional[str] = None,
+        limit: Optional[int] = 100,
+        since: Optional[int] = None,
+        until: Optional[int] = None
+    ) -> Tuple[bool, Optional[List[Dict[str, Any]]], Optional[str]]:
         """
         Get commit history.
         
         Args:
             repo_path: Path to repository root
             branch: Branch name (optional, defaults to current)
-            limit: Maximum number of commits to return
+            limit: Maximum number of commits to return (None for no limit)
+            since: Only return commits at or after this Unix timestamp
+            until: Only return commits at or before this Unix timestamp
             
         Returns:
             Tuple of (success, commits_list, error_message)
@@ -195,16 +318,38 @@ class ForesterCLI:
                 return True, [], None
             
             # Parse log output
-            commits = self._parse_log_output(stdout)
-            return True, commits[:limit], None
+            commits = self._parse_log_output(stdout, since=since, until=until)
+            if limit is not None:
+                commits = commits[:limit]
+            return True, commits, None
         except ForesterCLIError as e:
             return False, None, str(e)
     
-    def _parse_log_output(self, output: str) -> List[Dict[str, Any]]:
-        """Parse log command output."""
+    def _parse_log_output(
+        self,
+        output: str,
+        since: Optional[int] = None,
+        until: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Parse log command output.
+        
+        Log output is newest first, so parsing stops at the first dated
+        commit older than ``since``.
+        """
         commits = []
         current_commit = None
         
+        def in_range(commit: Dict[str, Any]) -> bool:
+            timestamp = commit["timestamp"]
+            if since is None and until is None:
+                return True
+            if not timestamp:
+                return False
+            if until is not None and timestamp > until:
+                return False
+            return since is None or timestamp >= since
+        
         lines = output.split('\n')
         
         for line in lines:
@@ -213,7 +358,11 @@ class ForesterCLI:
             if line.startswith("commit "):
                 # Save previous commit
                 if current_commit:
-                    commits.append(current_commit)
+                    if since is not None and 0 < current_commit["timestamp"] < since:
+                        current_commit = None
+                        break
+                    if in_range(current_commit):
+                        commits.append(current_commit)
                 
                 # Start new commit
                 commit_hash = line.replace("commit ", "").strip()
@@ -221,6 +370,7 @@ class ForesterCLI:
                     "hash": commit_hash,
                     "author": None,
                     "date": None,
+                    "timestamp": 0,
                     "message": None,
                     "tag": None,
                     "is_head": False
@@ -234,6 +384,7 @@ class ForesterCLI:
             elif line.startswith("Date:   ") and current_commit:
                 date_str = line.replace("Date:   ", "").strip()
                 current_commit["date"] = date_str
+                current_commit["timestamp"] = parse_commit_date(date_str)
             elif line.startswith("Tag:    ") and current_commit:
                 current_commit["tag"] = line.replace("Tag:    ", "").strip()
             elif current_commit and current_commit["message"] is None:
@@ -242,7 +393,7 @@ class ForesterCLI:
                     current_commit["message"] = line.strip()
         
         # Add last commit
-        if current_commit:
+        if current_commit and in_range(current_commit):
             commits.append(current_commit)
         
         return commits
@@ -617,6 +768,7 @@ class ForesterCLI:
             "hash": None,
             "author": None,
             "date": None,
+            "timestamp": 0,
             "message": None,
             "parent": None,
             "tree": None,
@@ -638,6 +790,7 @@ class ForesterCLI:
                 commit_data["author"] = line.replace("Author: ", "").strip()
             elif line.startswith("Date:   "):
                 commit_data["date"] = line.replace("Date:   ", "").strip()
+                commit_data["timestamp"] = parse_commit_date(commit_data["date"])
             elif line.startswith("Parent: "):
                 commit_data["parent"] = line.replace("Parent: ", "").strip()
             elif line.startswith("Tree: "):
@@ -657,7 +810,14 @@ class ForesterCLI:
         
         return commit_data
     
-    def gc(self, repo_path: Path, dry_run: bool = False, reflog_expire_days: int = 90) -> Tuple[bool, Optional[Dict[str, Any]], Optional[str]]:
+    def gc(
+        self,
+        repo_path: Path,
+        dry_run: bool = False,
+        reflog_expire_days: int = 90,
+        timeout: int = 300,
+        cancel_event: Optional[threading.Event] = None
+    ) -> Tuple[bool, Optional[Dict[str, Any]], Optional[str]]:
         """
         Run garbage collection.
         
@@ -665,6 +825,8 @@ class ForesterCLI:
             repo_path: Path to repository root
             dry_run: If True, only show what would be deleted without actually deleting
             reflog_expire_days: Number of days to keep commits in reflog before deletion
+            timeout: Timeout in seconds
+            cancel_event: Event that interrupts GC when set (for background runs)
             
         Returns:
             Tuple of (success, stats, error_message)
@@ -680,7 +842,8 @@ class ForesterCLI:
             exit_code, stdout, stderr = self._execute_command(
                 command,
                 cwd=repo_path,
-                timeout=300  # GC can take a while
+                timeout=timeout,  # GC can take a while
+                cancel_event=cancel_event
             )
             
             if exit_code != 0:
@@ -987,6 +1150,135 @@ class ForesterCLI:
         except ForesterCLIError as e:
             return False, str(e)
     
+    def lock_files(
+        self,
+        repo_path: Path,
+        file_paths: List[str],
+        exclusive: bool = True,
+        expire_hours: Optional[int] = None
+    ) -> Dict[str, Tuple[bool, Optional[str]]]:
+        """
+        Lock several files with a single forester invocation.
+        
+        Args:
+            repo_path: Path to repository root
+            file_paths: Paths to files to lock (relative to repo root)
+            exclusive: If True, exclusive lock; if False, shared lock
+            expire_hours: Optional expiration time in hours
+            
+        Returns:
+            Dict {file_path: (success, error_message)} for every requested path
+        """
+        options = ["--exclusive" if exclusive else "--shared"]
+        if expire_hours and expire_hours > 0:
+            options.extend(["--expire", str(expire_hours)])
+        
+        return self._run_batch_lock(
+            repo_path,
+            file_paths,
+            ["lock"],
+            options,
+            expect_locked=True,
+            single=lambda path: self.lock_file(repo_path, path, exclusive=exclusive, expire_hours=expire_hours)
+        )
+    
+    def unlock_files(self, repo_path: Path, file_paths: List[str]) -> Dict[str, Tuple[bool, Optional[str]]]:
+        """
+        Unlock several files with a single forester invocation.
+        
+        Args:
+            repo_path: Path to repository root
+            file_paths: Paths to files to unlock (relative to repo root)
+            
+        Returns:
+            Dict {file_path: (success, error_message)} for every requested path
+        """
+        return self._run_batch_lock(
+            repo_path,
+            file_paths,
+            ["lock", "unlock"],
+            [],
+            expect_locked=False,
+            single=lambda path: self.unlock_file(repo_path, path)
+        )
+    
+    def _run_batch_lock(
+        self,
+        repo_path: Path,
+        file_paths: List[str],
+        prefix: List[str],
+        options: List[str],
+        expect_locked: bool,
+        single
+    ) -> Dict[str, Tuple[bool, Optional[str]]]:
+        """
+        Run a lock/unlock command for many paths and derive per-path results.
+        
+        A successful batch costs one call. When it fails, paths named in
+        the error output are reported with that line, and the locks are
+        listed once to settle the remaining paths: forester names every path
+        it refused (e.g. locked by someone else), so a path it did not name
+        counts as locked if the listing shows a lock on it, and as unlocked
+        if it shows none. Builds of forester that accept only one path per
+        call fall back to one invocation per path.
+        """
+        paths = list(dict.fromkeys(p for p in file_paths if p))
+        if not paths:
+            return {}
+        if len(paths) == 1:
+            return {paths[0]: single(paths[0])}
+        
+        try:
+            exit_code, stdout, stderr = self._execute_command(
+                prefix + paths + options,
+                cwd=repo_path,
+                timeout=max(30, len(paths))
+            )
+        except ForesterCLIError as e:
+            return {path: (False, str(e)) for path in paths}
+        
+        if exit_code == 0:
+            return {path: (True, None) for path in paths}
+        
+        output = f"{stderr}\n{stdout}"
+        lowered = output.lower()
+        if any(marker in lowered for marker in ("accepts 1 arg", "too many arguments", "unexpected argument")):
+            logger.debug("forester does not accept multiple lock paths, locking one by one")
+            return {path: single(path) for path in paths}
+        
+        results: Dict[str, Tuple[bool, Optional[str]]] = {}
+        lines = [line.strip() for line in output.split('\n') if line.strip()]
+        for path in paths:
+            # The path must appear as a whole token ("a.png" is not "a.png.bak")
+            pattern = re.compile(r"(?<![\w./\\-])" + re.escape(path) + r"(?![\w./\\-])")
+            for line in lines:
+                if pattern.search(line):
+                    results[path] = (False, line)
+                    break
+        
+        remaining = [path for path in paths if path not in results]
+        if remaining:
+            success, locks, error_msg = self.list_locks(repo_path)
+            batch_error = stderr.strip() or stdout.strip() or "Unknown error"
+            if not success:
+                fallback = error_msg or batch_error
+                for path in remaining:
+                    results[path] = (False, fallback)
+            else:
+                after = self._locks_by_path(locks)
+                for path in remaining:
+                    if (Path(path).as_posix() in after) == expect_locked:
+                        results[path] = (True, None)
+                    else:
+                        results[path] = (False, batch_error)
+        
+        return results
+    
+    @staticmethod
+    def _locks_by_path(locks: Optional[List[Dict[str, Any]]]) -> Dict[str, Dict[str, Any]]:
+        """Index ``list_locks`` results by POSIX path."""
+        return {Path(lock.get('file_path', '')).as_posix(): lock for lock in (locks or []) if lock.get('file_path')}
+    
     def add(self, repo_path: Path, files: Optional[List[str]] = None) -> Tuple[bool, Optional[str]]:
         """
         Add files to staging area.
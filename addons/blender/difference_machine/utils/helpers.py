@@ -155,6 +155,68 @@ def get_repository_path() -> Tuple[Optional[Path], Optional[str]]:
     return repo_path, None
 
 
+def get_repository_busy_reason() -> Optional[str]:
+    """
+    Check whether a background forester run (GC or commit) is changing the repository.
+
+    Operators that modify the repository (commit, checkout, branches,
+    stashes, deleting commits) or refresh its state must not start while
+    one is in progress.
+
+    Returns:
+        Message to report, or None if the repository is free
+    """
+    from .background_gc import get_background_gc
+    from .commit_pipeline import get_commit_pipeline
+    if get_background_gc().is_running:
+        return "Garbage collection is running in background; wait for it or cancel it in Preferences"
+    if get_commit_pipeline().is_running:
+        return "A commit is in progress; wait for it to finish"
+    return None
+
+
+def get_head_commit(context) -> str:
+    """
+    Get HEAD commit hash without running forester.
+    
+    Uses the loaded commit history, or the commit recorded by the last
+    project commit/checkout.
+    
+    Returns:
+        Commit hash, or empty string if unknown
+    """
+    for commit in getattr(context.scene, 'df_commits_all', []):
+        if commit.is_head:
+            return commit.hash
+    from .dirty_tracker import get_dirty_tracker
+    return get_dirty_tracker().commit_hash
+
+
+def _tag_view3d_redraw() -> None:
+    """Timer callback: tag all 3D view areas for redraw."""
+    try:
+        for window in bpy.context.window_manager.windows:
+            for area in window.screen.areas:
+                if area.type == 'VIEW_3D':
+                    area.tag_redraw()
+    except (AttributeError, RuntimeError, ReferenceError):
+        pass
+    return None
+
+
+def request_view3d_redraw() -> None:
+    """
+    Schedule a redraw of the sidebar panels on the main thread.
+    
+    Safe to call from worker threads after background work finishes.
+    """
+    try:
+        if not bpy.app.timers.is_registered(_tag_view3d_redraw):
+            bpy.app.timers.register(_tag_view3d_redraw, first_interval=0.0)
+    except (AttributeError, ValueError):
+        pass
+
+
 def get_addon_preferences(context) -> Any:
     """
     Get addon preferences with fallback to default values.
@@ -181,12 +243,16 @@ def get_addon_preferences(context) -> Any:
     # Fallback: return a simple object with default values
     class DefaultPreferences:
         default_author = "Unknown"
+        capture_thumbnails = True
+        prefetch_budget_mb = 512
+        log_level = 'INFO'
         reflog_expire_days = 90
         gc_schedule_enabled = False
         gc_schedule_hour = 2
         gc_schedule_minute = 0
         gc_schedule_interval_days = 7
         gc_last_run = 0.0
+        show_perf_stats = False
     
     return DefaultPreferences()
 
@@ -206,20 +272,10 @@ def get_blender_files() -> List[Path]:
         if blend_path.exists():
             files.append(blend_path)
     
-    # 2. Все текстуры из bpy.data.images
-    for image in bpy.data.images:
-        # Пропускаем упакованные текстуры (они внутри .blend)
-        if image.packed_file:
-            continue
-            
-        if image.filepath:
-            try:
-                # Получаем абсолютный путь
-                abs_path = Path(bpy.path.abspath(image.filepath))
-                if abs_path.exists() and abs_path.is_file():
-                    files.append(abs_path)
-            except Exception as e:
-                logger.debug(f"Failed to resolve texture path {image.filepath}: {e}")
+    # 2. Все внешние текстуры (пути берутся из кэша без повторного abspath,
+    # существование файлов проверяется заново)
+    from .image_paths import get_image_path_cache
+    files.extend(get_image_path_cache().get_external_files(refresh_signatures=True))
     
     return files
 
@@ -250,38 +306,59 @@ def check_locked_files(repo_path: Path) -> Dict[Path, Dict[str, Any]]:
         if not success or not locks:
             return {}
         
-        # Создаем словарь заблокированных путей для быстрой проверки
-        # Нормализуем пути для сравнения
-        locked_paths = {}
-        for lock in locks:
-            try:
-                # Путь в блокировке может быть относительным от корня репозитория
-                lock_file_path = lock.get('file_path', '')
-                if not lock_file_path:
-                    continue
-                
-                # Пробуем разрешить как относительный путь от репозитория
-                try:
-                    lock_path = (repo_path / lock_file_path).resolve()
-                except Exception:
-                    # Если не получается, пробуем как абсолютный путь
-                    lock_path = Path(lock_file_path).resolve()
-                
-                locked_paths[lock_path] = lock
-            except Exception as e:
-                logger.debug(f"Failed to resolve lock path {lock.get('file_path')}: {e}")
-        
-        # Проверяем каждый файл Blender
-        result = {}
-        for file_path in blender_files:
-            try:
-                resolved = file_path.resolve()
-                if resolved in locked_paths:
-                    result[file_path] = locked_paths[resolved]
-            except Exception as e:
-                logger.debug(f"Failed to resolve file path {file_path}: {e}")
-        
-        return result
+        return match_locked_files(repo_path, locks, blender_files)
     except Exception as e:
         logger.error(f"Error checking locked files: {e}", exc_info=True)
         return {}
+
+
+def match_locked_files(
+    repo_path: Path,
+    locks: List[Dict[str, Any]],
+    file_paths: List[Path]
+) -> Dict[Path, Dict[str, Any]]:
+    """
+    Сопоставить блокировки из forester с файлами Blender.
+    
+    Не обращается к bpy, поэтому может вызываться из фонового потока.
+    
+    Args:
+        repo_path: Путь к репозиторию
+        locks: Результат cli.list_locks
+        file_paths: Файлы для проверки
+        
+    Returns:
+        Словарь {file_path: lock_info} для заблокированных файлов
+    """
+    # Создаем словарь заблокированных путей для быстрой проверки
+    # Нормализуем пути для сравнения
+    locked_paths = {}
+    for lock in locks:
+        try:
+            # Путь в блокировке может быть относительным от корня репозитория
+            lock_file_path = lock.get('file_path', '')
+            if not lock_file_path:
+                continue
+            
+            # Пробуем разрешить как относительный путь от репозитория
+            try:
+                lock_path = (repo_path / lock_file_path).resolve()
+            except Exception:
+                # Если не получается, пробуем как абсолютный путь
+                lock_path = Path(lock_file_path).resolve()
+            
+            locked_paths[lock_path] = lock
+        except Exception as e:
+            logger.debug(f"Failed to resolve lock path {lock.get('file_path')}: {e}")
+    
+    # Проверяем каждый файл Blender
+    result = {}
+    for file_path in file_paths:
+        try:
+            resolved = file_path.resolve()
+            if resolved in locked_paths:
+                result[file_path] = locked_paths[resolved]
+        except Exception as e:
+            logger.debug(f"Failed to resolve file path {file_path}: {e}")
+    
+    return result
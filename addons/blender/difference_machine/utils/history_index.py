@@ -0,0 +1,218 @@
+"""
+Time index over commit history for Difference Machine addon.
+
+Keeps the parsed log of each branch sorted by timestamp so that time-range
+views ("last 2 weeks") are answered with a binary search instead of
+re-running and re-scanning ``forester log``.
+"""
+
+import os
+import time
+from bisect import bisect_left, bisect_right
+from pathlib import Path
+from typing import Optional, Tuple, List, Dict, Any
+
+# Seconds covered by each history range preset
+SECONDS_PER_DAY: int = 86400
+HISTORY_RANGE_SECONDS: Dict[str, int] = {
+    'DAY': SECONDS_PER_DAY,
+    'WEEK': 7 * SECONDS_PER_DAY,
+    'TWO_WEEKS': 14 * SECONDS_PER_DAY,
+    'MONTH': 30 * SECONDS_PER_DAY,
+    'YEAR': 365 * SECONDS_PER_DAY,
+}
+
+# HEAD ref relative to repository root ("ref: refs/heads/<branch>", or a commit hash when detached)
+HEAD_REF_FILE: str = os.path.join(".DFM", "HEAD")
+
+# HEAD file path -> (stat signature, branch name)
+_head_branch_cache: Dict[str, Tuple[Tuple[int, int, int], Optional[str]]] = {}
+
+
+def get_history_range_bounds(
+    range_id: str,
+    since_days: int = 0,
+    until_days: int = 0,
+    now: Optional[float] = None
+) -> Tuple[Optional[int], Optional[int]]:
+    """
+    Convert a history range preset into (since, until) timestamps.
+
+    Args:
+        range_id: 'ALL', 'CUSTOM' or a key of HISTORY_RANGE_SECONDS
+        since_days: Start of custom range, in days ago
+        until_days: End of custom range, in days ago (0 = now)
+        now: Reference time (defaults to current time)
+
+    Returns:
+        Tuple of (since, until); None means unbounded
+    """
+    if now is None:
+        now = time.time()
+
+    if range_id == 'CUSTOM':
+        since = int(now - since_days * SECONDS_PER_DAY) if since_days > 0 else None
+        until = int(now - until_days * SECONDS_PER_DAY) if until_days > 0 else None
+        return since, until
+
+    seconds = HISTORY_RANGE_SECONDS.get(range_id)
+    if seconds is None:
+        return None, None
+    return int(now - seconds), None
+
+
+def read_head_branch(repo_path: Path) -> Optional[str]:
+    """
+    Read the current branch from the ``.DFM/HEAD`` ref without running forester.
+
+    The file is parsed again only when its stat signature changes, so this
+    is cheap enough for panel redraws and notices branch switches made
+    outside Blender (which the index only learns on the next refresh).
+
+    Args:
+        repo_path: Repository root
+
+    Returns:
+        Branch name, or None if HEAD is missing, detached or unreadable
+    """
+    head_path = Path(repo_path) / HEAD_REF_FILE
+    try:
+        st = os.stat(head_path)
+    except OSError:
+        return None
+    signature = (st.st_size, st.st_mtime_ns, st.st_ino)
+    cached = _head_branch_cache.get(str(head_path))
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+
+    branch = None
+    try:
+        with open(head_path, 'r', encoding='utf-8') as f:
+            content = f.read().strip()
+        ref = content[len("ref:"):].strip() if content.startswith("ref:") else content
+        if ref.startswith("refs/heads/"):
+            branch = ref[len("refs/heads/"):] or None
+    except (OSError, UnicodeDecodeError):
+        pass
+    _head_branch_cache[str(head_path)] = (signature, branch)
+    return branch
+
+
+class _BranchHistory:
+    """Commits of one branch, sorted by ascending timestamp."""
+
+    def __init__(self, commits: List[Dict[str, Any]], covered_since: Optional[int]):
+        dated = [c for c in commits if c.get("timestamp")]
+        dated.sort(key=lambda c: c["timestamp"])
+        self.timestamps: List[int] = [c["timestamp"] for c in dated]
+        self.commits: List[Dict[str, Any]] = dated
+        # Commits whose date could not be parsed only show up in unbounded views
+        self.undated: List[Dict[str, Any]] = [c for c in commits if not c.get("timestamp")]
+        # Log order (newest first) for unbounded views
+        self.ordered: List[Dict[str, Any]] = list(commits)
+        self.covered_since = covered_since
+
+
+class HistoryIndex:
+    """Per-branch sorted timestamp index of commit history."""
+
+    def __init__(self):
+        self._branches: Dict[Tuple[str, str], _BranchHistory] = {}
+        self._current_branch: Dict[str, str] = {}
+
+    @staticmethod
+    def _key(repo_path: Path, branch: Optional[str]) -> Tuple[str, str]:
+        return str(Path(repo_path)), branch or ""
+
+    def build(
+        self,
+        repo_path: Path,
+        branch: Optional[str],
+        commits: List[Dict[str, Any]],
+        covered_since: Optional[int] = None
+    ) -> None:
+        """
+        Store parsed log output for a branch.
+
+        Args:
+            repo_path: Path to repository root
+            branch: Branch name the log belongs to
+            commits: Commits in log order (newest first), each with a timestamp
+            covered_since: Lower bound the log was fetched with (None = full history)
+        """
+        key = self._key(repo_path, branch)
+        self._branches[key] = _BranchHistory(commits, covered_since)
+        self._current_branch[key[0]] = key[1]
+
+    def current_branch(self, repo_path: Path) -> Optional[str]:
+        """Return the branch most recently indexed for a repository."""
+        return self._current_branch.get(str(Path(repo_path)))
+
+    def covers(self, repo_path: Path, branch: Optional[str], since: Optional[int]) -> bool:
+        """Check whether the index can answer a query starting at ``since``."""
+        history = self._branches.get(self._key(repo_path, branch))
+        if history is None:
+            return False
+        if history.covered_since is None:
+            return True
+        return since is not None and since >= history.covered_since
+
+    def query(
+        self,
+        repo_path: Path,
+        branch: Optional[str],
+        since: Optional[int] = None,
+        until: Optional[int] = None,
+        limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Return commits within [since, until], newest first.
+
+        Args:
+            repo_path: Path to repository root
+            branch: Branch name
+            since: Lower bound timestamp (inclusive), None for unbounded
+            until: Upper bound timestamp (inclusive), None for unbounded
+            limit: Maximum number of commits to return
+
+        Returns:
+            List of commit dicts
+        """
+        history = self._branches.get(self._key(repo_path, branch))
+        if history is None:
+            return []
+
+        if since is None and until is None:
+            result = history.ordered
+        else:
+            lo = bisect_left(history.timestamps, since) if since is not None else 0
+            hi = bisect_right(history.timestamps, until) if until is not None else len(history.timestamps)
+            result = history.commits[lo:hi][::-1]
+
+        if limit is not None:
+            result = result[:limit]
+        return result
+
+    def invalidate(self, repo_path: Optional[Path] = None) -> None:
+        """Forget indexed history for one repository (or all)."""
+        if repo_path is None:
+            self._branches.clear()
+            self._current_branch.clear()
+            return
+
+        repo_key = str(Path(repo_path))
+        for key in [k for k in self._branches if k[0] == repo_key]:
+            del self._branches[key]
+        self._current_branch.pop(repo_key, None)
+
+
+# Global index instance
+_index_instance: Optional[HistoryIndex] = None
+
+
+def get_history_index() -> HistoryIndex:
+    """Get global history index instance."""
+    global _index_instance
+    if _index_instance is None:
+        _index_instance = HistoryIndex()
+    return _index_instance
@@ -0,0 +1,172 @@
+"""
+Cache of resolved external image paths for Difference Machine addon.
+
+Maps every image datablock to its absolute file path and a stat signature
+(size, mtime). The map is rebuilt lazily: depsgraph and load_post handlers
+only mark it dirty, and unchanged images are never re-resolved.
+
+Files can be created, changed or deleted outside Blender without any
+datablock change, so callers that act on the files (locking and lock
+checks) pass ``refresh_signatures=True`` to re-stat them.
+"""
+
+import os
+from pathlib import Path
+from typing import Optional, Tuple, Dict, List
+import bpy
+from bpy.app.handlers import persistent
+from .logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# (size in bytes, modification time in ns) of a file on disk
+StatSignature = Tuple[int, int]
+
+
+def get_stat_signature(path: Path) -> Optional[StatSignature]:
+    """
+    Return (size, mtime_ns) of a file, or None if it does not exist.
+
+    Args:
+        path: File path
+
+    Returns:
+        Stat signature or None
+    """
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_size, st.st_mtime_ns
+
+
+class ImagePathEntry:
+    """Resolved path of one image datablock."""
+
+    __slots__ = ("raw_filepath", "library", "abs_path", "signature")
+
+    def __init__(self, raw_filepath: str, library: str, abs_path: Optional[Path], signature: Optional[StatSignature]):
+        self.raw_filepath = raw_filepath
+        self.library = library
+        self.abs_path = abs_path
+        self.signature = signature
+
+
+class ImagePathCache:
+    """Image datablock -> resolved absolute path and stat signature."""
+
+    def __init__(self):
+        self._entries: Dict[str, ImagePathEntry] = {}
+        self._dirty: bool = True
+
+    def mark_dirty(self) -> None:
+        """Request a rescan of bpy.data.images on next access."""
+        self._dirty = True
+
+    def clear(self) -> None:
+        """Forget all entries (e.g. after a new file was loaded)."""
+        self._entries.clear()
+        self._dirty = True
+
+    def _ensure_current(self) -> None:
+        # Adding an image from Python does not always produce a depsgraph
+        # update, so a changed datablock count also triggers a rescan
+        if not self._dirty and len(bpy.data.images) == len(self._entries):
+            return
+
+        entries = {}
+        for image in bpy.data.images:
+            key = image.name_full
+            raw = "" if image.packed_file else image.filepath
+            library = image.library.filepath if image.library else ""
+
+            entry = self._entries.get(key)
+            if entry is None or entry.raw_filepath != raw or entry.library != library:
+                abs_path = None
+                signature = None
+                if raw:
+                    try:
+                        abs_path = Path(bpy.path.abspath(raw, library=image.library))
+                        signature = get_stat_signature(abs_path)
+                    except (ValueError, RuntimeError) as e:
+                        logger.debug(f"Failed to resolve texture path {raw}: {e}")
+                entry = ImagePathEntry(raw, library, abs_path, signature)
+            entries[key] = entry
+
+        self._entries = entries
+        self._dirty = False
+
+    def get_external_files(self, refresh_signatures: bool = False) -> List[Path]:
+        """
+        Return absolute paths of non-packed images that exist on disk.
+
+        Args:
+            refresh_signatures: Re-stat every file instead of trusting the cache
+
+        Returns:
+            List of unique file paths
+        """
+        self._ensure_current()
+
+        result = []
+        seen = set()
+        for entry in self._entries.values():
+            if entry.abs_path is None:
+                continue
+            if refresh_signatures:
+                entry.signature = get_stat_signature(entry.abs_path)
+            if entry.signature is None or entry.abs_path in seen:
+                continue
+            seen.add(entry.abs_path)
+            result.append(entry.abs_path)
+        return result
+
+    def get_entry(self, image_name: str) -> Optional[ImagePathEntry]:
+        """Return the cached entry for an image datablock (by ``name_full``)."""
+        self._ensure_current()
+        return self._entries.get(image_name)
+
+
+# Global cache instance
+_cache_instance: Optional[ImagePathCache] = None
+
+
+def get_image_path_cache() -> ImagePathCache:
+    """Get global image path cache instance."""
+    global _cache_instance
+    if _cache_instance is None:
+        _cache_instance = ImagePathCache()
+    return _cache_instance
+
+
+@persistent
+def _on_depsgraph_update_post(scene, depsgraph):
+    """Mark the cache dirty when image datablocks change."""
+    try:
+        if depsgraph.id_type_updated('IMAGE'):
+            get_image_path_cache().mark_dirty()
+    except (AttributeError, ReferenceError):
+        get_image_path_cache().mark_dirty()
+
+
+@persistent
+def _on_load_post(*args):
+    """Drop all entries when a different file is loaded."""
+    get_image_path_cache().clear()
+
+
+def register():
+    """Register handlers that keep the image path cache current."""
+    if _on_depsgraph_update_post not in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.append(_on_depsgraph_update_post)
+    if _on_load_post not in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.append(_on_load_post)
+
+
+def unregister():
+    """Unregister image path cache handlers."""
+    if _on_depsgraph_update_post in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.remove(_on_depsgraph_update_post)
+    if _on_load_post in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.remove(_on_load_post)
+    get_image_path_cache().clear()
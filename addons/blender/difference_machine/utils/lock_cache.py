@@ -0,0 +1,191 @@
+"""
+Lock state cache for Difference Machine addon.
+
+The Locks panel must not run ``forester lock list`` from ``draw()``. Lock
+state is instead kept in memory and refreshed in the background: a one-shot
+timer snapshots the file list on the main thread, and a worker thread runs
+the CLI and matches locks against the snapshot.
+"""
+
+import threading
+import time
+from pathlib import Path
+from typing import Optional, Dict, Any, List
+import bpy
+from .forester_cli import get_cli
+from .helpers import match_locked_files, request_view3d_redraw
+from .image_paths import get_image_path_cache
+from .logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Seconds before cached lock state is considered stale
+LOCK_CACHE_TTL: float = 30.0
+
+
+class _LockState:
+    """Lock state of one repository."""
+
+    def __init__(self):
+        self.locked_files: Dict[Path, Dict[str, Any]] = {}
+        self.fetched_at: float = 0.0
+        self.loaded: bool = False
+        self.refreshing: bool = False
+        self.error: Optional[str] = None
+        # Bumped when locks change (lock/unlock); results of older refreshes are dropped
+        self.generation: int = 0
+
+
+class LockStateCache:
+    """In-memory, background-refreshed lock state per repository."""
+
+    def __init__(self, ttl: float = LOCK_CACHE_TTL):
+        self.ttl = ttl
+        self._states: Dict[str, _LockState] = {}
+        self._pending: List[Path] = []
+        self._lock = threading.Lock()
+
+    def _state(self, repo_path: Path) -> _LockState:
+        key = str(Path(repo_path))
+        state = self._states.get(key)
+        if state is None:
+            state = _LockState()
+            self._states[key] = state
+        return state
+
+    def get(self, repo_path: Path) -> Optional[Dict[Path, Dict[str, Any]]]:
+        """
+        Return cached locked files; never blocks or spawns processes.
+
+        Stale state schedules a background refresh.
+
+        Args:
+            repo_path: Path to repository root
+
+        Returns:
+            Dict {file_path: lock_info}, or None if nothing is loaded yet
+        """
+        with self._lock:
+            state = self._state(repo_path)
+            stale = time.monotonic() - state.fetched_at > self.ttl
+            result = dict(state.locked_files) if state.loaded else None
+
+        if stale:
+            self.request_refresh(repo_path)
+        return result
+
+    def store(self, repo_path: Path, locked_files: Dict[Path, Dict[str, Any]]) -> None:
+        """Store lock state that was computed synchronously."""
+        with self._lock:
+            state = self._state(repo_path)
+            state.locked_files = dict(locked_files)
+            state.fetched_at = time.monotonic()
+            state.loaded = True
+            state.error = None
+            state.generation += 1
+
+    def invalidate(self, repo_path: Path) -> None:
+        """
+        Mark lock state stale (after lock/unlock) and refresh it right away.
+
+        A refresh already running may have listed the locks before the
+        change; its result is dropped and the refresh runs again.
+        """
+        with self._lock:
+            state = self._state(repo_path)
+            state.fetched_at = 0.0
+            state.generation += 1
+        self.request_refresh(repo_path)
+
+    def request_refresh(self, repo_path: Path) -> None:
+        """Schedule a background refresh of lock state."""
+        with self._lock:
+            state = self._state(repo_path)
+            if state.refreshing:
+                return
+            state.refreshing = True
+            self._pending.append(Path(repo_path))
+
+        try:
+            if not bpy.app.timers.is_registered(_start_pending_refreshes):
+                bpy.app.timers.register(_start_pending_refreshes, first_interval=0.0)
+        except (AttributeError, ValueError) as e:
+            logger.debug(f"Failed to schedule lock refresh: {e}")
+            with self._lock:
+                state.refreshing = False
+
+    def _take_pending(self) -> List[Path]:
+        with self._lock:
+            pending, self._pending = self._pending, []
+        return pending
+
+    def _refresh_worker(self, repo_path: Path, file_paths: List[Path]) -> None:
+        with self._lock:
+            generation = self._state(repo_path).generation
+        locked_files: Dict[Path, Dict[str, Any]] = {}
+        error = None
+        try:
+            existing = [p for p in file_paths if p.is_file()]
+            if existing:
+                success, locks, error = get_cli().list_locks(repo_path)
+                if success and locks:
+                    locked_files = match_locked_files(repo_path, locks, existing)
+        except Exception as e:
+            error = str(e)
+            logger.warning(f"Unexpected error refreshing locks: {e}")
+
+        with self._lock:
+            state = self._state(repo_path)
+            state.refreshing = False
+            outdated = state.generation != generation
+            if not outdated:
+                if error is None or not state.loaded:
+                    state.locked_files = locked_files
+                    state.loaded = True
+                state.error = error
+                state.fetched_at = time.monotonic()
+
+        if outdated:
+            logger.debug("Lock state changed while refreshing; refreshing again")
+            self.request_refresh(repo_path)
+            return
+        request_view3d_redraw()
+
+
+def _snapshot_blender_files() -> List[Path]:
+    """Collect .blend and external image paths (main thread only)."""
+    files = []
+    if bpy.data.filepath:
+        files.append(Path(bpy.data.filepath))
+    files.extend(get_image_path_cache().get_external_files(refresh_signatures=True))
+    return files
+
+
+def _start_pending_refreshes():
+    """Timer callback: snapshot files on the main thread and start workers."""
+    cache = get_lock_cache()
+    pending = cache._take_pending()
+    if not pending:
+        return None
+
+    file_paths = _snapshot_blender_files()
+    for repo_path in pending:
+        threading.Thread(
+            target=cache._refresh_worker,
+            args=(repo_path, file_paths),
+            name="dfm-lock-refresh",
+            daemon=True
+        ).start()
+    return None
+
+
+# Global cache instance
+_cache_instance: Optional[LockStateCache] = None
+
+
+def get_lock_cache() -> LockStateCache:
+    """Get global lock state cache instance."""
+    global _cache_instance
+    if _cache_instance is None:
+        _cache_instance = LockStateCache()
+    return _cache_instance
@@ -1,70 +1,132 @@
 """
 Logging configuration for Difference Machine add-on.
+
+Records are handed to a QueueHandler and written by a QueueListener thread,
+so logging never blocks the UI on console or disk I/O. The log file is
+rotated to keep it bounded.
 """
 
+import atexit
 import logging
+import logging.handlers
+import queue
 import sys
 from pathlib import Path
 from typing import Optional
 
+# Log file rotation settings
+LOG_FILE_MAX_BYTES: int = 5 * 1024 * 1024
+LOG_FILE_BACKUP_COUNT: int = 3
+
+# Level names accepted by set_log_level (matches preferences enum)
+LOG_LEVELS = {
+    'DEBUG': logging.DEBUG,
+    'INFO': logging.INFO,
+    'WARNING': logging.WARNING,
+    'ERROR': logging.ERROR,
+}
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
 
 def setup_logging(log_level: int = logging.INFO, log_file: Optional[Path] = None) -> None:
     """
     Setup logging configuration for the add-on.
-    
+
     Args:
         log_level: Logging level (default: INFO)
-        log_file: Optional path to log file
+        log_file: Optional path to log file (rotated)
     """
+    global _listener
+
     # Create logger
     logger = logging.getLogger('difference_machine')
     logger.setLevel(log_level)
-    
+
     # Remove existing handlers to avoid duplicates
+    shutdown_logging()
     logger.handlers.clear()
-    
+
     # Create formatter
     formatter = logging.Formatter(
         '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
         datefmt='%Y-%m-%d %H:%M:%S'
     )
-    
+
     # Console handler
+    handlers = []
     console_handler = logging.StreamHandler(sys.stdout)
-    console_handler.setLevel(log_level)
     console_handler.setFormatter(formatter)
-    logger.addHandler(console_handler)
-    
+    handlers.append(console_handler)
+
     # File handler (if specified)
     if log_file:
-        log_file.parent.mkdir(parents=True, exist_ok=True)
-        file_handler = logging.FileHandler(log_file, encoding='utf-8')
-        file_handler.setLevel(log_level)
-        file_handler.setFormatter(formatter)
-        logger.addHandler(file_handler)
-    
+        try:
+            log_file.parent.mkdir(parents=True, exist_ok=True)
+            file_handler = logging.handlers.RotatingFileHandler(
+                log_file,
+                maxBytes=LOG_FILE_MAX_BYTES,
+                backupCount=LOG_FILE_BACKUP_COUNT,
+                encoding='utf-8'
+            )
+            file_handler.setFormatter(formatter)
+            handlers.append(file_handler)
+        except OSError as e:
+            print(f"Difference Machine: cannot open log file {log_file}: {e}", file=sys.stderr)
+
+    # Level filtering happens on the logger, so disabled records are never
+    # formatted or queued; handlers write everything they receive
+    log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=False)
+    _listener.start()
+
     # Prevent propagation to root logger
     logger.propagate = False
 
 
+def set_log_level(level) -> None:
+    """
+    Change the add-on log level at runtime.
+
+    Args:
+        level: Logging level as int or name ('DEBUG', 'INFO', ...)
+    """
+    if isinstance(level, str):
+        level = LOG_LEVELS.get(level.upper(), logging.INFO)
+    logging.getLogger('difference_machine').setLevel(level)
+
+
+def shutdown_logging() -> None:
+    """Stop the listener thread, flushing queued records."""
+    global _listener
+    if _listener is not None:
+        try:
+            _listener.stop()
+        except Exception:
+            pass
+        for handler in _listener.handlers:
+            try:
+                handler.close()
+            except Exception:
+                pass
+        _listener = None
+
+
+atexit.register(shutdown_logging)
+
+
 def get_logger(name: str) -> logging.Logger:
     """
     Get a logger instance for a module.
-    
+
+    Handlers are installed by setup_logging(), which the add-on calls from
+    register(); getting a logger at import time costs nothing.
+
     Args:
         name: Module name (usually __name__)
-        
+
     Returns:
         Logger instance
     """
-    # Ensure main logger exists
-    main_logger = logging.getLogger('difference_machine')
-    if not main_logger.handlers:
-        setup_logging()
-    
-    # Return module-specific logger
     return logging.getLogger(f'difference_machine.{name}')
-
-
-
-
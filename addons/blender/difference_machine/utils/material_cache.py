@@ -0,0 +1,171 @@
+"""
+Material export cache for Difference Machine addon.
+
+Exporting a material walks every node, socket default value, color ramp and
+curve of its node tree. Many objects usually share a few materials, so the
+exported JSON is cached per material and reused until the material changes.
+
+Entries are keyed by ``Material.name_full`` and a per-material revision
+counter that the depsgraph handler bumps. Edits of a material's own node
+tree bump that material; node group and image edits bump a global epoch
+instead (a node group can be used by any material). Texture files referenced
+by a material are re-stat'ed on every hit, so a texture changed on disk is
+hashed again.
+"""
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Optional, Dict, Any, Callable, Tuple, List
+import bpy
+from bpy.app.handlers import persistent
+from .image_paths import get_stat_signature, StatSignature
+from .logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+class MaterialExportEntry:
+    """Serialized export of one material."""
+
+    __slots__ = ("revision", "epoch", "serialized", "material_hash", "texture_signatures")
+
+    def __init__(self, revision: int, epoch: int, serialized: str, material_hash: str,
+                 texture_signatures: List[Tuple[str, Optional[StatSignature]]]):
+        self.revision = revision
+        self.epoch = epoch
+        self.serialized = serialized
+        self.material_hash = material_hash
+        self.texture_signatures = texture_signatures
+
+
+def _texture_signatures(material_json: Dict[str, Any]) -> List[Tuple[str, Optional[StatSignature]]]:
+    signatures = []
+    for texture in material_json.get('textures') or []:
+        path = texture.get('original_path')
+        if path:
+            signatures.append((path, get_stat_signature(Path(path))))
+    return signatures
+
+
+class MaterialExportCache:
+    """Material name -> serialized export, invalidated by depsgraph updates."""
+
+    def __init__(self):
+        self._entries: Dict[str, MaterialExportEntry] = {}
+        self._revisions: Dict[str, int] = {}
+        # Pointer of an embedded node tree -> owning material name
+        self._tree_owners: Dict[int, str] = {}
+        self._epoch: int = 0
+        self.hits: int = 0
+        self.misses: int = 0
+
+    def bump(self, material_name: str) -> None:
+        """Mark one material as changed."""
+        self._revisions[material_name] = self._revisions.get(material_name, 0) + 1
+
+    def bump_node_tree(self, node_tree) -> None:
+        """Mark the owner of a changed node tree as changed."""
+        owner = self._tree_owners.get(node_tree.as_pointer())
+        if owner is not None:
+            self.bump(owner)
+        elif not node_tree.is_embedded_data:
+            # Node group: may be used by any material
+            self.bump_all()
+
+    def bump_all(self) -> None:
+        """Mark every material as changed (node group or image edits)."""
+        self._epoch += 1
+
+    def clear(self) -> None:
+        """Drop all entries (e.g. after a new file was loaded)."""
+        self._entries.clear()
+        self._revisions.clear()
+        self._tree_owners.clear()
+        self._epoch += 1
+
+    def export(self, material, exporter: Callable[[Any], Dict[str, Any]]) -> Tuple[str, Dict[str, Any]]:
+        """
+        Return the export of a material, running ``exporter`` only on a miss.
+
+        Args:
+            material: Blender material
+            exporter: Function producing the material JSON dict
+
+        Returns:
+            Tuple of (material_hash, material_json). The dict is a fresh
+            copy, so callers may modify it.
+        """
+        key = material.name_full
+        revision = self._revisions.get(key, 0)
+        entry = self._entries.get(key)
+
+        if (entry is not None and entry.revision == revision and entry.epoch == self._epoch
+                and all(get_stat_signature(Path(path)) == sig for path, sig in entry.texture_signatures)):
+            self.hits += 1
+            return entry.material_hash, json.loads(entry.serialized)
+
+        self.misses += 1
+        if material.node_tree:
+            self._tree_owners[material.node_tree.as_pointer()] = key
+        material_json = exporter(material)
+        serialized = json.dumps(material_json, sort_keys=True, ensure_ascii=False)
+        material_hash = hashlib.sha256(serialized.encode('utf-8')).hexdigest()
+        self._entries[key] = MaterialExportEntry(
+            revision, self._epoch, serialized, material_hash, _texture_signatures(material_json)
+        )
+        return material_hash, json.loads(serialized)
+
+
+# Global cache instance
+_cache_instance: Optional[MaterialExportCache] = None
+
+
+def get_material_export_cache() -> MaterialExportCache:
+    """Get global material export cache instance."""
+    global _cache_instance
+    if _cache_instance is None:
+        _cache_instance = MaterialExportCache()
+    return _cache_instance
+
+
+@persistent
+def _on_depsgraph_update_post(scene, depsgraph):
+    """Bump revisions of changed materials."""
+    cache = get_material_export_cache()
+    try:
+        if depsgraph.id_type_updated('IMAGE'):
+            cache.bump_all()
+        if depsgraph.id_type_updated('MATERIAL') or depsgraph.id_type_updated('NODETREE'):
+            for update in depsgraph.updates:
+                if isinstance(update.id, bpy.types.Material):
+                    cache.bump(update.id.original.name_full)
+                elif isinstance(update.id, bpy.types.NodeTree):
+                    cache.bump_node_tree(update.id.original)
+    except (AttributeError, ReferenceError):
+        cache.bump_all()
+
+
+@persistent
+def _on_file_changed(*args):
+    """Undo or loading a file may change materials without a depsgraph update."""
+    get_material_export_cache().clear()
+
+
+def register():
+    """Register handlers that invalidate the material export cache."""
+    if _on_depsgraph_update_post not in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.append(_on_depsgraph_update_post)
+    for handlers in (bpy.app.handlers.load_post, bpy.app.handlers.undo_post, bpy.app.handlers.redo_post):
+        if _on_file_changed not in handlers:
+            handlers.append(_on_file_changed)
+
+
+def unregister():
+    """Unregister material export cache handlers."""
+    if _on_depsgraph_update_post in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.remove(_on_depsgraph_update_post)
+    for handlers in (bpy.app.handlers.load_post, bpy.app.handlers.undo_post, bpy.app.handlers.redo_post):
+        if _on_file_changed in handlers:
+            handlers.remove(_on_file_changed)
+    get_material_export_cache().clear()
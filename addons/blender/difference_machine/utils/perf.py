@@ -0,0 +1,210 @@
+"""
+Latency instrumentation for Difference Machine addon.
+
+Records call counts and latency histograms per operator (``bl_idname``),
+per forester subcommand and per pipeline stage. Recording is a dict lookup
+and a bucket increment, so it stays enabled at all times.
+"""
+
+import functools
+import json
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Optional, Dict, Any, List, Callable
+
+# Measurement categories
+CATEGORY_OPERATOR = 'operator'
+CATEGORY_CLI = 'cli'
+CATEGORY_STAGE = 'stage'
+
+# Upper bounds of histogram buckets in milliseconds (last bucket is open-ended)
+BUCKET_BOUNDS_MS: List[float] = [1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000, 30000, 60000]
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram with count, total, min and max."""
+
+    __slots__ = ("buckets", "count", "total_ms", "min_ms", "max_ms")
+
+    def __init__(self):
+        self.buckets: List[int] = [0] * (len(BUCKET_BOUNDS_MS) + 1)
+        self.count: int = 0
+        self.total_ms: float = 0.0
+        self.min_ms: float = float('inf')
+        self.max_ms: float = 0.0
+
+    def record(self, elapsed_ms: float) -> None:
+        self.buckets[bisect_left(BUCKET_BOUNDS_MS, elapsed_ms)] += 1
+        self.count += 1
+        self.total_ms += elapsed_ms
+        if elapsed_ms < self.min_ms:
+            self.min_ms = elapsed_ms
+        if elapsed_ms > self.max_ms:
+            self.max_ms = elapsed_ms
+
+    @property
+    def mean_ms(self) -> float:
+        return self.total_ms / self.count if self.count else 0.0
+
+    def percentile(self, fraction: float) -> float:
+        """Approximate percentile: upper bound of the bucket containing it."""
+        if not self.count:
+            return 0.0
+        target = fraction * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.buckets):
+            seen += bucket_count
+            if seen >= target:
+                if index < len(BUCKET_BOUNDS_MS):
+                    return min(BUCKET_BOUNDS_MS[index], self.max_ms)
+                return self.max_ms
+        return self.max_ms
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "total_ms": round(self.total_ms, 3),
+            "mean_ms": round(self.mean_ms, 3),
+            "min_ms": round(self.min_ms, 3) if self.count else 0.0,
+            "max_ms": round(self.max_ms, 3),
+            "p50_ms": self.percentile(0.5),
+            "p95_ms": self.percentile(0.95),
+            "buckets": {
+                (f"<={bound:g}" if i < len(BUCKET_BOUNDS_MS) else f">{BUCKET_BOUNDS_MS[-1]:g}"): n
+                for i, (bound, n) in enumerate(zip(BUCKET_BOUNDS_MS + [float('inf')], self.buckets))
+                if n
+            },
+        }
+
+
+class PerfRegistry:
+    """Thread-safe collection of histograms keyed by (category, name)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms: Dict[str, Dict[str, LatencyHistogram]] = {}
+        self.started_at: float = time.time()
+
+    def record(self, category: str, name: str, elapsed_seconds: float) -> None:
+        with self._lock:
+            by_name = self._histograms.setdefault(category, {})
+            histogram = by_name.get(name)
+            if histogram is None:
+                histogram = by_name[name] = LatencyHistogram()
+            histogram.record(elapsed_seconds * 1000.0)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._histograms.clear()
+            self.started_at = time.time()
+
+    def top(self, category: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """Entries of a category sorted by total time, for display."""
+        with self._lock:
+            items = [(name, h.count, h.total_ms, h.mean_ms, h.percentile(0.95))
+                     for name, h in self._histograms.get(category, {}).items()]
+        items.sort(key=lambda item: item[2], reverse=True)
+        return [
+            {"name": name, "count": count, "total_ms": total, "mean_ms": mean, "p95_ms": p95}
+            for name, count, total, mean, p95 in items[:limit]
+        ]
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "started_at": self.started_at,
+                "captured_at": time.time(),
+                "categories": {
+                    category: {name: h.to_dict() for name, h in sorted(by_name.items())}
+                    for category, by_name in sorted(self._histograms.items())
+                },
+            }
+
+    def export_json(self, path: Path) -> None:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.snapshot(), f, indent=2)
+
+
+# Global registry instance
+_registry_instance: Optional[PerfRegistry] = None
+
+
+def get_perf_registry() -> PerfRegistry:
+    """Get global performance registry instance."""
+    global _registry_instance
+    if _registry_instance is None:
+        _registry_instance = PerfRegistry()
+    return _registry_instance
+
+
+@contextmanager
+def measure(category: str, name: str):
+    """Context manager recording the duration of its block."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        get_perf_registry().record(category, name, time.perf_counter() - start)
+
+
+def timed(category: str = CATEGORY_STAGE, name: Optional[str] = None) -> Callable:
+    """Decorator recording the duration of every call of a function."""
+    def decorator(func):
+        label = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                get_perf_registry().record(category, label, time.perf_counter() - start)
+        return wrapper
+    return decorator
+
+
+def _wrap_execute(method, label: str):
+    @functools.wraps(method)
+    def execute(self, context):
+        start = time.perf_counter()
+        try:
+            return method(self, context)
+        finally:
+            get_perf_registry().record(CATEGORY_OPERATOR, label, time.perf_counter() - start)
+    return execute
+
+
+def _wrap_invoke(method, label: str):
+    @functools.wraps(method)
+    def invoke(self, context, event):
+        start = time.perf_counter()
+        try:
+            return method(self, context, event)
+        finally:
+            get_perf_registry().record(CATEGORY_OPERATOR, label, time.perf_counter() - start)
+    return invoke
+
+
+def instrument_operator_class(cls) -> None:
+    """
+    Wrap ``execute``/``invoke`` of an operator class to record latency.
+
+    Wrappers keep the exact positional signature because Blender checks the
+    argument count of operator callbacks at registration. Must be called
+    before the class is registered; safe to call twice.
+    """
+    idname = getattr(cls, 'bl_idname', None)
+    if not idname or cls.__dict__.get('_df_perf_instrumented'):
+        return
+
+    for method_name, wrap in (('execute', _wrap_execute), ('invoke', _wrap_invoke)):
+        method = cls.__dict__.get(method_name)
+        if method is None:
+            continue
+        setattr(cls, method_name, wrap(method, f"{idname}.{method_name}"))
+    cls._df_perf_instrumented = True
@@ -0,0 +1,221 @@
+"""
+Background hashing of saved .blend files for Difference Machine addon.
+
+The addon's working-tree compare hashes a changed .blend to decide whether
+it differs from the commit. A ``save_post`` handler hashes the just-saved
+file on a worker thread and stages its (stat signature, content hash) in
+``.DFM/cache/saved_hashes.json``; compares take the hash from there instead
+of reading the file again. This only spares the addon's own read: the
+staging planner (used only with "commit changed files only", off by
+default), fast_status and the checkout keep-scene check. ``forester add``
+still reads the whole file when committing.
+
+A compare on a worker thread that starts while the file is still being
+hashed waits for that worker. The main thread never waits: it hashes the
+file itself rather than blocking the UI on the join.
+
+The signature is taken before hashing and checked again afterwards, so a
+file that changed meanwhile is not staged. A write in the same mtime tick
+keeps the signature, so, as in the working-tree stat cache, an entry is
+trusted only if the file's mtime is at least ``RACY_WINDOW_NS`` older than
+its hash. The worker therefore lets that window pass after a save before
+it hashes the file.
+"""
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Optional, Dict, Tuple
+import bpy
+from bpy.app.handlers import persistent
+from .working_tree import hash_file, FileSignature, RACY_WINDOW_NS
+from .logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Location of staged hashes relative to repository root
+SAVED_HASHES_FILE: str = os.path.join(".DFM", "cache", "saved_hashes.json")
+
+
+def _signature(path: Path) -> Optional[FileSignature]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_size, st.st_mtime_ns, st.st_ino
+
+
+class SavedHashStaging:
+    """Content hashes of saved files, computed in the background per repository."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        # rel path -> (signature, content hash, time.time_ns() before hashing)
+        self._entries: Dict[str, Dict[str, Tuple[FileSignature, str, int]]] = {}
+        # (repo, path) -> (signature being hashed, worker)
+        self._pending: Dict[Tuple[str, str], Tuple[FileSignature, threading.Thread]] = {}
+
+    @staticmethod
+    def _path(repo_path: Path) -> Path:
+        return Path(repo_path) / SAVED_HASHES_FILE
+
+    def _load(self, repo_path: Path) -> Dict[str, Tuple[FileSignature, str, int]]:
+        """Staged entries of a repository (call with the lock held)."""
+        key = str(repo_path)
+        entries = self._entries.get(key)
+        if entries is None:
+            entries = {}
+            try:
+                with open(self._path(repo_path), 'r', encoding='utf-8') as f:
+                    payload = json.load(f)
+                for rel_path, (size, mtime_ns, inode, content_hash, hashed_ns) in payload.items():
+                    entries[rel_path] = ((size, mtime_ns, inode), content_hash, hashed_ns)
+            except FileNotFoundError:
+                pass
+            except (OSError, ValueError, TypeError) as e:
+                logger.debug(f"Ignoring unreadable saved hashes: {e}")
+            self._entries[key] = entries
+        return entries
+
+    def stage(self, repo_path: Path, rel_path: str) -> bool:
+        """
+        Hash a saved file on a worker thread unless it is already staged.
+
+        Args:
+            repo_path: Repository root
+            rel_path: POSIX path of the file relative to repo root
+
+        Returns:
+            True if a worker was started
+        """
+        signature = _signature(Path(repo_path) / rel_path)
+        if signature is None:
+            return False
+        key = (str(repo_path), rel_path)
+        with self._lock:
+            staged = self._load(repo_path).get(rel_path)
+            if staged is not None and staged[0] == signature:
+                return False
+            pending = self._pending.get(key)
+            if pending is not None and pending[0] == signature:
+                return False
+            worker = threading.Thread(
+                target=self._hash_worker,
+                args=(Path(repo_path), rel_path, signature),
+                name="dfm-save-hash",
+                daemon=True
+            )
+            self._pending[key] = (signature, worker)
+        worker.start()
+        return True
+
+    def _hash_worker(self, repo_path: Path, rel_path: str, signature: FileSignature) -> None:
+        path = repo_path / rel_path
+        # A hash taken within the racy window would never be trusted
+        delay_ns = signature[1] + RACY_WINDOW_NS - time.time_ns()
+        if delay_ns > 0:
+            time.sleep(delay_ns / 1e9)
+        content_hash = None
+        if _signature(path) == signature:
+            hashed_ns = time.time_ns()
+            content_hash = hash_file(path)
+        unchanged = _signature(path) == signature
+        key = (str(repo_path), rel_path)
+        with self._lock:
+            if self._pending.get(key, (None,))[0] == signature:
+                del self._pending[key]
+            if content_hash is None or not unchanged:
+                logger.debug("Not staging %s: changed while hashing", rel_path)
+                return
+            self._load(repo_path)[rel_path] = (signature, content_hash, hashed_ns)
+        self._save(repo_path)
+        logger.debug("Staged hash of saved %s", rel_path)
+
+    def _save(self, repo_path: Path) -> None:
+        with self._write_lock:
+            with self._lock:
+                payload = {p: [*sig, h, hashed_ns] for p, (sig, h, hashed_ns) in self._load(repo_path).items()}
+            path = self._path(repo_path)
+            try:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = path.with_suffix(".tmp")
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(payload, f, separators=(",", ":"))
+                os.replace(tmp_path, path)
+            except OSError as e:
+                logger.debug(f"Failed to persist saved hashes: {e}")
+
+    def lookup(self, repo_path: Path, rel_path: str, signature: FileSignature, wait: bool = True) -> Optional[str]:
+        """
+        Staged content hash of a file whose signature is still ``signature``.
+
+        Args:
+            repo_path: Repository root
+            rel_path: POSIX path relative to repo root
+            signature: Current (size, mtime_ns, inode) of the file
+            wait: Wait for a worker still hashing this exact file (ignored
+                on the main thread, which must not block on the worker)
+
+        Returns:
+            Content hash, or None if nothing valid is staged or the file was
+            modified within the racy window of its hash
+        """
+        key = (str(repo_path), rel_path)
+        with self._lock:
+            pending = self._pending.get(key)
+        if (wait and pending is not None and pending[0] == signature
+                and threading.current_thread() is not threading.main_thread()):
+            pending[1].join()
+        with self._lock:
+            staged = self._load(repo_path).get(rel_path)
+        if staged is None or staged[0] != signature:
+            return None
+        if signature[1] >= staged[2] - RACY_WINDOW_NS:
+            return None
+        return staged[1]
+
+    def clear(self) -> None:
+        """Forget loaded entries (persisted entries stay valid)."""
+        with self._lock:
+            self._entries.clear()
+
+
+# Global staging instance
+_staging_instance: Optional[SavedHashStaging] = None
+
+
+def get_saved_hashes() -> SavedHashStaging:
+    """Get global saved-file hash staging instance."""
+    global _staging_instance
+    if _staging_instance is None:
+        _staging_instance = SavedHashStaging()
+    return _staging_instance
+
+
+@persistent
+def _on_save_post(*args):
+    """Hash the just-saved .blend in the background."""
+    from .helpers import get_repository_path
+    repo_path, _ = get_repository_path()
+    if not repo_path:
+        return
+    try:
+        rel_path = Path(bpy.data.filepath).resolve().relative_to(repo_path.resolve()).as_posix()
+    except ValueError:
+        return
+    get_saved_hashes().stage(repo_path, rel_path)
+
+
+def register():
+    """Register the save handler."""
+    if _on_save_post not in bpy.app.handlers.save_post:
+        bpy.app.handlers.save_post.append(_on_save_post)
+
+
+def unregister():
+    """Unregister the save handler."""
+    if _on_save_post in bpy.app.handlers.save_post:
+        bpy.app.handlers.save_post.remove(_on_save_post)
@@ -0,0 +1,111 @@
+"""
+Selective staging for Difference Machine addon.
+
+Instead of ``forester add .`` (which makes forester walk and hash the whole
+working tree) the planner computes which paths differ from HEAD:
+
+- the persisted stat cache of ``working_tree`` maps every working-tree file
+  to (size, mtime_ns, inode) and its content hash;
+- files whose stat signature is unchanged are taken as unchanged without
+  reading them; only the others are hashed and compared with the HEAD tree
+  read from ``.DFM/objects/trees``.
+
+Untracked files that ``.dfmignore`` ignores are left out; the plan falls
+back to staging everything when it cannot be exact: cold cache, unknown
+HEAD, deleted files, new files forester has not classified yet, or too many
+paths for one command line.
+"""
+
+from pathlib import Path
+from typing import Optional, List
+from .working_tree import get_working_tree
+from .logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Above this many changed paths a single "add ." is cheaper (and the command
+# line stays within OS limits)
+MAX_EXPLICIT_PATHS: int = 1000
+
+
+class StagingPlan:
+    """Result of planning which paths to stage."""
+
+    __slots__ = ("paths", "full", "reason")
+
+    def __init__(self, paths: Optional[List[str]] = None, full: bool = False, reason: str = ""):
+        self.paths = paths or []
+        self.full = full
+        self.reason = reason
+
+    @property
+    def files(self) -> Optional[List[str]]:
+        """Argument for ForesterCLI.add(): None means add everything."""
+        return None if self.full else self.paths
+
+
+class StagingPlanner:
+    """Computes minimal ``forester add`` arguments per repository."""
+
+    def plan(self, repo_path: Path, head_commit: Optional[str]) -> StagingPlan:
+        """
+        Compute the paths that differ from HEAD.
+
+        Args:
+            repo_path: Repository root
+            head_commit: Hash of the HEAD commit, if known
+
+        Returns:
+            StagingPlan; ``full`` is set when everything must be staged
+        """
+        working_tree = get_working_tree()
+        if not working_tree.is_warm(repo_path):
+            return StagingPlan(full=True, reason="no stat cache yet")
+        if not head_commit:
+            return StagingPlan(full=True, reason="HEAD unknown")
+        diff = working_tree.compare(repo_path, head_commit)
+        if diff is None:
+            return StagingPlan(full=True, reason="HEAD tree not readable")
+        if diff.deleted:
+            return StagingPlan(full=True, reason="files were deleted")
+        if diff.unresolved:
+            # Only forester knows whether .dfmignore ignores them
+            return StagingPlan(full=True, reason=f"{len(diff.unresolved)} new files may be ignored")
+
+        changed = sorted(diff.modified + diff.untracked)
+        logger.debug("Staging plan: %s hashed, %s changed", diff.hashed, len(changed))
+        if len(changed) > MAX_EXPLICIT_PATHS:
+            return StagingPlan(full=True, reason=f"{len(changed)} changed files")
+        return StagingPlan(changed)
+
+    def record_commit(self, repo_path: Path, commit_hash: str, staged: Optional[List[str]], started_ns: int) -> None:
+        """
+        Update the stat cache after a successful commit.
+
+        Args:
+            repo_path: Repository root
+            commit_hash: The new HEAD
+            staged: Paths passed to add, or None if everything was staged
+            started_ns: time.time_ns() before staging; files modified later
+                are left out so they are hashed next time
+        """
+        if not commit_hash:
+            get_working_tree().invalidate(repo_path)
+            return
+        get_working_tree().seed(repo_path, commit_hash, started_ns, paths=staged)
+
+    def invalidate(self, repo_path: Optional[Path] = None) -> None:
+        """Forget stat caches (all repositories if repo_path is None)."""
+        get_working_tree().invalidate(repo_path)
+
+
+# Global planner instance
+_planner_instance: Optional[StagingPlanner] = None
+
+
+def get_staging_planner() -> StagingPlanner:
+    """Get global staging planner instance."""
+    global _planner_instance
+    if _planner_instance is None:
+        _planner_instance = StagingPlanner()
+    return _planner_instance
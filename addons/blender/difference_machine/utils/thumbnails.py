@@ -0,0 +1,373 @@
+"""
+Commit thumbnails for Difference Machine addon.
+
+A viewport capture is downsampled (block averaging with numpy) to a few
+fixed sizes and stored as small PNG files, content-addressed by the hash of
+the largest thumbnail::
+
+    .DFM/thumbnails/sha256/<h[:2]>/<h[2:]>/<size>.png
+
+``.DFM/thumbnails/index.json`` maps commit hashes to thumbnail hashes.
+Encoding and writing happen on a worker thread. The UI loads only the size
+it draws into a ``bpy.utils.previews`` collection with LRU eviction, so full
+size images are never decoded.
+"""
+
+import json
+import os
+import struct
+import threading
+import zlib
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional, Dict, Tuple
+import bpy
+from bpy.app.handlers import persistent
+from .helpers import request_view3d_redraw, normalize_commit_hash
+from .logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Location of thumbnails relative to repository root
+THUMBNAILS_DIR: str = os.path.join(".DFM", "thumbnails")
+
+# Longest side of stored thumbnails, largest first
+THUMBNAIL_SIZES: Tuple[int, ...] = (512, 128, 32)
+
+# Sizes used by the UI
+THUMBNAIL_SIZE_LIST: int = 32
+THUMBNAIL_SIZE_DETAILS: int = 128
+
+# Resolution the viewport is rendered at before downsampling
+CAPTURE_SIZE: int = 1024
+
+# Maximum number of thumbnails kept in the preview collection
+PREVIEW_CACHE_SIZE: int = 64
+
+_PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+
+def downsample(pixels, size: int):
+    """
+    Downsample an image so its longest side is at most ``size`` pixels.
+
+    Uses an integer box filter: the image is padded to a multiple of the
+    factor and every block is averaged in one vectorized reduction.
+
+    Args:
+        pixels: uint8 array of shape (height, width, channels)
+        size: Target longest side
+
+    Returns:
+        uint8 array (the input itself if it is already small enough)
+    """
+    import numpy as np
+
+    height, width = pixels.shape[:2]
+    factor = -(-max(height, width) // size)  # ceil
+    if factor <= 1:
+        return pixels
+
+    pad_h = -height % factor
+    pad_w = -width % factor
+    if pad_h or pad_w:
+        pixels = np.pad(pixels, ((0, pad_h), (0, pad_w), (0, 0)), mode='edge')
+
+    blocks = pixels.reshape(
+        pixels.shape[0] // factor, factor,
+        pixels.shape[1] // factor, factor,
+        pixels.shape[2],
+    )
+    averaged = blocks.mean(axis=(1, 3), dtype=np.float32)
+    return (averaged + 0.5).astype(np.uint8)
+
+
+def _png_chunk(tag: bytes, data: bytes) -> bytes:
+    return struct.pack(">I", len(data)) + tag + data + struct.pack(">I", zlib.crc32(tag + data) & 0xFFFFFFFF)
+
+
+def encode_png(pixels) -> bytes:
+    """
+    Encode pixels as an 8-bit RGB PNG.
+
+    Args:
+        pixels: uint8 array of shape (height, width, 3 or 4), bottom row
+            first (Blender's pixel order); alpha is dropped
+
+    Returns:
+        PNG file contents
+    """
+    import numpy as np
+
+    height, width = pixels.shape[:2]
+    rows = np.zeros((height, 1 + width * 3), dtype=np.uint8)  # filter byte 0 per row
+    rows[:, 1:] = pixels[::-1, :, :3].reshape(height, width * 3)
+
+    header = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+    return b"".join((
+        _PNG_SIGNATURE,
+        _png_chunk(b"IHDR", header),
+        _png_chunk(b"IDAT", zlib.compress(rows.tobytes(), 6)),
+        _png_chunk(b"IEND", b""),
+    ))
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+class PreparedThumbnail:
+    """Downsampled thumbnail sizes of one capture, hashed and optionally encoded."""
+
+    __slots__ = ("digest", "images", "encoded")
+
+    def __init__(self, digest: str, images: Dict[int, object]):
+        self.digest = digest
+        self.images = images
+        self.encoded: Dict[int, bytes] = {}
+
+    def encode(self) -> None:
+        """Encode all sizes as PNG (any thread)."""
+        for size in self.images:
+            self.png(size)
+
+    def png(self, size: int) -> bytes:
+        data = self.encoded.get(size)
+        if data is None:
+            data = self.encoded[size] = encode_png(self.images[size])
+        return data
+
+
+def prepare_thumbnail(pixels) -> Optional[PreparedThumbnail]:
+    """
+    Downsample a capture to the stored sizes and hash it.
+
+    Args:
+        pixels: uint8 array (height, width, 4), or None
+
+    Returns:
+        PreparedThumbnail, or None if pixels is None
+    """
+    if pixels is None:
+        return None
+    import hashlib
+
+    images = {}
+    current = pixels
+    for size in THUMBNAIL_SIZES:
+        current = downsample(current, size)
+        images[size] = current
+
+    largest = images[THUMBNAIL_SIZES[0]]
+    digest = hashlib.sha256(struct.pack(">II", *largest.shape[:2]) + largest.tobytes()).hexdigest()
+    return PreparedThumbnail(digest, images)
+
+
+class ThumbnailStore:
+    """Content-addressed thumbnail files and the commit -> thumbnail index."""
+
+    def __init__(self):
+        self._indexes: Dict[str, Dict[str, str]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def thumbnail_path(repo_path: Path, thumb_hash: str, size: int) -> Path:
+        """Path of one stored thumbnail size."""
+        return Path(repo_path) / THUMBNAILS_DIR / "sha256" / thumb_hash[:2] / thumb_hash[2:] / f"{size}.png"
+
+    @staticmethod
+    def _index_path(repo_path: Path) -> Path:
+        return Path(repo_path) / THUMBNAILS_DIR / "index.json"
+
+    def _load_index(self, repo_path: Path) -> Dict[str, str]:
+        key = str(repo_path)
+        index = self._indexes.get(key)
+        if index is None:
+            index = {}
+            try:
+                with open(self._index_path(repo_path), 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if isinstance(data, dict):
+                    index = {str(k): str(v) for k, v in data.items()}
+            except FileNotFoundError:
+                pass
+            except (OSError, ValueError) as e:
+                logger.debug(f"Failed to read thumbnail index: {e}")
+            self._indexes[key] = index
+        return index
+
+    def lookup(self, repo_path: Path, commit_hash: str) -> str:
+        """Return the thumbnail hash of a commit, or an empty string."""
+        with self._lock:
+            return self._load_index(repo_path).get(commit_hash, "")
+
+    def save_capture(self, repo_path: Path, commit_hash: str, pixels) -> Optional[str]:
+        """
+        Store a viewport capture as the thumbnail of a commit.
+
+        Downsampling and hashing run on the calling thread (a few
+        milliseconds), so the returned hash is usable immediately; PNG
+        encoding and file writes run on a worker thread.
+
+        Args:
+            repo_path: Repository root
+            commit_hash: Commit the capture belongs to
+            pixels: uint8 array (height, width, 4), e.g. from
+                viewport_capture.capture_viewport_pixels()
+
+        Returns:
+            Thumbnail hash, or None if pixels is None or commit_hash is not a full hash
+        """
+        return self.save_prepared(repo_path, commit_hash, prepare_thumbnail(pixels))
+
+    def save_prepared(self, repo_path: Path, commit_hash: str, prepared: Optional["PreparedThumbnail"]) -> Optional[str]:
+        """
+        Store a thumbnail prepared before the commit hash was known.
+
+        Sizes not encoded yet are encoded on the write worker. The index is
+        keyed by the full lowercase commit hash, as used by the history list.
+
+        Returns:
+            Thumbnail hash, or None if prepared is None or commit_hash is not a full hash
+        """
+        if prepared is None:
+            return None
+        full_hash = normalize_commit_hash(commit_hash)
+        if not full_hash:
+            logger.warning(f"Not storing thumbnail for unresolved commit hash {commit_hash!r}")
+            return None
+        commit_hash = full_hash
+        with self._lock:
+            self._load_index(repo_path)[commit_hash] = prepared.digest
+
+        threading.Thread(
+            target=self._write_worker,
+            args=(Path(repo_path), commit_hash, prepared),
+            name="dfm-thumbnail-writer",
+            daemon=True
+        ).start()
+        return prepared.digest
+
+    def _write_worker(self, repo_path: Path, commit_hash: str, prepared: "PreparedThumbnail") -> None:
+        try:
+            for size in prepared.images:
+                path = self.thumbnail_path(repo_path, prepared.digest, size)
+                if not path.exists():
+                    _write_atomic(path, prepared.png(size))
+            with self._lock:
+                # Set again: the index may have been reloaded in the meantime
+                index = self._load_index(repo_path)
+                index[commit_hash] = prepared.digest
+                data = json.dumps(index, sort_keys=True)
+            _write_atomic(self._index_path(repo_path), data.encode('utf-8'))
+            logger.debug(f"Thumbnail {prepared.digest[:16]}... written")
+        except OSError as e:
+            logger.warning(f"Failed to write thumbnail: {e}")
+        request_view3d_redraw()
+
+    def clear(self) -> None:
+        """Forget loaded indexes."""
+        with self._lock:
+            self._indexes.clear()
+
+
+class ThumbnailPreviews:
+    """LRU set of thumbnails loaded into a bpy.utils.previews collection."""
+
+    def __init__(self, capacity: int = PREVIEW_CACHE_SIZE):
+        self._capacity = capacity
+        self._collection = None
+        self._keys: "OrderedDict[str, None]" = OrderedDict()
+        self._repo_path: Optional[Path] = None
+
+    def set_repository(self, repo_path: Optional[Path]) -> None:
+        """Set the repository thumbnails are loaded from."""
+        if repo_path != self._repo_path:
+            self.clear()
+            self._repo_path = repo_path
+
+    def icon_id(self, thumb_hash: str, size: int = THUMBNAIL_SIZE_LIST) -> int:
+        """
+        Return the icon id of a thumbnail, loading it on first use.
+
+        Returns 0 (no icon) if the thumbnail is not written yet; the next
+        redraw tries again.
+        """
+        if not thumb_hash or self._repo_path is None:
+            return 0
+
+        key = f"{thumb_hash}:{size}"
+        if key in self._keys:
+            self._keys.move_to_end(key)
+            return self._collection[key].icon_id
+
+        path = ThumbnailStore.thumbnail_path(self._repo_path, thumb_hash, size)
+        if not path.is_file():
+            return 0
+
+        if self._collection is None:
+            import bpy.utils.previews
+            self._collection = bpy.utils.previews.new()
+        self._collection.load(key, str(path), 'IMAGE')
+        self._keys[key] = None
+
+        while len(self._keys) > self._capacity:
+            evicted, _ = self._keys.popitem(last=False)
+            # Deleting the entry releases the preview image
+            del self._collection[evicted]
+
+        return self._collection[key].icon_id
+
+    def clear(self) -> None:
+        """Release all loaded previews."""
+        if self._collection is not None:
+            import bpy.utils.previews
+            bpy.utils.previews.remove(self._collection)
+            self._collection = None
+        self._keys.clear()
+
+
+# Global instances
+_store_instance: Optional[ThumbnailStore] = None
+_previews_instance: Optional[ThumbnailPreviews] = None
+
+
+def get_thumbnail_store() -> ThumbnailStore:
+    """Get global thumbnail store instance."""
+    global _store_instance
+    if _store_instance is None:
+        _store_instance = ThumbnailStore()
+    return _store_instance
+
+
+def get_thumbnail_previews() -> ThumbnailPreviews:
+    """Get global thumbnail preview cache instance."""
+    global _previews_instance
+    if _previews_instance is None:
+        _previews_instance = ThumbnailPreviews()
+    return _previews_instance
+
+
+@persistent
+def _on_load_post(*args):
+    """Drop previews of the previous file's repository."""
+    get_thumbnail_previews().set_repository(None)
+    get_thumbnail_store().clear()
+
+
+def register():
+    """Register thumbnail handlers."""
+    if _on_load_post not in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.append(_on_load_post)
+
+
+def unregister():
+    """Unregister handlers and release loaded previews."""
+    if _on_load_post in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.remove(_on_load_post)
+    get_thumbnail_previews().clear()
+    get_thumbnail_store().clear()
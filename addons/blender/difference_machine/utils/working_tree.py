@@ -0,0 +1,663 @@
+"""
+Working-tree state for Difference Machine addon.
+
+A stat cache persisted in ``.DFM/cache/worktree_stat.json`` maps every
+working-tree file to its (size, mtime_ns, inode) signature, content hash and
+the time that hash was taken. An entry is trusted only once the file's mtime
+lies outside the racy window before its own hash time.
+Comparing it with the HEAD tree read from ``.DFM/objects/trees`` gives the
+modified/deleted/untracked lists in-process: the tree is stat'ed, and only
+files whose signature changed are read and hashed.
+
+The cache is seeded without hashing from the HEAD tree after a commit or a
+clean ``forester status``. It is only trusted once a sample of files hashed
+locally matched their blob hashes in the tree. Until then ``fast_status()``
+falls back to the CLI.
+
+forester applies the repository's ``.dfmignore``, which is not parsed here.
+When it exists, an untracked file counts as untracked only if the last
+``forester status`` listed it. A file that already existed then and was not
+listed is ignored. Anything newer leaves the answer to forester: status
+falls back to the CLI and staging adds everything.
+
+The commit pipeline plans and records commits on a worker thread while the
+main thread may ask for status, so the caches are guarded by a lock. Files
+are read and hashed outside of it.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Optional, Dict, List, Tuple, Any, Iterable, FrozenSet
+from .logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Location of the persisted stat cache relative to repository root
+WORKTREE_CACHE_FILE: str = os.path.join(".DFM", "cache", "worktree_stat.json")
+
+# Bump when the cached payload layout changes; old caches are then ignored
+WORKTREE_CACHE_VERSION: int = 2
+
+# Files modified this close to the time their hash was recorded may change
+# again within the same mtime tick; they are re-hashed until the window passed
+RACY_WINDOW_NS: int = 2_000_000_000
+
+# Number of seeded files hashed to verify that blob hashes are content hashes
+HASH_CHECK_SAMPLES: int = 3
+
+FILE_READ_CHUNK_SIZE: int = 1024 * 1024
+
+# Threads hashing changed files during a compare
+HASH_WORKERS: int = 4
+
+# Ignore rules applied by forester (not parsed by the addon)
+DFMIGNORE_FILE: str = ".dfmignore"
+
+# (size, mtime_ns, inode)
+FileSignature = Tuple[int, int, int]
+
+
+def _file_signature(path: Path) -> Optional[FileSignature]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_size, st.st_mtime_ns, st.st_ino
+
+
+def _is_listed(rel_path: str, listed: FrozenSet[str]) -> bool:
+    """Check a path against a status listing, which may name a parent directory."""
+    if rel_path in listed:
+        return True
+    parts = rel_path.split("/")
+    return any("/".join(parts[:i]) + "/" in listed for i in range(1, len(parts)))
+
+
+def is_excluded(name: str) -> bool:
+    """Entries never tracked: repository data, hidden files, Blender backups."""
+    return name.startswith(".") or name.endswith((".blend1", ".blend2", ".blend@"))
+
+
+def _is_excluded_path(rel_path: str) -> bool:
+    return any(is_excluded(part) for part in rel_path.split("/"))
+
+
+def walk_working_tree(repo_path: Path) -> Dict[str, FileSignature]:
+    """
+    Stat every working-tree file without reading it.
+
+    Args:
+        repo_path: Repository root
+
+    Returns:
+        Dict of POSIX path relative to repo root -> signature
+    """
+    result = {}
+    stack = [(Path(repo_path), "")]
+    while stack:
+        directory, prefix = stack.pop()
+        try:
+            entries = list(os.scandir(directory))
+        except OSError as e:
+            logger.debug(f"Cannot list {directory}: {e}")
+            continue
+        for entry in entries:
+            if is_excluded(entry.name):
+                continue
+            rel_path = f"{prefix}{entry.name}"
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append((Path(entry.path), rel_path + "/"))
+                elif entry.is_file(follow_symlinks=False):
+                    st = entry.stat(follow_symlinks=False)
+                    result[rel_path] = (st.st_size, st.st_mtime_ns, st.st_ino)
+            except OSError:
+                continue
+    return result
+
+
+def hash_file(path: Path) -> Optional[str]:
+    """SHA256 of a file's contents, or None if it cannot be read."""
+    h = hashlib.sha256()
+    try:
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(FILE_READ_CHUNK_SIZE), b""):
+                h.update(chunk)
+    except OSError:
+        return None
+    return h.hexdigest()
+
+
+def _saved_hash(repo_path: Path, rel_path: str, signature: FileSignature) -> Optional[str]:
+    """Hash staged by the save_post handler, if it still matches the file."""
+    if not rel_path.endswith(".blend"):
+        return None
+    try:
+        from .save_hashing import get_saved_hashes
+    except ImportError:  # Outside Blender
+        return None
+    return get_saved_hashes().lookup(repo_path, rel_path, signature)
+
+
+def read_tree_paths(repo_path: Path, tree_hash: str) -> Optional[Dict[str, str]]:
+    """
+    Read a tree from the object store, descending into sub-trees.
+
+    Args:
+        repo_path: Repository root
+        tree_hash: Root tree hash
+
+    Returns:
+        Dict of POSIX path -> blob hash, or None if a tree is missing
+    """
+    trees_path = Path(repo_path) / ".DFM" / "objects" / "trees" / "sha256"
+    result = {}
+    stack = [(tree_hash, "")]
+    while stack:
+        current, prefix = stack.pop()
+        try:
+            with open(trees_path / current[:2] / current[2:], 'r', encoding='utf-8') as f:
+                entries = json.load(f).get("entries") or []
+        except (OSError, ValueError, AttributeError) as e:
+            logger.debug(f"Cannot read tree {current[:16]}...: {e}")
+            return None
+        for entry in entries:
+            name = entry.get("name", "")
+            if entry.get("type") == "tree":
+                stack.append((entry.get("hash", ""), f"{prefix}{name}/"))
+            elif name:
+                result[f"{prefix}{name}"] = entry.get("hash", "")
+    return result
+
+
+class WorkingTreeDiff:
+    """Difference between the working tree and a commit."""
+
+    __slots__ = ("modified", "deleted", "untracked", "hashed", "unresolved")
+
+    def __init__(self):
+        self.modified: List[str] = []
+        self.deleted: List[str] = []
+        self.untracked: List[str] = []
+        self.hashed: int = 0
+        # Untracked files that .dfmignore may ignore; only forester can tell
+        self.unresolved: List[str] = []
+
+    @property
+    def clean(self) -> bool:
+        return not (self.modified or self.deleted or self.untracked)
+
+
+class WorkingTreeStatCache:
+    """Path -> (signature, content hash, time the hash was recorded), persisted per repository."""
+
+    def __init__(self):
+        self.entries: Dict[str, Tuple[FileSignature, str, int]] = {}
+        self.recorded_at_ns: int = 0
+        # Set once locally computed hashes were seen to match tree blob hashes
+        self.verified: bool = False
+        self.dirty: bool = False
+
+    def lookup(self, rel_path: str, signature: FileSignature) -> Optional[str]:
+        """Return the cached hash if the signature is unchanged and not racy."""
+        cached = self.entries.get(rel_path)
+        if cached is None or cached[0] != signature:
+            return None
+        # Racy against the time this entry was hashed, not the time the
+        # cache was last saved: a later save says nothing about this file
+        if signature[1] >= cached[2] - RACY_WINDOW_NS:
+            return None
+        return cached[1]
+
+    def store(self, rel_path: str, signature: FileSignature, content_hash: str, recorded_ns: int) -> None:
+        """
+        Record a hash taken at ``recorded_ns`` (time.time_ns() before the file was read).
+
+        An identical entry that is already trusted keeps its older time.
+        """
+        cached = self.entries.get(rel_path)
+        if (cached is not None and cached[0] == signature and cached[1] == content_hash
+                and signature[1] < cached[2] - RACY_WINDOW_NS):
+            return
+        self.entries[rel_path] = (signature, content_hash, recorded_ns)
+        self.dirty = True
+
+    @staticmethod
+    def _path(repo_path: Path) -> Path:
+        return Path(repo_path) / WORKTREE_CACHE_FILE
+
+    @classmethod
+    def load(cls, repo_path: Path) -> Optional["WorkingTreeStatCache"]:
+        """Read the persisted cache, or None if missing or outdated."""
+        try:
+            with open(cls._path(repo_path), 'r', encoding='utf-8') as f:
+                payload = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.debug(f"Ignoring unreadable stat cache: {e}")
+            return None
+        if payload.get("version") != WORKTREE_CACHE_VERSION:
+            return None
+
+        cache = cls()
+        cache.recorded_at_ns = payload.get("recorded_at_ns", 0)
+        cache.verified = bool(payload.get("verified"))
+        for rel_path, (size, mtime_ns, inode, content_hash, recorded_ns) in payload.get("entries", {}).items():
+            cache.entries[rel_path] = ((size, mtime_ns, inode), content_hash, recorded_ns)
+        return cache
+
+    def save(self, repo_path: Path) -> None:
+        """Persist the cache if it changed."""
+        if not self.dirty:
+            return
+        path = self._path(repo_path)
+        payload = {
+            "version": WORKTREE_CACHE_VERSION,
+            "recorded_at_ns": self.recorded_at_ns,
+            "verified": self.verified,
+            "entries": {p: [*sig, h, t] for p, (sig, h, t) in self.entries.items()},
+        }
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(".tmp")
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(payload, f, separators=(",", ":"))
+            os.replace(tmp_path, path)
+            self.dirty = False
+        except OSError as e:
+            logger.debug(f"Failed to persist stat cache: {e}")
+
+
+class WorkingTree:
+    """Stat caches and HEAD trees per repository (thread-safe)."""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._caches: Dict[str, Optional[WorkingTreeStatCache]] = {}
+        self._trees: Dict[Tuple[str, str], Dict[str, str]] = {}
+        self._last_status: Dict[str, Dict[str, Any]] = {}
+        # Repositories with a seed from ``forester status`` in progress
+        self._seeding: set = set()
+        # repo -> (time status started, .dfmignore signature, untracked listed by forester)
+        self._cli_untracked: Dict[str, Tuple[int, Optional[FileSignature], FrozenSet[str]]] = {}
+
+    def _cache(self, repo_path: Path) -> Optional[WorkingTreeStatCache]:
+        """Stat cache of a repository (call with the lock held)."""
+        key = str(repo_path)
+        if key not in self._caches:
+            self._caches[key] = WorkingTreeStatCache.load(repo_path)
+        return self._caches[key]
+
+    def is_warm(self, repo_path: Path) -> bool:
+        """Check whether the stat cache can answer without forester."""
+        with self._lock:
+            cache = self._cache(repo_path)
+            return cache is not None and cache.verified
+
+    def commit_paths(self, repo_path: Path, commit_hash: str) -> Optional[Dict[str, str]]:
+        """Path -> blob hash of a commit's tree (``forester show`` only on a commit cache miss)."""
+        from .commit_cache import get_commit_cache
+        success, details, _ = get_commit_cache().get(repo_path, commit_hash)
+        tree_hash = (details or {}).get("tree") if success else None
+        if not tree_hash:
+            return None
+        key = (str(repo_path), tree_hash)
+        with self._lock:
+            paths = self._trees.get(key)
+        if paths is None:
+            paths = read_tree_paths(repo_path, tree_hash)
+            if paths is None:
+                return None
+            with self._lock:
+                self._trees = {key: paths}  # Normally only HEAD is needed
+        return paths
+
+    def content_hash(self, repo_path: Path, rel_path: str) -> Optional[str]:
+        """
+        Content hash of one working-tree file, read only if its stat signature changed.
+
+        Args:
+            repo_path: Repository root
+            rel_path: POSIX path relative to repo root
+
+        Returns:
+            SHA256 hex digest, or None if the file cannot be read
+        """
+        path = Path(repo_path) / rel_path
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        signature = (st.st_size, st.st_mtime_ns, st.st_ino)
+        with self._lock:
+            cache = self._cache(repo_path)
+            content_hash = cache.lookup(rel_path, signature) if cache is not None else None
+        if content_hash is None:
+            hashed_at_ns = time.time_ns()
+            content_hash = _saved_hash(repo_path, rel_path, signature) or hash_file(path)
+            if content_hash is not None and cache is not None:
+                with self._lock:
+                    cache.store(rel_path, signature, content_hash, hashed_at_ns)
+        return content_hash
+
+    @staticmethod
+    def _hash_files(repo_path: Path, rel_paths: List[str]) -> List[Optional[str]]:
+        """Content hashes of several files, read on worker threads."""
+        paths = [Path(repo_path) / rel_path for rel_path in rel_paths]
+        if len(paths) <= 1:
+            return [hash_file(path) for path in paths]
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=min(HASH_WORKERS, len(paths))) as executor:
+            return list(executor.map(hash_file, paths))
+
+    def compare(self, repo_path: Path, head_commit: Optional[str]) -> Optional[WorkingTreeDiff]:
+        """
+        Compare the working tree with a commit using the stat cache.
+
+        Args:
+            repo_path: Repository root
+            head_commit: Commit to compare with (normally HEAD)
+
+        Returns:
+            WorkingTreeDiff, or None if the cache is cold or HEAD unknown
+        """
+        with self._lock:
+            cache = self._cache(repo_path)
+            if cache is None or not cache.verified or not head_commit:
+                return None
+        head_paths = self.commit_paths(repo_path, head_commit)
+        if head_paths is None:
+            return None
+
+        diff = WorkingTreeDiff()
+        walked_at_ns = time.time_ns()
+        working = walk_working_tree(repo_path)
+        to_hash = []
+        to_look_up = []
+        with self._lock:
+            for rel_path, signature in working.items():
+                head_hash = head_paths.get(rel_path)
+                if head_hash is None:
+                    diff.untracked.append(rel_path)
+                    continue
+                content_hash = cache.lookup(rel_path, signature)
+                if content_hash is None:
+                    to_look_up.append(rel_path)
+                elif content_hash != head_hash:
+                    diff.modified.append(rel_path)
+
+        for rel_path in to_look_up:
+            # A .blend saved from Blender was hashed in the background
+            content_hash = _saved_hash(repo_path, rel_path, working[rel_path])
+            if content_hash is None:
+                to_hash.append(rel_path)
+                continue
+            with self._lock:
+                cache.store(rel_path, working[rel_path], content_hash, walked_at_ns)
+            if content_hash != head_paths[rel_path]:
+                diff.modified.append(rel_path)
+
+        # Changed files (typically the .blend and a few textures) are hashed
+        # concurrently; hashlib releases the GIL on large reads
+        hashed = self._hash_files(repo_path, to_hash)
+        with self._lock:
+            for rel_path, content_hash in zip(to_hash, hashed):
+                diff.hashed += 1
+                if content_hash is None:
+                    diff.modified.append(rel_path)
+                    continue
+                cache.store(rel_path, working[rel_path], content_hash, walked_at_ns)
+                if content_hash != head_paths[rel_path]:
+                    diff.modified.append(rel_path)
+
+            for rel_path in [p for p in cache.entries if p not in working]:
+                del cache.entries[rel_path]
+                cache.dirty = True
+            if cache.dirty:
+                cache.recorded_at_ns = time.time_ns()
+                cache.save(repo_path)
+
+        for rel_path in head_paths:
+            if rel_path not in working and not _is_excluded_path(rel_path):
+                diff.deleted.append(rel_path)
+
+        diff.untracked, diff.unresolved = self._resolve_untracked(repo_path, diff.untracked)
+        diff.modified.sort()
+        diff.deleted.sort()
+        diff.untracked.sort()
+        logger.debug("Working tree: %s files, %s hashed", len(working), diff.hashed)
+        return diff
+
+    def _resolve_untracked(self, repo_path: Path, candidates: List[str]) -> Tuple[List[str], List[str]]:
+        """
+        Split untracked candidates by what the last ``forester status`` said about them.
+
+        Returns:
+            Tuple of (untracked, unresolved); files ignored by forester are dropped
+        """
+        ignore_signature = _file_signature(Path(repo_path) / DFMIGNORE_FILE)
+        if ignore_signature is None or not candidates:
+            return candidates, []
+        with self._lock:
+            known = self._cli_untracked.get(str(repo_path))
+        if known is None or known[1] != ignore_signature:
+            return [], candidates
+
+        started_ns, _, listed = known
+        untracked, unresolved = [], []
+        for rel_path in candidates:
+            if _is_listed(rel_path, listed):
+                untracked.append(rel_path)
+                continue
+            try:
+                # ctime also moves when a file is copied with an old mtime
+                created_ns = os.stat(Path(repo_path) / rel_path).st_ctime_ns
+            except OSError:
+                continue
+            if created_ns >= started_ns:
+                unresolved.append(rel_path)
+        return untracked, unresolved
+
+    def seed(self, repo_path: Path, head_commit: str, started_ns: int,
+             paths: Optional[Iterable[str]] = None) -> None:
+        """
+        Record files as equal to ``head_commit`` without hashing them.
+
+        Call when forester has just confirmed that the files match the
+        commit (after committing them, or a status listing no changes).
+
+        Args:
+            repo_path: Repository root
+            head_commit: Commit the files are equal to
+            started_ns: time.time_ns() before forester looked at the files;
+                files modified later are left out
+            paths: Files to record, or None for the whole working tree
+        """
+        head_paths = self.commit_paths(repo_path, head_commit) if head_commit else None
+        if head_paths is None:
+            return
+
+        with self._lock:
+            cache = self._cache(repo_path)
+        if cache is None or paths is None:
+            cache = WorkingTreeStatCache()
+            candidates = walk_working_tree(repo_path)
+        else:
+            candidates = {}
+            for rel_path in paths:
+                try:
+                    st = os.stat(Path(repo_path) / rel_path)
+                except OSError:
+                    continue
+                candidates[rel_path] = (st.st_size, st.st_mtime_ns, st.st_ino)
+
+        seeded = []
+        with self._lock:
+            self._caches[str(repo_path)] = cache
+            for rel_path, signature in candidates.items():
+                blob_hash = head_paths.get(rel_path)
+                if blob_hash and signature[1] < started_ns:
+                    cache.store(rel_path, signature, blob_hash, started_ns)
+                    seeded.append((signature[0], rel_path, blob_hash))
+                elif rel_path in cache.entries:
+                    del cache.entries[rel_path]
+                    cache.dirty = True
+            verified = cache.verified
+
+        if not verified and seeded:
+            # Blob hashes are only usable if they are plain content hashes
+            samples = sorted(seeded)[:HASH_CHECK_SAMPLES]
+            verified = all(hash_file(Path(repo_path) / rel_path) == blob_hash for _, rel_path, blob_hash in samples)
+            if not verified:
+                logger.info("Blob hashes differ from content hashes; status will use forester")
+
+        with self._lock:
+            if cache.verified != verified:
+                cache.verified = verified
+                cache.dirty = True
+            cache.recorded_at_ns = time.time_ns()
+            # Rewritten only if an entry changed: identical trusted entries are kept
+            cache.save(repo_path)
+
+    def fast_status(self, repo_path: Path, head_commit: Optional[str] = None) -> Tuple[bool, Optional[Dict[str, Any]], Optional[str]]:
+        """
+        Repository status computed in-process, with ``forester status`` as fallback.
+
+        Args:
+            repo_path: Repository root
+            head_commit: HEAD commit hash if known; without it the CLI is used
+
+        Returns:
+            Tuple of (success, status_data, error_message), status_data in
+            the format of ForesterCLI.status() plus ``"source"``
+            (``"cache"`` or ``"cli"``)
+        """
+        success, status_data, error_msg = self._status(repo_path, head_commit)
+        if success and status_data:
+            with self._lock:
+                self._last_status[str(repo_path)] = status_data
+        return success, status_data, error_msg
+
+    def last_status(self, repo_path: Path) -> Optional[Dict[str, Any]]:
+        """Result of the last successful fast_status() call, for drawing."""
+        with self._lock:
+            return self._last_status.get(str(repo_path))
+
+    def _status(self, repo_path: Path, head_commit: Optional[str]) -> Tuple[bool, Optional[Dict[str, Any]], Optional[str]]:
+        diff = self.compare(repo_path, head_commit)
+        if diff is not None and not diff.unresolved:
+            from .history_index import get_history_index, read_head_branch
+            return True, {
+                "branch": (read_head_branch(repo_path) or get_history_index().current_branch(repo_path)
+                           or (self.last_status(repo_path) or {}).get("branch") or "main"),
+                "head": head_commit,
+                "modified": diff.modified,
+                "deleted": diff.deleted,
+                "untracked": diff.untracked,
+                "clean": diff.clean,
+                "source": "cache",
+            }, None
+        return self.cli_status(repo_path)
+
+    def cli_status(self, repo_path: Path) -> Tuple[bool, Optional[Dict[str, Any]], Optional[str]]:
+        """
+        Repository status from ``forester status``, recorded to warm the cache.
+
+        Used where the answer must match forester exactly (checkout and
+        branch-switch safety checks).
+        """
+        from .forester_cli import get_cli
+        started_ns = time.time_ns()
+        success, status_data, error_msg = get_cli().status(repo_path)
+        if success and status_data:
+            status_data["source"] = "cli"
+            self.record_status(repo_path, status_data, started_ns)
+        return success, status_data, error_msg
+
+    def record_status(self, repo_path: Path, status_data: Dict[str, Any], started_ns: int) -> None:
+        """
+        Warm the cache from a ``forester status`` result.
+
+        Files are seeded as equal to HEAD only when status reported a clean
+        working tree; a listing of changes is never used to infer that the
+        files it does not name are unchanged. Seeding walks the whole tree,
+        so it runs on a worker thread (one per repository at a time).
+
+        Args:
+            repo_path: Repository root
+            status_data: Result of ForesterCLI.status()
+            started_ns: time.time_ns() before status was run
+        """
+        # Untracked files forester did not list are ignored by .dfmignore
+        untracked = frozenset(p.strip().replace("\\", "/") for p in status_data.get("untracked", []))
+        with self._lock:
+            self._cli_untracked[str(repo_path)] = (
+                started_ns, _file_signature(Path(repo_path) / DFMIGNORE_FILE), untracked
+            )
+        head = (status_data.get("head") or "").strip().lower()
+        if not head:
+            return
+        key = str(repo_path)
+        with self._lock:
+            self._last_status[key] = status_data
+            if not status_data.get("clean") or key in self._seeding:
+                return
+            cache = self._cache(repo_path)
+            if cache is not None and cache.verified and cache.recorded_at_ns > started_ns:
+                return
+            self._seeding.add(key)
+        threading.Thread(
+            target=self._seed_worker,
+            args=(Path(repo_path), head, started_ns),
+            name="dfm-worktree-seed",
+            daemon=True
+        ).start()
+
+    def _seed_worker(self, repo_path: Path, head_commit: str, started_ns: int) -> None:
+        try:
+            self.seed(repo_path, head_commit, started_ns)
+        except Exception as e:
+            logger.debug(f"Seeding the stat cache failed: {e}")
+        finally:
+            with self._lock:
+                self._seeding.discard(str(repo_path))
+
+    def invalidate(self, repo_path: Optional[Path] = None) -> None:
+        """Forget in-memory state (all repositories if repo_path is None)."""
+        with self._lock:
+            if repo_path is None:
+                self._caches.clear()
+                self._last_status.clear()
+                self._cli_untracked.clear()
+            else:
+                self._caches.pop(str(repo_path), None)
+                self._last_status.pop(str(repo_path), None)
+                self._cli_untracked.pop(str(repo_path), None)
+            self._trees = {}
+
+
+# Global instance
+_working_tree_instance: Optional[WorkingTree] = None
+
+
+def get_working_tree() -> WorkingTree:
+    """Get global working tree state instance."""
+    global _working_tree_instance
+    if _working_tree_instance is None:
+        _working_tree_instance = WorkingTree()
+    return _working_tree_instance
+
+
+def fast_status(repo_path: Path, head_commit: Optional[str] = None) -> Tuple[bool, Optional[Dict[str, Any]], Optional[str]]:
+    """Shortcut for ``get_working_tree().fast_status()``."""
+    return get_working_tree().fast_status(repo_path, head_commit)
+
+
+def cli_status(repo_path: Path) -> Tuple[bool, Optional[Dict[str, Any]], Optional[str]]:
+    """Shortcut for ``get_working_tree().cli_status()``."""
+    return get_working_tree().cli_status(repo_path)
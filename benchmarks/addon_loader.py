@@ -0,0 +1,113 @@
+"""
+Import add-on modules outside Blender.
+
+Installs a permissive ``bpy`` stub (any attribute is a class that can be
+subclassed, called or used as a decorator argument) and registers bare
+package objects for ``difference_machine`` and its subpackages, so a single
+module can be imported without running the add-on's ``__init__`` files
+(which set up logging and import every operator).
+
+Only code paths that do not touch Blender data can be exercised this way.
+"""
+
+import importlib
+import sys
+import types
+from pathlib import Path
+
+ADDON_DIR = Path(__file__).resolve().parent.parent / "addons" / "blender" / "difference_machine"
+PACKAGE = "difference_machine"
+SUBPACKAGES = ("utils", "operators", "properties", "ui")
+
+
+class _StubModule(types.ModuleType):
+    """Module whose unknown attributes are stub classes."""
+
+    def __getattr__(self, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        value = type(name, (), {
+            "__init__": lambda self, *args, **kwargs: None,
+            "__call__": lambda self, *args, **kwargs: None,
+        })
+        setattr(self, name, value)
+        return value
+
+
+def _persistent(func):
+    return func
+
+
+class _Timers:
+    """bpy.app.timers stand-in; registered callbacks never run."""
+
+    def __init__(self):
+        self._registered = set()
+
+    def register(self, func, first_interval=0.0, persistent=False):
+        self._registered.add(func)
+
+    def unregister(self, func):
+        if func not in self._registered:
+            raise ValueError("timer not registered")
+        self._registered.discard(func)
+
+    def is_registered(self, func):
+        return func in self._registered
+
+
+def install_bpy_stub() -> types.ModuleType:
+    """Install the ``bpy`` stub into ``sys.modules`` (idempotent)."""
+    existing = sys.modules.get("bpy")
+    if existing is not None:
+        return existing
+
+    bpy = _StubModule("bpy")
+    for name in ("types", "props", "utils", "path", "ops", "app", "data", "context"):
+        module = _StubModule(f"bpy.{name}")
+        setattr(bpy, name, module)
+        sys.modules[f"bpy.{name}"] = module
+
+    handlers = _StubModule("bpy.app.handlers")
+    handlers.persistent = _persistent
+    for name in ("depsgraph_update_pre", "depsgraph_update_post", "load_pre", "load_post",
+                 "save_pre", "save_post", "undo_pre", "undo_post", "redo_pre", "redo_post"):
+        setattr(handlers, name, [])
+    bpy.app.handlers = handlers
+    bpy.app.timers = _Timers()
+    bpy.app.version = (4, 5, 0)
+    bpy.app.background = True
+    sys.modules["bpy.app.handlers"] = handlers
+
+    bpy.data.filepath = ""
+    bpy.data.images = []
+    bpy.data.libraries = []
+    bpy.data.objects = []
+    bpy.data.materials = []
+    bpy.path.abspath = lambda path, **kwargs: path
+
+    sys.modules["bpy"] = bpy
+    return bpy
+
+
+def _register_package(name: str, path: Path) -> None:
+    if name in sys.modules:
+        return
+    package = types.ModuleType(name)
+    package.__path__ = [str(path)]
+    package.__package__ = name
+    sys.modules[name] = package
+
+
+def load_addon_module(dotted: str) -> types.ModuleType:
+    """
+    Import ``difference_machine.<dotted>`` with ``bpy`` stubbed.
+
+    Example:
+        forester_cli = load_addon_module("utils.forester_cli")
+    """
+    install_bpy_stub()
+    _register_package(PACKAGE, ADDON_DIR)
+    for sub in SUBPACKAGES:
+        _register_package(f"{PACKAGE}.{sub}", ADDON_DIR / sub)
+    return importlib.import_module(f"{PACKAGE}.{dotted}")
@@ -0,0 +1,101 @@
+"""
+Benchmark: logging overhead in add-on hot loops.
+
+Runs a texture-to-node lookup loop shaped like ``load_textures_to_material``
+with f-string (eager) and %-style (lazy) debug calls, with the add-on logger
+at INFO and at DEBUG. Uses the add-on's own logging setup (queue handler +
+rotating file), loaded directly so Blender is not required.
+
+Usage:
+    python benchmarks/bench_logging.py [--nodes 400] [--textures 200] [--repeat 5]
+"""
+
+import argparse
+import importlib.util
+import logging
+import tempfile
+import time
+from pathlib import Path
+
+ADDON_DIR = Path(__file__).resolve().parent.parent / "addons" / "blender" / "difference_machine"
+
+
+def _load_logging_config():
+    spec = importlib.util.spec_from_file_location(
+        "dm_logging_config", ADDON_DIR / "utils" / "logging_config.py"
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class _Node:
+    __slots__ = ("name", "type")
+
+    def __init__(self, name, node_type):
+        self.name = name
+        self.type = node_type
+
+
+def _lookup_eager(logger, nodes, textures):
+    logger.debug(f"Nodes in material: {[n.name + ' (' + n.type + ')' for n in nodes]}")
+    found = 0
+    for tex in textures:
+        logger.debug(f"Looking for texture node: {tex}")
+        for node in nodes:
+            if node.name == tex and node.type == 'TEX_IMAGE':
+                logger.debug(f"Found texture node: {node.name}")
+                found += 1
+                break
+    return found
+
+
+def _lookup_lazy(logger, nodes, textures):
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Nodes in material: %s", [n.name + ' (' + n.type + ')' for n in nodes])
+    found = 0
+    for tex in textures:
+        logger.debug("Looking for texture node: %s", tex)
+        for node in nodes:
+            if node.name == tex and node.type == 'TEX_IMAGE':
+                logger.debug("Found texture node: %s", node.name)
+                found += 1
+                break
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--nodes", type=int, default=400)
+    parser.add_argument("--textures", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    logging_config = _load_logging_config()
+    nodes = [_Node(f"Image Texture.{i:03d}", 'TEX_IMAGE' if i % 2 else 'BSDF_PRINCIPLED') for i in range(args.nodes)]
+    textures = [f"Image Texture.{i:03d}" for i in range(1, args.nodes, max(1, args.nodes // args.textures))][:args.textures]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        logging_config.setup_logging(logging.INFO, Path(tmp) / "bench.log")
+        logger = logging_config.get_logger("bench")
+        # Keep console quiet: only the rotating file receives records
+        listener = logging_config._listener
+        listener.handlers = tuple(h for h in listener.handlers if not isinstance(h, logging.StreamHandler)
+                                  or isinstance(h, logging.FileHandler))
+
+        print(f"{'level':<8}{'style':<8}{'best ms':>10}")
+        for level in ('INFO', 'DEBUG'):
+            logging_config.set_log_level(level)
+            for style, func in (('eager', _lookup_eager), ('lazy', _lookup_lazy)):
+                best = float('inf')
+                for _ in range(args.repeat):
+                    start = time.perf_counter()
+                    func(logger, nodes, textures)
+                    best = min(best, time.perf_counter() - start)
+                print(f"{level:<8}{style:<8}{best * 1000:>10.2f}")
+
+        logging_config.shutdown_logging()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""
+Benchmark: object-store reads and CLI output parsing at repository scale.
+
+Generates synthetic repositories (see ``synthetic_repo.py``) and times the
+add-on's own code paths with ``bpy`` stubbed:
+
+    commit lookup (scan)   _find_object_in_scene_file_from_commit, commit not at its hash path
+    blob resolution        _find_mesh_in_commit_by_object_name, commit at its hash path
+    tree walk              read + parse the trees of the newest 1000 commits
+    temp cleanup           _cleanup_temp_subdirs on .DFM/preview_temp (main-thread cost)
+    log parse              ForesterCLI._parse_log_output on full log output
+    log parse (since)      same, limited to the last 7 days
+    status parse           ForesterCLI._parse_status_output
+
+Each case runs until ``--min-time`` has elapsed (at least once) and reports
+min / median per call.
+
+Usage:
+    python benchmarks/bench_object_store.py [--scales 100,10000,100000] [--workdir DIR]
+"""
+
+import argparse
+import json
+import logging
+import shutil
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from addon_loader import load_addon_module
+from synthetic_repo import generate_repo
+
+TREE_WALK_COMMITS = 1000
+TEMP_DIRS = 50
+TEMP_FILES_PER_DIR = 20
+
+
+def _run(func, setup=None, min_time: float = 0.5, max_rounds: int = 200):
+    """Call func repeatedly; return (min, median, rounds) in seconds."""
+    samples = []
+    deadline = time.perf_counter() + min_time
+    while not samples or (time.perf_counter() < deadline and len(samples) < max_rounds):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return min(samples), statistics.median(samples), len(samples)
+
+
+def _make_temp_dirs(repo_root: Path) -> None:
+    temp_dir = repo_root / ".DFM" / "preview_temp"
+    for i in range(TEMP_DIRS):
+        sub = temp_dir / f"preview_{i:04d}"
+        sub.mkdir(parents=True, exist_ok=True)
+        for j in range(TEMP_FILES_PER_DIR):
+            (sub / f"file_{j}.bin").write_bytes(b"\0" * 1024)
+
+
+def _tree_walk(repo) -> int:
+    trees_dir = repo.dfm / "objects" / "trees" / "sha256"
+    count = 0
+    for commit in repo.commits[:TREE_WALK_COMMITS]:
+        tree_hash = commit["tree_hash"]
+        with open(trees_dir / tree_hash[:2] / tree_hash[2:], "r", encoding="utf-8") as f:
+            count += len(json.loads(f.read()).get("entries", []))
+    return count
+
+
+def bench_scale(scale: int, workdir: Path, min_time: float) -> None:
+    history = load_addon_module("operators.history_lookup")
+    helpers = load_addon_module("operators.operator_helpers")
+    forester_cli = load_addon_module("utils.forester_cli")
+    deleter = load_addon_module("utils.deferred_delete").get_deferred_deleter()
+
+    root = workdir / f"repo_{scale}"
+    start = time.perf_counter()
+    repo = generate_repo(root, commits=scale)
+    print(f"\n== {scale} commits (generated in {time.perf_counter() - start:.1f}s) ==")
+
+    scan_hash = next(c["hash"] for c in reversed(repo.commits) if c["hash"] not in repo.direct_hashes)
+    direct_hash = repo.direct_hashes[0] if repo.direct_hashes else repo.commits[0]["hash"]
+    cli = forester_cli.ForesterCLI()
+    log_text = repo.log_output()
+    status_text = repo.status_output()
+    week_ago = repo.commits[0]["timestamp"] - 7 * 86400
+
+    # A parser that drops the indented file lists would be fast and wrong
+    parsed = cli._parse_status_output(status_text)
+    expected = (min(50, len(repo.blend_names)), 20)
+    if (len(parsed["modified"]), len(parsed["untracked"])) != expected:
+        raise SystemExit(f"status parse check failed: got {len(parsed['modified'])} modified, "
+                         f"{len(parsed['untracked'])} untracked, expected {expected}")
+
+    def wait_for_trash():
+        while deleter.stats()[0]:
+            time.sleep(0.01)
+
+    def temp_setup():
+        wait_for_trash()
+        _make_temp_dirs(root)
+
+    cases = [
+        ("commit lookup (scan)", lambda: history._find_object_in_scene_file_from_commit(
+            root, scan_hash, "missing.blend", "Cube"), None),
+        ("blob resolution", lambda: history._find_mesh_in_commit_by_object_name(
+            root, direct_hash, "scene"), None),
+        ("tree walk", lambda: _tree_walk(repo), None),
+        ("temp cleanup", lambda: helpers._cleanup_temp_subdirs(root, "preview_temp"), temp_setup),
+        ("log parse", lambda: cli._parse_log_output(log_text), None),
+        ("log parse (since)", lambda: cli._parse_log_output(log_text, since=week_ago), None),
+        ("status parse", lambda: cli._parse_status_output(status_text), None),
+    ]
+
+    print(f"{'case':<24}{'min ms':>12}{'median ms':>12}{'rounds':>8}")
+    for name, func, setup in cases:
+        best, median, rounds = _run(func, setup=setup, min_time=min_time)
+        print(f"{name:<24}{best * 1000:>12.3f}{median * 1000:>12.3f}{rounds:>8}")
+    wait_for_trash()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scales", default="100,10000,100000",
+                        help="Comma-separated commit counts")
+    parser.add_argument("--workdir", type=Path, default=None,
+                        help="Keep generated repositories here (reused between runs)")
+    parser.add_argument("--min-time", type=float, default=0.5,
+                        help="Seconds to spend per case")
+    args = parser.parse_args()
+
+    # Keep "not found" warnings from the measured functions out of the table
+    load_addon_module("utils.logging_config").setup_logging(log_level=logging.ERROR)
+
+    scales = [int(s) for s in args.scales.split(",") if s.strip()]
+    if args.workdir:
+        args.workdir.mkdir(parents=True, exist_ok=True)
+        for scale in scales:
+            bench_scale(scale, args.workdir, args.min_time)
+        return
+
+    workdir = Path(tempfile.mkdtemp(prefix="dfm-bench-"))
+    try:
+        for scale in scales:
+            bench_scale(scale, workdir, args.min_time)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
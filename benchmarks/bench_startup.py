@@ -0,0 +1,109 @@
+"""
+Benchmark: add-on import and register() time.
+
+Every run happens in a fresh process so module imports are cold (compiled
+``.pyc`` files are reused, as on a render farm after the first start).
+Reports the time to import the ``difference_machine`` package and to run
+its ``register()``, plus the add-on modules that were loaded.
+
+In Blender:
+    blender --background --factory-startup --python benchmarks/bench_startup.py -- [--runs 10]
+
+Without Blender (``bpy`` stubbed, measures the Python side only):
+    python benchmarks/bench_startup.py [--runs 10]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+ADDON_PARENT = BENCH_DIR.parent / "addons" / "blender"
+
+
+def _in_blender() -> bool:
+    try:
+        import bpy
+        return bool(getattr(bpy.app, "binary_path", ""))
+    except ImportError:
+        return False
+
+
+def measure_once() -> dict:
+    if not _in_blender():
+        sys.path.insert(0, str(BENCH_DIR))
+        from addon_loader import install_bpy_stub
+        install_bpy_stub()
+    sys.path.insert(0, str(ADDON_PARENT))
+
+    start = time.perf_counter()
+    import difference_machine
+    imported = time.perf_counter()
+    difference_machine.register()
+    registered = time.perf_counter()
+
+    modules = sorted(name for name in sys.modules if name.startswith("difference_machine."))
+    difference_machine.unregister()
+
+    # Flush the add-on's log listener so its output cannot interleave with ours
+    from difference_machine.utils.logging_config import shutdown_logging
+    shutdown_logging()
+    return {
+        "import_ms": (imported - start) * 1000.0,
+        "register_ms": (registered - imported) * 1000.0,
+        "modules": modules,
+    }
+
+
+def _child_command(argv_tail):
+    if _in_blender():
+        import bpy
+        return [bpy.app.binary_path, "--background", "--factory-startup",
+                "--python", str(Path(__file__).resolve()), "--"] + argv_tail
+    return [sys.executable, str(Path(__file__).resolve())] + argv_tail
+
+
+def main() -> None:
+    argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else sys.argv[1:]
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--once", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--list-modules", action="store_true", help="Print add-on modules loaded by register()")
+    args = parser.parse_args(argv)
+
+    if args.once:
+        print("DFM_STARTUP " + json.dumps(measure_once()), flush=True)
+        return
+
+    results = []
+    with tempfile.TemporaryDirectory(prefix="dfm-startup-") as home:
+        # Log file and config lookups go to a throwaway HOME
+        env = dict(os.environ, HOME=home)
+        for _ in range(args.runs + 1):
+            output = subprocess.run(_child_command(["--once"]), capture_output=True, text=True, env=env).stdout
+            for line in output.splitlines():
+                if line.startswith("DFM_STARTUP "):
+                    results.append(json.loads(line[len("DFM_STARTUP "):]))
+    if not results:
+        raise SystemExit("no measurements (child process failed)")
+    # First run may compile .pyc files
+    results = results[1:] or results
+
+    print(f"{'':<12}{'min ms':>10}{'median ms':>12}")
+    for key in ("import_ms", "register_ms"):
+        values = [r[key] for r in results]
+        print(f"{key[:-3]:<12}{min(values):>10.2f}{statistics.median(values):>12.2f}")
+    print(f"add-on modules loaded: {len(results[-1]['modules'])}")
+    if args.list_modules:
+        for name in results[-1]["modules"]:
+            print(f"  {name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+"""
+Forester call budgets per UI action.
+
+Runs add-on actions against the record/replay fake (``fake_forester.py``)
+in a sandbox HOME and fails if an action spawns more forester processes
+than its budget allows. Budgets are per subcommand, so a regression such
+as a status call inside a per-branch loop shows up as an exceeded
+``status`` count rather than a slightly larger total.
+
+Inside Blender (registers the add-on from this checkout):
+
+    blender --background --factory-startup --python-exit-code 1 \\
+        --python benchmarks/call_budgets.py -- [--latency-ms 20]
+
+Without Blender, ``--cli-only`` checks that each ForesterCLI method costs
+exactly one process against the same fake (``bpy`` stubbed):
+
+    python benchmarks/call_budgets.py --cli-only
+"""
+
+import argparse
+import sys
+import types
+from collections import Counter
+from pathlib import Path
+from typing import Callable, Dict, List
+
+BENCH_DIR = Path(__file__).resolve().parent
+if str(BENCH_DIR) not in sys.path:
+    sys.path.insert(0, str(BENCH_DIR))
+
+from forester_sandbox import ForesterSandbox  # noqa: E402
+
+ADDON_DIR = BENCH_DIR.parent / "addons" / "blender" / "difference_machine"
+
+
+def _count_calls(calls: List[Dict], label: Callable[[List[str]], str]) -> Counter:
+    return Counter(label(call["args"]) for call in calls)
+
+
+def _check(name: str, counts: Counter, budget: Dict[str, int], unmatched: int) -> bool:
+    """Print one result row; subcommands missing from the budget allow 0 calls."""
+    over = {sub: n for sub, n in counts.items() if n > budget.get(sub, 0)}
+    ok = not over and not unmatched
+    used = ", ".join(f"{sub}={n}" for sub, n in sorted(counts.items())) or "none"
+    allowed = ", ".join(f"{sub}<={n}" for sub, n in sorted(budget.items())) or "none"
+    print(f"{'PASS' if ok else 'FAIL'}  {name:<18} calls: {used:<40} budget: {allowed}")
+    if unmatched:
+        print(f"      {unmatched} call(s) had no recording in the cassette")
+    return ok
+
+
+class _LayoutRecorder:
+    """UILayout stand-in: every method returns another recorder."""
+
+    def __getattr__(self, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        return lambda *args, **kwargs: _LayoutRecorder()
+
+
+class _PanelProxy:
+    """Lets a Panel's ``draw`` run without a real region."""
+
+    def __init__(self, panel_cls):
+        self._panel_cls = panel_cls
+        self.layout = _LayoutRecorder()
+
+    def __getattr__(self, name):
+        value = getattr(self._panel_cls, name)
+        if isinstance(value, types.FunctionType):
+            return types.MethodType(value, self)
+        return value
+
+
+def _draw_sidebar(context) -> int:
+    """Run poll + draw of every add-on panel once; returns panels drawn."""
+    from difference_machine.ui import ui_panels
+    import bpy
+
+    drawn = 0
+    for value in vars(ui_panels).values():
+        if not (isinstance(value, type) and issubclass(value, bpy.types.Panel)):
+            continue
+        if value is bpy.types.Panel or value.__module__ != ui_panels.__name__:
+            continue
+        poll = getattr(value, "poll", None)
+        if poll is not None and not poll(context):
+            continue
+        value.draw(_PanelProxy(value), context)
+        drawn += 1
+    return drawn
+
+
+def run_in_blender(args) -> bool:
+    import bpy
+
+    sandbox = ForesterSandbox(commits=args.commits, latency_ms=args.latency_ms).activate()
+    try:
+        sys.path.insert(0, str(ADDON_DIR.parent))
+        import difference_machine
+        from difference_machine.utils.forester_cli import cli_subcommand_label
+        difference_machine.register()
+
+        bpy.ops.wm.save_as_mainfile(filepath=str(sandbox.repo.root / "scene.blend"))
+        head = sandbox.repo.commits[0]["hash"]
+        n_branches = len(sandbox.branches)
+
+        actions = [
+            ("refresh history", lambda: bpy.ops.df.refresh_history(),
+             {"status": 1, "log": 1}),
+            ("refresh branches", lambda: bpy.ops.df.refresh_branches(),
+             # branch list, one log per branch, then refresh history
+             {"branch": 1, "log": n_branches + 1, "status": 1}),
+            ("open sidebar", lambda: _draw_sidebar(bpy.context),
+             # only background prefetch of the selected commit and its neighbours
+             {"show": 7}),
+            ("compare", lambda: (bpy.ops.df.compare_project(commit_hash=head),
+                                 bpy.ops.df.compare_project(commit_hash=head)),
+             # open and close
+             {"compare": 2}),
+        ]
+
+        all_ok = True
+        for name, action, budget in actions:
+            sandbox.reset_calls()
+            action()
+            calls = sandbox.wait_idle()
+            unmatched = sum(1 for call in calls if not call["matched"])
+            all_ok &= _check(name, _count_calls(calls, cli_subcommand_label), budget, unmatched)
+
+        difference_machine.unregister()
+        return all_ok
+    finally:
+        sandbox.cleanup()
+
+
+def _batch_result(results: Dict) -> tuple:
+    """Collapse per-path lock results into the (success, ..., error) shape."""
+    errors = [error for ok, error in results.values() if not ok]
+    return (not errors, errors[0] if errors else None)
+
+
+def run_cli_only(args) -> bool:
+    from addon_loader import load_addon_module
+
+    sandbox = ForesterSandbox(commits=args.commits, latency_ms=args.latency_ms).activate()
+    try:
+        forester_cli = load_addon_module("utils.forester_cli")
+        cli = forester_cli.ForesterCLI()
+        repo_path = sandbox.repo.root
+        head = sandbox.repo.commits[0]["hash"]
+
+        checks = [
+            ("status", lambda: cli.status(repo_path)),
+            ("log", lambda: cli.log(repo_path, limit=None)),
+            ("log", lambda: cli.log(repo_path, branch="feature", limit=1)),
+            ("branch", lambda: cli.branch(repo_path, action="list")),
+            ("show", lambda: cli.show(repo_path, head)),
+            ("lock list", lambda: cli.list_locks(repo_path)),
+            ("compare", lambda: cli.compare(repo_path, head)),
+            # A batch that succeeds must not list locks around it
+            ("lock", lambda: _batch_result(cli.lock_files(repo_path, ["a.blend", "b.png"]))),
+            ("lock unlock", lambda: _batch_result(cli.unlock_files(repo_path, ["a.blend", "b.png"]))),
+        ]
+
+        all_ok = True
+        for sub, call in checks:
+            sandbox.reset_calls()
+            result = call()
+            calls = sandbox.calls()
+            unmatched = sum(1 for c in calls if not c["matched"])
+            all_ok &= _check(f"cli {sub}", _count_calls(calls, forester_cli.cli_subcommand_label),
+                             {sub: 1}, unmatched)
+            if not result[0]:
+                print(f"      call failed: {result[-1]}")
+                all_ok = False
+        return all_ok
+    finally:
+        sandbox.cleanup()
+
+
+def main() -> None:
+    argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else sys.argv[1:]
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cli-only", action="store_true", help="Run without Blender")
+    parser.add_argument("--commits", type=int, default=50, help="Commits in the synthetic repository")
+    parser.add_argument("--latency-ms", type=int, default=0, help="Latency added to every fake call")
+    args = parser.parse_args(argv)
+
+    try:
+        import bpy  # noqa: F401
+        in_blender = True
+    except ImportError:
+        in_blender = False
+
+    if args.cli_only:
+        ok = run_cli_only(args)
+    elif in_blender:
+        ok = run_in_blender(args)
+    else:
+        parser.error("not running inside Blender; use --cli-only or run via blender --python")
+    raise SystemExit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Record/replay stand-in for the forester CLI.
+
+Point ``~/.dfm-setup/setup.cfg`` at a copy of this script (see
+``call_budgets.py``, which does this in a sandbox HOME). Settings are read
+from ``fake_forester.json`` next to the executable:
+
+    {
+        "mode": "replay",                  # or "record"
+        "cassette": "cassette.json",       # recordings, relative to this file
+        "calls_log": "calls.jsonl",        # one JSON line per invocation
+        "latency_ms": 0,                   # added to every replayed call
+        "real_forester": "/path/to/forester"   # record mode only
+    }
+
+Cassette format::
+
+    {"recordings": [
+        {"args": ["log", "*"], "exit_code": 0, "stdout": "...", "stderr": "",
+         "create_dirs": [".DFM/tmp_review"]}
+    ]}
+
+``"*"`` matches one argument and ``"**"`` the rest of the command line; the
+first matching recording wins. ``create_dirs`` (relative to the working
+directory) stands in for side effects such as ``compare`` extracting a
+commit. Unmatched calls exit with code 1 and are marked in the calls log.
+
+In record mode every call is forwarded to ``real_forester`` and appended
+to the cassette with its exact arguments.
+"""
+
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+CONFIG_NAME = "fake_forester.json"
+
+
+def _load_json(path: Path, default):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return default
+
+
+def _matches(pattern, args) -> bool:
+    for index, token in enumerate(pattern):
+        if token == "**":
+            return True
+        if index >= len(args):
+            return False
+        if token != "*" and token != args[index]:
+            return False
+    return len(pattern) == len(args)
+
+
+def _find_recording(recordings, args):
+    for recording in recordings:
+        if _matches(recording.get("args", []), args):
+            return recording
+    return None
+
+
+def _log_call(log_path: Path, entry) -> None:
+    # Append is atomic enough for one short line per call from parallel workers
+    with open(log_path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(entry) + "\n")
+
+
+def _record(config, cassette_path: Path, args):
+    result = subprocess.run(
+        [config["real_forester"]] + args,
+        capture_output=True,
+        text=True,
+    )
+    cassette = _load_json(cassette_path, {"recordings": []})
+    cassette.setdefault("recordings", []).append({
+        "args": args,
+        "exit_code": result.returncode,
+        "stdout": result.stdout,
+        "stderr": result.stderr,
+    })
+    with open(cassette_path, "w", encoding="utf-8") as f:
+        json.dump(cassette, f, indent=2)
+    return result.returncode, result.stdout, result.stderr, True
+
+
+def _replay(config, cassette_path: Path, args):
+    recording = _find_recording(_load_json(cassette_path, {}).get("recordings", []), args)
+    latency = config.get("latency_ms", 0)
+    if latency:
+        time.sleep(latency / 1000.0)
+    if recording is None:
+        return 1, "", f"fake forester: no recording for {' '.join(args)}\n", False
+
+    for directory in recording.get("create_dirs", []):
+        Path(os.getcwd(), directory).mkdir(parents=True, exist_ok=True)
+    return recording.get("exit_code", 0), recording.get("stdout", ""), recording.get("stderr", ""), True
+
+
+def main() -> int:
+    here = Path(os.path.realpath(sys.argv[0])).parent
+    config = _load_json(here / CONFIG_NAME, {})
+    cassette_path = here / config.get("cassette", "cassette.json")
+    args = sys.argv[1:]
+
+    start = time.perf_counter()
+    if config.get("mode") == "record":
+        exit_code, stdout, stderr, matched = _record(config, cassette_path, args)
+    else:
+        exit_code, stdout, stderr, matched = _replay(config, cassette_path, args)
+
+    _log_call(here / config.get("calls_log", "calls.jsonl"), {
+        "time": time.time(),
+        "args": args,
+        "cwd": os.getcwd(),
+        "matched": matched,
+        "exit_code": exit_code,
+        "elapsed_ms": round((time.perf_counter() - start) * 1000.0, 3),
+    })
+
+    sys.stdout.write(stdout)
+    sys.stderr.write(stderr)
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,140 @@
+"""
+Sandboxed forester setup backed by ``fake_forester.py``.
+
+Creates a throwaway HOME containing ``.dfm-setup/setup.cfg`` that points at
+a copy of the fake executable, a synthetic repository, and a default
+cassette answering status/log/branch/show/compare and lock list/lock/unlock
+for that repository. While active, ``HOME`` points at the sandbox so the
+add-on's config loader picks up the fake.
+"""
+
+import configparser
+import json
+import os
+import shutil
+import stat
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from synthetic_repo import SyntheticRepo, generate_repo
+
+FAKE_FORESTER = Path(__file__).resolve().parent / "fake_forester.py"
+
+
+def default_recordings(repo: SyntheticRepo, branches: List[str]) -> List[Dict]:
+    """Recordings that let the add-on browse ``repo`` read-only."""
+    head = repo.commits[0]
+    return [
+        {"args": ["status"], "stdout": repo.status_output(modified=0, untracked=0)},
+        {"args": ["log"], "stdout": repo.log_output()},
+        {"args": ["log", "*"], "stdout": repo.log_output()},
+        {"args": ["branch"], "stdout": repo.branch_output(branches)},
+        {"args": ["show", "*"], "stdout": repo.show_output(head)},
+        {"args": ["compare", "**"], "stdout": "", "create_dirs": [".DFM/tmp_review"]},
+        {"args": ["lock", "list"], "stdout": "No locks found\n"},
+        {"args": ["lock", "unlock", "**"], "stdout": ""},
+        {"args": ["lock", "**"], "stdout": ""},
+    ]
+
+
+class ForesterSandbox:
+    """Temporary HOME with a fake forester and a synthetic repository."""
+
+    def __init__(
+        self,
+        commits: int = 50,
+        branches: Optional[List[str]] = None,
+        latency_ms: int = 0,
+        mode: str = "replay",
+        real_forester: Optional[str] = None,
+    ):
+        self.root = Path(tempfile.mkdtemp(prefix="dfm-sandbox-"))
+        self.home = self.root / "home"
+        self.bin_dir = self.root / "bin"
+        self.branches = branches or ["main", "feature", "lighting"]
+        self.repo = generate_repo(self.root / "project", commits=commits)
+        self.executable = self.bin_dir / "forester"
+        self.calls_log = self.bin_dir / "calls.jsonl"
+        self._saved_home: Optional[str] = None
+
+        self.bin_dir.mkdir(parents=True)
+        shutil.copy(FAKE_FORESTER, self.executable)
+        self.executable.chmod(self.executable.stat().st_mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
+
+        config = {
+            "mode": mode,
+            "cassette": "cassette.json",
+            "calls_log": self.calls_log.name,
+            "latency_ms": latency_ms,
+        }
+        if real_forester:
+            config["real_forester"] = real_forester
+        self._write_json(self.bin_dir / "fake_forester.json", config)
+        if mode == "replay":
+            self.set_recordings(default_recordings(self.repo, self.branches))
+
+        setup_dir = self.home / ".dfm-setup"
+        setup_dir.mkdir(parents=True)
+        parser = configparser.ConfigParser()
+        parser["forester"] = {"path": str(self.executable)}
+        with open(setup_dir / "setup.cfg", "w", encoding="utf-8") as f:
+            parser.write(f)
+
+    @staticmethod
+    def _write_json(path: Path, data) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+
+    def set_recordings(self, recordings: List[Dict]) -> None:
+        """Replace the cassette (earlier entries win on overlapping patterns)."""
+        self._write_json(self.bin_dir / "cassette.json", {"recordings": recordings})
+
+    def activate(self) -> "ForesterSandbox":
+        """Point HOME at the sandbox."""
+        if self._saved_home is None:
+            self._saved_home = os.environ.get("HOME", "")
+            os.environ["HOME"] = str(self.home)
+        return self
+
+    def deactivate(self) -> None:
+        if self._saved_home is not None:
+            os.environ["HOME"] = self._saved_home
+            self._saved_home = None
+
+    def cleanup(self) -> None:
+        self.deactivate()
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def __enter__(self) -> "ForesterSandbox":
+        return self.activate()
+
+    def __exit__(self, *exc) -> None:
+        self.cleanup()
+
+    def reset_calls(self) -> None:
+        self.calls_log.unlink(missing_ok=True)
+
+    def calls(self) -> List[Dict]:
+        """Invocations logged since the last reset."""
+        try:
+            with open(self.calls_log, "r", encoding="utf-8") as f:
+                return [json.loads(line) for line in f if line.strip()]
+        except FileNotFoundError:
+            return []
+
+    def wait_idle(self, quiet: float = 0.5, timeout: float = 10.0) -> List[Dict]:
+        """Wait until no new calls arrive for ``quiet`` seconds (background workers)."""
+        deadline = time.monotonic() + timeout
+        count = -1
+        last_change = time.monotonic()
+        while time.monotonic() < deadline:
+            current = len(self.calls())
+            if current != count:
+                count = current
+                last_change = time.monotonic()
+            elif time.monotonic() - last_change >= quiet:
+                break
+            time.sleep(0.05)
+        return self.calls()
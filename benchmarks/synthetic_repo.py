@@ -0,0 +1,215 @@
+"""
+Synthetic ``.DFM`` repository generator.
+
+Builds an object store with the layout and JSON shapes the add-on reads
+directly (see ``_find_object_in_scene_file_from_commit``):
+
+    .DFM/objects/commits/sha256/<h[:2]>/<h[2:]>   {"hash", "tree_hash", "parent_hash", ...}
+    .DFM/objects/trees/sha256/<h[:2]>/<h[2:]>     {"entries": [{"hash", "name", "type"}, ...]}
+    .DFM/objects/blobs/sha256/<h[:2]>/<h[2:]>     raw bytes
+
+Commit files are stored under the hash of their JSON content, like
+forester does, so only a fraction (``direct_ratio``) is reachable by the
+commit hash path; the rest are only found by scanning. Each commit
+changes a few tree entries, blobs are drawn from a shared pool, and
+matching ``forester log`` / ``forester status`` text is produced for the
+CLI parsers.
+
+Usage:
+    python benchmarks/synthetic_repo.py OUT_DIR --commits 10000 --entries 20
+"""
+
+import argparse
+import hashlib
+import json
+import random
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List, Dict
+
+COMMIT_DATE_FORMAT = "%a %b %d %H:%M:%S %Y +0000"
+
+
+@dataclass
+class SyntheticRepo:
+    """Description of a generated repository."""
+    root: Path
+    commits: List[Dict] = field(default_factory=list)   # newest first
+    blend_names: List[str] = field(default_factory=list)
+    blob_hashes: List[str] = field(default_factory=list)
+    direct_hashes: List[str] = field(default_factory=list)  # reachable by commit hash path
+
+    @property
+    def dfm(self) -> Path:
+        return self.root / ".DFM"
+
+    def log_output(self) -> str:
+        """Text in the format parsed by ``ForesterCLI._parse_log_output``."""
+        lines = []
+        for index, commit in enumerate(self.commits):
+            lines.append(f"commit {commit['hash']}")
+            if index == 0:
+                lines.append("HEAD: true")
+            lines.append(f"Author: {commit['author']}")
+            lines.append("Date:   " + time.strftime(COMMIT_DATE_FORMAT, time.gmtime(commit["timestamp"])))
+            lines.append("")
+            lines.append(f"    {commit['message']}")
+            lines.append("")
+        return "\n".join(lines)
+
+    def show_output(self, commit: Dict) -> str:
+        """Text in the format parsed by ``ForesterCLI._parse_show_output``."""
+        lines = [
+            f"commit {commit['hash']}",
+            f"Author: {commit['author']}",
+            "Date:   " + time.strftime(COMMIT_DATE_FORMAT, time.gmtime(commit["timestamp"])),
+            f"Parent: {commit['parent_hash']}",
+            f"Tree: {commit['tree_hash']}",
+            f"Type: {commit['commit_type']}",
+            "",
+            f"    {commit['message']}",
+            "",
+            "Files:",
+        ]
+        lines.extend(f"  {name}" for name in self.blend_names)
+        return "\n".join(lines)
+
+    def branch_output(self, branches: List[str], current: str = "main") -> str:
+        """Text in the format parsed by ``ForesterCLI._parse_branch_list_output``."""
+        return "\n".join(("* " if name == current else "  ") + name for name in branches)
+
+    def status_output(self, modified: int = 50, untracked: int = 20) -> str:
+        """Text in the format parsed by ``ForesterCLI._parse_status_output``."""
+        head = self.commits[0]["hash"] if self.commits else ""
+        lines = ["On branch main", f"HEAD: {head}", "", "Modified files:"]
+        lines.extend(f"  {name}" for name in self.blend_names[:modified])
+        lines.append("")
+        lines.append("Untracked files:")
+        lines.extend(f"  textures/new_{i:05d}.png" for i in range(untracked))
+        return "\n".join(lines)
+
+
+def _sha(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def _write_object(kind_dir: Path, digest: str, data: bytes) -> None:
+    target = kind_dir / digest[:2] / digest[2:]
+    if target.exists():
+        return
+    target.parent.mkdir(parents=True, exist_ok=True)
+    target.write_bytes(data)
+
+
+def generate_repo(
+    root: Path,
+    commits: int = 100,
+    entries: int = 20,
+    blob_pool: int = 500,
+    blob_size: int = 256,
+    changes_per_commit: int = 2,
+    direct_ratio: float = 0.1,
+    seed: int = 1,
+) -> SyntheticRepo:
+    """
+    Generate a synthetic repository under ``root``.
+
+    Args:
+        root: Repository root (created if missing)
+        commits: Number of commits
+        entries: Tree entries per commit (about a third are .blend files)
+        blob_pool: Number of distinct blobs shared by all trees
+        blob_size: Size of each blob in bytes
+        changes_per_commit: Tree entries replaced per commit
+        direct_ratio: Fraction of commits also stored at their commit hash path
+        seed: Random seed (generation is deterministic)
+    """
+    rng = random.Random(seed)
+    root = Path(root)
+    objects = root / ".DFM" / "objects"
+    commits_dir = objects / "commits" / "sha256"
+    trees_dir = objects / "trees" / "sha256"
+    blobs_dir = objects / "blobs" / "sha256"
+    for directory in (commits_dir, trees_dir, blobs_dir):
+        directory.mkdir(parents=True, exist_ok=True)
+    (root / ".DFM" / "forester.db").touch()
+
+    repo = SyntheticRepo(root=root)
+
+    for i in range(blob_pool):
+        data = rng.randbytes(blob_size)
+        digest = _sha(data + i.to_bytes(4, "little"))
+        _write_object(blobs_dir, digest, data)
+        repo.blob_hashes.append(digest)
+
+    names = []
+    for i in range(entries):
+        if i % 3 == 0:
+            name = "scene.blend" if i == 0 else f"assets/obj_{i:04d}.blend"
+        else:
+            name = f"textures/tex_{i:04d}.png"
+        names.append(name)
+    repo.blend_names = [n for n in names if n.endswith(".blend")]
+
+    tree_entries = {name: rng.choice(repo.blob_hashes) for name in names}
+    parent_hash = ""
+    timestamp = int(time.time()) - commits * 600
+    history = []
+
+    for i in range(commits):
+        for name in rng.sample(names, min(changes_per_commit, len(names))):
+            tree_entries[name] = rng.choice(repo.blob_hashes)
+
+        tree_json = json.dumps({
+            "entries": [
+                {"hash": tree_entries[name], "name": name, "type": "blob"}
+                for name in names
+            ]
+        }, separators=(",", ":")).encode()
+        tree_hash = _sha(tree_json)
+        _write_object(trees_dir, tree_hash, tree_json)
+
+        timestamp += rng.randint(60, 1200)
+        commit_hash = _sha(f"commit-{seed}-{i}".encode())
+        commit = {
+            "hash": commit_hash,
+            "tree_hash": tree_hash,
+            "parent_hash": parent_hash,
+            "branch": "main",
+            "author": rng.choice(["alice", "bob", "carol"]),
+            "message": f"Synthetic commit {i}",
+            "timestamp": timestamp,
+            "commit_type": "project",
+        }
+        commit_json = json.dumps(commit, separators=(",", ":")).encode()
+        _write_object(commits_dir, _sha(commit_json), commit_json)
+        if rng.random() < direct_ratio:
+            _write_object(commits_dir, commit_hash, commit_json)
+            repo.direct_hashes.append(commit_hash)
+
+        history.append(commit)
+        parent_hash = commit_hash
+
+    repo.commits = list(reversed(history))
+    return repo
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("out_dir", type=Path)
+    parser.add_argument("--commits", type=int, default=100)
+    parser.add_argument("--entries", type=int, default=20)
+    parser.add_argument("--blob-pool", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    repo = generate_repo(args.out_dir, commits=args.commits, entries=args.entries,
+                         blob_pool=args.blob_pool, seed=args.seed)
+    print(f"Generated {len(repo.commits)} commits in {repo.root} "
+          f"({time.perf_counter() - start:.1f}s)")
+
+
+if __name__ == "__main__":
+    main()